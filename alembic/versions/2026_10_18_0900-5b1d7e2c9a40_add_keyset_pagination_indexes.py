@@ -0,0 +1,40 @@
+"""add_keyset_pagination_indexes
+
+Revision ID: 5b1d7e2c9a40
+Revises: 26e82e493b66
+Create Date: 2026-10-18 09:00:12.481337
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b1d7e2c9a40"
+down_revision: Union[str, Sequence[str], None] = "26e82e493b66"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_departments_created_at_id",
+        "departments",
+        ["created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_employees_created_at_id",
+        "employees",
+        ["created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_employees_created_at_id", table_name="employees")
+    op.drop_index("ix_departments_created_at_id", table_name="departments")
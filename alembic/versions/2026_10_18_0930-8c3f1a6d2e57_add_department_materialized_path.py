@@ -0,0 +1,58 @@
+"""add_department_materialized_path
+
+Revision ID: 8c3f1a6d2e57
+Revises: 5b1d7e2c9a40
+Create Date: 2026-10-18 09:30:41.902114
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8c3f1a6d2e57"
+down_revision: Union[str, Sequence[str], None] = "5b1d7e2c9a40"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "departments", sa.Column("path", sa.String(collation="C"), nullable=True)
+    )
+    op.add_column("departments", sa.Column("level", sa.Integer(), nullable=True))
+
+    op.execute(
+        """
+        WITH RECURSIVE tree AS (
+            SELECT id, id::text AS path, 0 AS level
+            FROM departments
+            WHERE parent_id IS NULL
+
+            UNION ALL
+
+            SELECT d.id, t.path || '.' || d.id, t.level + 1
+            FROM departments d
+            JOIN tree t ON d.parent_id = t.id
+        )
+        UPDATE departments d
+        SET path = tree.path, level = tree.level
+        FROM tree
+        WHERE d.id = tree.id
+        """
+    )
+
+    op.alter_column("departments", "path", nullable=False)
+    op.alter_column("departments", "level", nullable=False)
+    op.create_index("ix_departments_path", "departments", ["path"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_departments_path", table_name="departments")
+    op.drop_column("departments", "level")
+    op.drop_column("departments", "path")
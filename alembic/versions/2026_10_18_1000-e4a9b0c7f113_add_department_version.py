@@ -0,0 +1,32 @@
+"""add_department_version
+
+Revision ID: e4a9b0c7f113
+Revises: 8c3f1a6d2e57
+Create Date: 2026-10-18 10:00:27.140925
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e4a9b0c7f113"
+down_revision: Union[str, Sequence[str], None] = "8c3f1a6d2e57"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "departments",
+        sa.Column("version", sa.BigInteger(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("departments", "version")
@@ -0,0 +1,30 @@
+"""add_employees_department_id_index
+
+Revision ID: 2f6c8d91ab04
+Revises: e4a9b0c7f113
+Create Date: 2026-10-18 11:00:09.573210
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2f6c8d91ab04"
+down_revision: Union[str, Sequence[str], None] = "e4a9b0c7f113"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_employees_department_id", "employees", ["department_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_employees_department_id", table_name="employees")
@@ -0,0 +1,72 @@
+"""add_department_aggregates
+
+Revision ID: b3d81f6e5a27
+Revises: 7a2e5c0d4b19
+Create Date: 2026-10-18 13:00:17.904512
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b3d81f6e5a27"
+down_revision: Union[str, Sequence[str], None] = "7a2e5c0d4b19"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "departments",
+        sa.Column("headcount", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "departments",
+        sa.Column(
+            "subtree_headcount", sa.Integer(), server_default="0", nullable=False
+        ),
+    )
+    op.add_column(
+        "departments",
+        sa.Column(
+            "descendants_count", sa.Integer(), server_default="0", nullable=False
+        ),
+    )
+    # Одноразовый пересчёт существующих данных; дальше агрегаты
+    # поддерживаются приращениями.
+    op.execute(
+        """
+        WITH direct AS (
+            SELECT department_id AS id, count(*) AS headcount
+            FROM employees
+            GROUP BY department_id
+        ), totals AS (
+            SELECT a.id::int AS id,
+                   sum(COALESCE(direct.headcount, 0)) AS subtree_headcount,
+                   count(*) - 1 AS descendants_count
+            FROM departments d
+            LEFT JOIN direct ON direct.id = d.id
+            CROSS JOIN unnest(string_to_array(d.path, '.')) AS a(id)
+            GROUP BY a.id
+        )
+        UPDATE departments d
+        SET headcount = COALESCE(direct.headcount, 0),
+            subtree_headcount = totals.subtree_headcount,
+            descendants_count = totals.descendants_count
+        FROM totals
+        LEFT JOIN direct ON direct.id = totals.id
+        WHERE d.id = totals.id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("departments", "descendants_count")
+    op.drop_column("departments", "subtree_headcount")
+    op.drop_column("departments", "headcount")
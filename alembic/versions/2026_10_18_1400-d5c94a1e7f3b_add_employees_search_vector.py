@@ -0,0 +1,52 @@
+"""add_employees_search_vector
+
+Revision ID: d5c94a1e7f3b
+Revises: b3d81f6e5a27
+Create Date: 2026-10-18 14:00:52.361870
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d5c94a1e7f3b"
+down_revision: Union[str, Sequence[str], None] = "b3d81f6e5a27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "employees",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('simple', full_name), 'A') || "
+                "setweight(to_tsvector('simple', position), 'B')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_employees_search_vector",
+        "employees",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_employees_search_vector", table_name="employees", postgresql_using="gin"
+    )
+    op.drop_column("employees", "search_vector")
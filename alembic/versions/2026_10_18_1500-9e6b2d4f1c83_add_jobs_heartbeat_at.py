@@ -0,0 +1,49 @@
+"""add_jobs_heartbeat_at
+
+Revision ID: 9e6b2d4f1c83
+Revises: d5c94a1e7f3b
+Create Date: 2026-10-18 15:00:27.904512
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9e6b2d4f1c83"
+down_revision: Union[str, Sequence[str], None] = "d5c94a1e7f3b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "jobs",
+        sa.Column(
+            "heartbeat_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+    op.execute("UPDATE jobs SET heartbeat_at = updated_at")
+    op.drop_index("ix_jobs_status_updated_at", table_name="jobs")
+    op.create_index(
+        "ix_jobs_status_heartbeat_at",
+        "jobs",
+        ["status", "heartbeat_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_jobs_status_heartbeat_at", table_name="jobs")
+    op.create_index(
+        "ix_jobs_status_updated_at", "jobs", ["status", "updated_at"], unique=False
+    )
+    op.drop_column("jobs", "heartbeat_at")
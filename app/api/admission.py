@@ -0,0 +1,33 @@
+from typing import AsyncIterator, Callable
+
+from fastapi import Request
+
+from app.utils.admission import STANDARD, admission_limiters
+
+
+def cost_class(name: str | None) -> Callable:
+    """
+    Задаёт класс стоимости эндпоинта (по умолчанию STANDARD). None - без
+    ограничения на уровне маршрута: эндпоинт ограничивает работу сам, как
+    дерево подразделения, где слот занимает только построение.
+    """
+
+    def decorator(endpoint: Callable) -> Callable:
+        endpoint.cost_class = name
+        return endpoint
+
+    return decorator
+
+
+async def admission_control(request: Request) -> AsyncIterator[None]:
+    """
+    Зависимость роутера: держит слот класса стоимости эндпоинта, пока
+    выполняется обработчик.
+    """
+    name = getattr(request.scope["endpoint"], "cost_class", STANDARD)
+    if name is None:
+        yield
+        return
+
+    async with admission_limiters[name].slot():
+        yield
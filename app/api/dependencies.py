@@ -3,11 +3,13 @@ from typing import Annotated
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.session import get_session_db
+from app.database.session import get_session_db, get_read_session_db
 from app.repositories.department import DepartmentRepository
 from app.services.department import DepartmentService
 from app.repositories.employee import EmployeeRepository
 from app.services.employee import EmployeeService
+from app.repositories.job import JobRepository
+from app.services.job import JobService
 
 
 def get_department_service(
@@ -22,7 +24,33 @@ def get_employee_service(
     return EmployeeService(EmployeeRepository(session))
 
 
+def get_job_service(
+    session: AsyncSession = Depends(get_session_db),
+) -> JobService:
+    return JobService(JobRepository(session))
+
+
+def get_department_read_service(
+    session: AsyncSession = Depends(get_read_session_db),
+) -> DepartmentService:
+    return DepartmentService(DepartmentRepository(session))
+
+
+def get_employee_read_service(
+    session: AsyncSession = Depends(get_read_session_db),
+) -> EmployeeService:
+    return EmployeeService(EmployeeRepository(session))
+
+
 DepartmentServiceDependency = Annotated[
     DepartmentService, Depends(get_department_service)
 ]
 EmployeeServiceDependency = Annotated[EmployeeService, Depends(get_employee_service)]
+JobServiceDependency = Annotated[JobService, Depends(get_job_service)]
+
+DepartmentReadServiceDependency = Annotated[
+    DepartmentService, Depends(get_department_read_service)
+]
+EmployeeReadServiceDependency = Annotated[
+    EmployeeService, Depends(get_employee_read_service)
+]
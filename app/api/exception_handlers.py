@@ -10,6 +10,12 @@ from app.api.exceptions import (
     ReassignModeHTTPException,
     TargetDepartmentNotFoundHTTPException,
     ReassignToSelfHTTPException,
+    ReassignToSubtreeHTTPException,
+    InvalidCursorHTTPException,
+    InvalidImportFormatHTTPException,
+    UnsupportedMediaTypeHTTPException,
+    JobNotFoundHTTPException,
+    ServiceOverloadedHTTPException,
 )
 from app.utils.exceptions import (
     ParentDepartmentNotFoundException,
@@ -22,6 +28,12 @@ from app.utils.exceptions import (
     ReassignModeException,
     TargetDepartmentNotFoundException,
     ReassignToSelfException,
+    ReassignToSubtreeException,
+    InvalidCursorException,
+    InvalidImportFormatException,
+    UnsupportedMediaTypeException,
+    JobNotFoundException,
+    ServiceOverloadedException,
 )
 
 
@@ -75,3 +87,31 @@ def register_exception_handlers(app: FastAPI) -> None:
     @app.exception_handler(ReassignToSelfException)
     async def reassign_to_self(request: Request, exc: ReassignToSelfException):
         raise ReassignToSelfHTTPException()
+
+    @app.exception_handler(ReassignToSubtreeException)
+    async def reassign_to_subtree(request: Request, exc: ReassignToSubtreeException):
+        raise ReassignToSubtreeHTTPException()
+
+    @app.exception_handler(InvalidCursorException)
+    async def invalid_cursor(request: Request, exc: InvalidCursorException):
+        raise InvalidCursorHTTPException()
+
+    @app.exception_handler(InvalidImportFormatException)
+    async def invalid_import_format(
+        request: Request, exc: InvalidImportFormatException
+    ):
+        raise InvalidImportFormatHTTPException()
+
+    @app.exception_handler(UnsupportedMediaTypeException)
+    async def unsupported_media_type(
+        request: Request, exc: UnsupportedMediaTypeException
+    ):
+        raise UnsupportedMediaTypeHTTPException()
+
+    @app.exception_handler(JobNotFoundException)
+    async def job_not_found(request: Request, exc: JobNotFoundException):
+        raise JobNotFoundHTTPException()
+
+    @app.exception_handler(ServiceOverloadedException)
+    async def service_overloaded(request: Request, exc: ServiceOverloadedException):
+        raise ServiceOverloadedHTTPException(exc.retry_after)
@@ -24,6 +24,11 @@ class DepartmentNotFoundHTTPException(AppHTTPException):
     detail = "Подразделение не найдено"
 
 
+class JobNotFoundHTTPException(AppHTTPException):
+    status_code = 404
+    detail = "Задача не найдена"
+
+
 class TargetDepartmentNotFoundHTTPException(AppHTTPException):
     status_code = 404
     detail = "Целевое подразделение не найдено"
@@ -57,3 +62,32 @@ class ReassignModeHTTPException(AppHTTPException):
 class ReassignToSelfHTTPException(AppHTTPException):
     status_code = 422
     detail = "Удаляемое подразделение не может являться целевым"
+
+
+class ReassignToSubtreeHTTPException(AppHTTPException):
+    status_code = 409
+    detail = "Целевое подразделение находится в удаляемом поддереве"
+
+
+class InvalidCursorHTTPException(AppHTTPException):
+    status_code = 422
+    detail = "Некорректный курсор пагинации"
+
+
+class InvalidImportFormatHTTPException(AppHTTPException):
+    status_code = 422
+    detail = "Некорректный формат данных для импорта"
+
+
+class UnsupportedMediaTypeHTTPException(AppHTTPException):
+    status_code = 415
+    detail = "Неподдерживаемый формат данных. Допустимы application/json, application/x-ndjson и text/csv"
+
+
+class ServiceOverloadedHTTPException(AppHTTPException):
+    status_code = 503
+    detail = "Сервис перегружен, повторите запрос позже"
+
+    def __init__(self, retry_after: int):
+        super().__init__()
+        self.headers = {"Retry-After": str(retry_after)}
@@ -0,0 +1,77 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.database.session import engine
+from app.utils.admission import admission_limiters
+from app.utils.cache import department_tree_cache, department_tree_flights
+from app.utils.metrics import multiprocess_snapshots, registry
+
+
+router = APIRouter(tags=["System"])
+
+db_pool_connections = registry.gauge(
+    "db_pool_connections", "Соединения пула основной БД", ["state"]
+)
+db_pool_timeouts = registry.counter(
+    "db_pool_timeouts_total", "Таймауты ожидания соединения из пула"
+)
+db_pool_wait = registry.histogram(
+    "db_pool_wait_seconds", "Время ожидания соединения из пула"
+)
+tree_cache_requests = registry.counter(
+    "tree_cache_requests_total", "Обращения к кэшу дерева подразделений", ["result"]
+)
+admission_active = registry.gauge(
+    "admission_active_requests",
+    "Выполняющиеся запросы по классам стоимости",
+    ["cost_class"],
+)
+admission_queued = registry.gauge(
+    "admission_queued_requests",
+    "Запросы в очереди на выполнение по классам стоимости",
+    ["cost_class"],
+)
+admission_rejected = registry.counter(
+    "admission_rejected_total",
+    "Запросы, отклонённые с 503: очередь заполнена или истекло ожидание",
+    ["cost_class", "reason"],
+)
+
+
+@registry.collector
+def collect_pool_stats() -> None:
+    stats = engine.pool.stats()
+    for state in ("checked_in", "checked_out", "overflow"):
+        db_pool_connections.set(stats[state], state=state)
+    db_pool_timeouts.set(stats["timeouts"])
+    db_pool_wait.set(engine.pool.wait_time)
+
+
+@registry.collector
+def collect_cache_stats() -> None:
+    tree_cache_requests.set(department_tree_cache.hits, result="hit")
+    tree_cache_requests.set(department_tree_cache.misses, result="miss")
+    tree_cache_requests.set(department_tree_flights.coalesced, result="coalesced")
+
+
+@registry.collector
+def collect_admission_stats() -> None:
+    for limiter in admission_limiters.values():
+        stats = limiter.stats()
+        cost_class = stats["cost_class"]
+        admission_active.set(stats["active"], cost_class=cost_class)
+        admission_queued.set(stats["queued"], cost_class=cost_class)
+        admission_rejected.set(
+            stats["rejected"], cost_class=cost_class, reason="queue_full"
+        )
+        admission_rejected.set(
+            stats["timed_out"], cost_class=cost_class, reason="timeout"
+        )
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics() -> PlainTextResponse:
+    return PlainTextResponse(
+        registry.render(multiprocess_snapshots.collect()),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
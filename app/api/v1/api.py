@@ -1,8 +1,16 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+
+from app.api.admission import admission_control
 from app.api.v1.endpoints.departments import router as departments_router
 from app.api.v1.endpoints.employees import router as employees_router
+from app.api.v1.endpoints.export import router as export_router
+from app.api.v1.endpoints.jobs import router as jobs_router
+from app.api.v1.endpoints.system import router as system_router
 
 
 router = APIRouter()
-router.include_router(departments_router)
-router.include_router(employees_router)
+router.include_router(departments_router, dependencies=[Depends(admission_control)])
+router.include_router(employees_router, dependencies=[Depends(admission_control)])
+router.include_router(export_router, dependencies=[Depends(admission_control)])
+router.include_router(jobs_router)
+router.include_router(system_router)
@@ -1,35 +1,104 @@
-from typing import Sequence
+from fastapi import APIRouter, Query, Header, Response
+from fastapi.responses import JSONResponse
 
-from fastapi import APIRouter, Query
-
-from app.api.dependencies import DepartmentServiceDependency, EmployeeServiceDependency
-from app.schemas import EmployeeRead, DepartmentTree
+from app.api.admission import cost_class
+from app.api.dependencies import (
+    DepartmentServiceDependency,
+    DepartmentReadServiceDependency,
+    EmployeeServiceDependency,
+)
+from app.middleware.read_your_writes import read_only
+from app.schemas import BatchGetResult, EmployeeRead, DepartmentTree, Page
 from app.schemas.department import (
     DepartmentRead,
     DepartmentCreate,
     DepartmentUpdate,
     DepartmentDeleteMode,
+    DepartmentImport,
+    DepartmentImportResult,
+    DepartmentStats,
+    DepartmentAncestorsQuery,
+    DepartmentBatchGetQuery,
+    DepartmentBatchItem,
 )
 from app.schemas.employee import EmployeeBase
+from app.schemas.job import JobRead
+from app.utils.admission import HEAVY
+from app.utils.compression import negotiate_encoding, weak_etag
 
 router = APIRouter(prefix="/departments", tags=["Departments"])
 
 
 @router.get("/")
 async def get_departments(
-    service: DepartmentServiceDependency,
-) -> Sequence[DepartmentRead]:
-    return await service.get_departments()
+    service: DepartmentReadServiceDependency,
+    response: Response,
+    limit: int = Query(default=100, ge=1, le=1000),
+    after: str | None = Query(default=None),
+    if_none_match: str | None = Header(default=None),
+) -> Page[DepartmentRead]:
+    page, etag = await service.get_departments(limit, after, if_none_match)
+    if page is None:
+        return Response(status_code=304, headers={"ETag": etag})
 
+    response.headers["ETag"] = etag
+    return page
 
-@router.get("/{department_id}")
+
+@router.get("/{department_id}", response_model=DepartmentTree)
+@cost_class(None)
 async def get_department(
-    service: DepartmentServiceDependency,
+    service: DepartmentReadServiceDependency,
     department_id: int,
     depth: int = Query(default=1, ge=1, le=5),
     include_employees: bool = Query(default=True),
-) -> DepartmentTree:
-    return await service.get_department_by_id(department_id, depth, include_employees)
+    if_none_match: str | None = Header(default=None),
+    accept_encoding: str | None = Header(default=None),
+) -> Response:
+    body, etag = await service.get_department_by_id(
+        department_id, depth, include_employees, if_none_match
+    )
+    if body is None:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    # сжатый вариант хранится вместе с телом в кэше дерева
+    content, encoding = await body.encode(negotiate_encoding(accept_encoding))
+    headers = {"ETag": etag, "Vary": "Accept-Encoding"}
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+        headers["ETag"] = weak_etag(etag)
+    return Response(content, media_type="application/json", headers=headers)
+
+
+@router.get("/{department_id}/stats")
+async def get_department_stats(
+    service: DepartmentReadServiceDependency, department_id: int
+) -> DepartmentStats:
+    return await service.get_department_stats(department_id)
+
+
+@router.get("/{department_id}/ancestors")
+async def get_department_ancestors(
+    service: DepartmentReadServiceDependency, department_id: int
+) -> list[DepartmentRead]:
+    return await service.get_department_ancestors(department_id)
+
+
+@router.post("/ancestors")
+@cost_class(HEAVY)
+@read_only
+async def get_departments_ancestors(
+    service: DepartmentReadServiceDependency, query: DepartmentAncestorsQuery
+) -> dict[int, list[DepartmentRead]]:
+    return await service.get_departments_ancestors(query.ids)
+
+
+@router.post("/batch-get")
+@read_only
+async def get_departments_batch(
+    service: DepartmentReadServiceDependency, query: DepartmentBatchGetQuery
+) -> BatchGetResult[DepartmentBatchItem]:
+    return await service.get_departments_batch(query.ids, query.include_children)
 
 
 @router.post("/")
@@ -39,6 +108,16 @@ async def create_department(
     return await service.create_department(department_data)
 
 
+@router.post("/import")
+@cost_class(HEAVY)
+async def import_department_tree(
+    service: DepartmentServiceDependency,
+    department_data: DepartmentImport,
+    parent_id: int | None = Query(default=None, gt=0),
+) -> DepartmentImportResult:
+    return await service.import_department_tree(department_data, parent_id)
+
+
 @router.patch("/{department_id}")
 async def update_department(
     service: DepartmentServiceDependency,
@@ -48,14 +127,26 @@ async def update_department(
     return await service.update_department(department_id, new_department_data)
 
 
-@router.delete("/{department_id}", status_code=204)
+@router.delete(
+    "/{department_id}",
+    status_code=204,
+    responses={202: {"model": JobRead, "description": "Удаление выполняется в фоне"}},
+)
 async def delete_department(
     service: DepartmentServiceDependency,
     department_id: int,
     mode: DepartmentDeleteMode,
     reassign_to_department_id: int | None = Query(None, gt=0),
 ):
-    await service.delete_department(department_id, mode, reassign_to_department_id)
+    job = await service.delete_department(
+        department_id, mode, reassign_to_department_id
+    )
+    if job is not None:
+        return JSONResponse(
+            status_code=202,
+            content=JobRead.model_validate(job).model_dump(mode="json"),
+            headers={"Location": f"/api/v1/jobs/{job.id}"},
+        )
 
 
 @router.post("/{department_id}/employees/")
@@ -1,14 +1,67 @@
-from typing import Sequence
+from fastapi import APIRouter, Query, Request
 
-from fastapi import APIRouter
-
-from app.api.dependencies import EmployeeServiceDependency
-from app.schemas.employee import EmployeeRead
+from app.api.admission import cost_class
+from app.api.dependencies import (
+    EmployeeServiceDependency,
+    EmployeeReadServiceDependency,
+)
+from app.middleware.read_your_writes import read_only
+from app.schemas import BatchGetQuery, BatchGetResult, Page
+from app.schemas.employee import EmployeeRead, EmployeeImportResult
+from app.utils.admission import HEAVY
+from app.utils.parsers import get_rows_parser
 
 
 router = APIRouter(prefix="/employees", tags=["Employees"])
 
 
 @router.get("/")
-async def get_employees(service: EmployeeServiceDependency) -> Sequence[EmployeeRead]:
-    return await service.get_employees()
+async def get_employees(
+    service: EmployeeReadServiceDependency,
+    limit: int = Query(default=100, ge=1, le=1000),
+    after: str | None = Query(default=None),
+) -> Page[EmployeeRead]:
+    return await service.get_employees(limit, after)
+
+
+@router.get("/search")
+@cost_class(HEAVY)
+async def search_employees(
+    service: EmployeeReadServiceDependency,
+    q: str = Query(min_length=1, max_length=200),
+    department_id: int | None = Query(default=None, gt=0),
+    limit: int = Query(default=100, ge=1, le=1000),
+    after: str | None = Query(default=None),
+) -> Page[EmployeeRead]:
+    return await service.search_employees(q, limit, after, department_id)
+
+
+@router.post("/batch-get")
+@read_only
+async def get_employees_batch(
+    service: EmployeeReadServiceDependency, query: BatchGetQuery
+) -> BatchGetResult[EmployeeRead]:
+    return await service.get_employees_batch(query.ids)
+
+
+@router.post(
+    "/bulk",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": {"type": "array", "items": {}}},
+                "application/x-ndjson": {"schema": {"type": "string"}},
+                "text/csv": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+@cost_class(HEAVY)
+async def import_employees(
+    service: EmployeeServiceDependency,
+    request: Request,
+    atomic: bool = Query(default=False),
+) -> EmployeeImportResult:
+    parser = get_rows_parser(request.headers.get("content-type"))
+    return await service.import_employees(parser(request.stream()), atomic)
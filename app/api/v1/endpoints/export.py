@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+
+from app.api.admission import cost_class
+from app.api.dependencies import (
+    DepartmentReadServiceDependency,
+    EmployeeReadServiceDependency,
+)
+from app.schemas.export import ExportFormat, EXPORT_MEDIA_TYPES
+from app.utils.admission import HEAVY
+
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+
+@router.get("/departments", response_class=StreamingResponse)
+@cost_class(HEAVY)
+async def export_departments(
+    service: DepartmentReadServiceDependency,
+    format: ExportFormat = Query(default=ExportFormat.ndjson),
+) -> StreamingResponse:
+    return StreamingResponse(
+        service.export_departments(format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="departments.{format.value}"'
+        },
+    )
+
+
+@router.get("/employees", response_class=StreamingResponse)
+@cost_class(HEAVY)
+async def export_employees(
+    service: EmployeeReadServiceDependency,
+    format: ExportFormat = Query(default=ExportFormat.ndjson),
+) -> StreamingResponse:
+    return StreamingResponse(
+        service.export_employees(format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="employees.{format.value}"'
+        },
+    )
@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+
+from app.api.dependencies import JobServiceDependency
+from app.schemas.job import JobRead
+
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+@router.get("/{job_id}")
+async def get_job(service: JobServiceDependency, job_id: int) -> JobRead:
+    return await service.get_job(job_id)
@@ -0,0 +1,28 @@
+from fastapi import APIRouter
+
+from app.database.session import engine
+from app.schemas.system import AdmissionStats, CacheStats, PoolStats
+from app.utils.admission import admission_limiters
+from app.utils.cache import department_tree_cache, department_tree_flights
+
+
+router = APIRouter(prefix="/system", tags=["System"])
+
+
+@router.get("/cache")
+async def get_cache_stats() -> CacheStats:
+    return CacheStats(
+        **department_tree_cache.stats(), **department_tree_flights.stats()
+    )
+
+
+@router.get("/pool")
+async def get_pool_stats() -> PoolStats:
+    return PoolStats(**engine.pool.stats())
+
+
+@router.get("/admission")
+async def get_admission_stats() -> list[AdmissionStats]:
+    return [
+        AdmissionStats(**limiter.stats()) for limiter in admission_limiters.values()
+    ]
@@ -26,12 +26,85 @@ class Settings(BaseSettings):
     def TEST_DB_URL(self) -> str:
         return f"postgresql+asyncpg://{self.DB_USER}:{str(self.DB_PASS)}@{self.DB_HOST}:{self.DB_PORT}/{self.TEST_DB_NAME}"
 
+    # DATABASE POOL SETTINGS
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = False
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100
+
+    # READ REPLICA SETTINGS
+    REPLICA_DB_HOST: str | None = None
+    REPLICA_DB_PORT: int | None = None
+    REPLICA_DB_NAME: str | None = None
+    READ_YOUR_WRITES_WINDOW: float = 5.0
+    READ_YOUR_WRITES_COOKIE: str = "read_primary_until"
+
+    @property
+    def REPLICA_DB_URL(self) -> str | None:
+        if not self.REPLICA_DB_HOST:
+            return None
+        return f"postgresql+asyncpg://{self.DB_USER}:{str(self.DB_PASS)}@{self.REPLICA_DB_HOST}:{self.REPLICA_DB_PORT or self.DB_PORT}/{self.REPLICA_DB_NAME or self.DB_NAME}"
+
     # LOGGER SETTINGS
     IS_FILE_LOG: bool
     IS_CONSOLE_LOG: bool
     LOG_LEVEL: str
     LOG_ROTATION: str
     LOG_COMPRESSION: str
+    LOG_FORMAT: str = "text"
+    LOG_SAMPLE_RATE: float = 1.0
+
+    # PROFILING SETTINGS
+    REQUEST_PROFILING_ENABLED: bool = True
+    SAMPLING_PROFILER_ENABLED: bool = False
+    SAMPLING_PROFILER_THRESHOLD: float = 0.5
+    SAMPLING_PROFILER_INTERVAL: float = 0.005
+
+    # METRICS SETTINGS
+    METRICS_ENABLED: bool = True
+    METRICS_MULTIPROCESS_DIR: str | None = None
+    METRICS_FLUSH_INTERVAL: float = 5.0
+
+    # ADMISSION CONTROL SETTINGS
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_HEAVY_LIMIT: int = 3
+    ADMISSION_HEAVY_QUEUE_SIZE: int = 10
+    ADMISSION_STANDARD_LIMIT: int = 50
+    ADMISSION_STANDARD_QUEUE_SIZE: int = 100
+    ADMISSION_QUEUE_TIMEOUT: float = 5.0
+    ADMISSION_RETRY_AFTER: int = 1
+    ADMISSION_HEAVY_TREE_DEPTH: int = 3
+
+    # COMPRESSION SETTINGS
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_ZSTD_LEVEL: int = 3
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_THREAD_THRESHOLD: int = 65536
+
+    # BULK IMPORT / EXPORT SETTINGS
+    BULK_IMPORT_BATCH_SIZE: int = 5000
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # BACKGROUND JOB SETTINGS
+    JOB_DELETE_THRESHOLD: int = 1000
+    JOB_BATCH_SIZE: int = 500
+    JOB_STALE_AFTER: float = 60.0
+    JOB_HEARTBEAT_INTERVAL: float = 10.0
+    JOB_POLL_INTERVAL: float = 15.0
+
+    # CACHE SETTINGS
+    TREE_CACHE_ENABLED: bool = True
+    TREE_CACHE_MAX_SIZE: int = 1024
+    TREE_CACHE_TTL: float = 300.0
+    CACHE_NOTIFY_ENABLED: bool = True
+    CACHE_NOTIFY_CHANNEL: str = "department_changes"
+    CACHE_NOTIFY_RECONNECT_DELAY: float = 1.0
+    CACHE_NOTIFY_MAX_RECONNECT_DELAY: float = 30.0
 
     model_config = SettingsConfigDict(env_file=".env")
 
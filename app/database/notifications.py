@@ -0,0 +1,108 @@
+import asyncio
+from typing import Iterable
+
+import asyncpg
+from loguru import logger
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.config.settings import settings
+from app.database.session import engine
+from app.utils.cache import department_tree_cache
+
+
+def department_changes_notification(
+    department_ids: Iterable[int | None],
+) -> ColumnElement:
+    """
+    pg_notify(:channel, '1,5,12') - выражение, которое можно выбрать в том
+    же запросе, что и сама запись, без отдельного обращения к БД.
+    """
+    ids = {department_id for department_id in department_ids if department_id}
+    payload = ",".join(str(department_id) for department_id in sorted(ids))
+    return func.pg_notify(settings.CACHE_NOTIFY_CHANNEL, payload)
+
+
+async def notify_department_changes(
+    session: AsyncSession, department_ids: Iterable[int | None]
+) -> None:
+    """
+    SELECT pg_notify(:channel, '1,5,12')
+
+    NOTIFY транзакционный: сообщение уходит слушателям только после COMMIT,
+    поэтому вызывается в той же транзакции, что и сама запись.
+    """
+    await session.execute(select(department_changes_notification(department_ids)))
+
+
+class DepartmentChangesListener:
+    """
+    LISTEN-потребитель изменений оргструктуры для одного воркера.
+
+    На каждое уведомление сбрасывает локальный кэш деревьев. Соединение
+    держится отдельно от пула; при обрыве переподключается с экспоненциальной
+    задержкой и сбрасывает кэш, так как уведомления за время простоя потеряны.
+    """
+
+    def __init__(self, dsn: str | None = None, channel: str | None = None):
+        self.dsn = dsn or engine.url.set(drivername="postgresql").render_as_string(
+            hide_password=False
+        )
+        self.channel = channel or settings.CACHE_NOTIFY_CHANNEL
+        self.connected = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _on_notification(
+        self, connection: asyncpg.Connection, pid: int, channel: str, payload: str
+    ) -> None:
+        department_tree_cache.invalidate()
+        logger.debug(f"Получено уведомление об изменении подразделений: {payload}")
+
+    async def _run(self) -> None:
+        delay = settings.CACHE_NOTIFY_RECONNECT_DELAY
+
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _: lost.set())
+                await connection.add_listener(self.channel, self._on_notification)
+
+                department_tree_cache.invalidate()
+                self.connected.set()
+                delay = settings.CACHE_NOTIFY_RECONNECT_DELAY
+                logger.info(f"Подписка на канал {self.channel} установлена")
+
+                await lost.wait()
+                logger.warning(f"Соединение с каналом {self.channel} потеряно")
+
+            except asyncio.CancelledError:
+                raise
+
+            except (OSError, asyncpg.PostgresError) as e:
+                logger.warning(
+                    f"Ошибка подписки на канал {self.channel}: {e!r}, повтор через {delay} с"
+                )
+
+            finally:
+                self.connected.clear()
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, settings.CACHE_NOTIFY_MAX_RECONNECT_DELAY)
@@ -0,0 +1,41 @@
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.utils.metrics import Histogram
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """
+    Пул соединений, который замеряет время ожидания соединения.
+
+    Время считается от запроса соединения до его выдачи, включая открытие
+    нового соединения при переполнении. Таймауты ожидания считаются отдельно.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_time = Histogram()
+        self.timeouts = 0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.wait_time.observe(time.perf_counter() - started)
+
+    def stats(self) -> dict:
+        return {
+            "pool_size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+            "timeouts": self.timeouts,
+            "wait_time": self.wait_time.snapshot(),
+        }
@@ -1,16 +1,98 @@
+import time
 from typing import AsyncGenerator
 
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    create_async_engine,
+    async_sessionmaker,
+    AsyncSession,
+)
 
 from app.config.settings import settings
+from app.database.pool import InstrumentedAsyncPool
+from app.utils.profiling import track_queries
+
+
+def create_engine(url: str) -> AsyncEngine:
+    return create_async_engine(
+        url=url,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={
+            # кэш подготовленных выражений asyncpg и SQLAlchemy;
+            # за PgBouncer в режиме transaction оба нужно выставить в 0
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+        },
+    )
+
 
+if settings.REQUEST_PROFILING_ENABLED:
+    track_queries()
 
-engine = create_async_engine(url=settings.DB_URL)
+engine = create_engine(settings.DB_URL)
 async_session_factory = async_sessionmaker(
     bind=engine, expire_on_commit=False, class_=AsyncSession
 )
 
+replica_engine = (
+    create_engine(settings.REPLICA_DB_URL) if settings.REPLICA_DB_URL else None
+)
+replica_session_factory = (
+    async_sessionmaker(bind=replica_engine, expire_on_commit=False, class_=AsyncSession)
+    if replica_engine
+    else None
+)
+
 
 async def get_session_db() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_factory() as session:
         yield session
+
+
+def reads_own_writes(request: Request) -> bool:
+    """
+    Клиент недавно писал (см. ReadYourWritesMiddleware): его чтения
+    идут в основную БД, пока реплика может отставать.
+    """
+    until = request.cookies.get(settings.READ_YOUR_WRITES_COOKIE)
+    try:
+        return until is not None and float(until) > time.time()
+    except ValueError:
+        return False
+
+
+async def get_read_session_db(
+    request: Request, session: AsyncSession = Depends(get_session_db)
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Сессия для эндпоинтов только на чтение: реплика, если она настроена
+    и клиент не писал в последние READ_YOUR_WRITES_WINDOW секунд, иначе
+    основная БД. Сессия основной БД не открывает соединение, пока не
+    используется, поэтому зависимость от get_session_db ничего не стоит.
+
+    В session.info отмечается источник чтения: "reads_own_writes" - клиент
+    должен видеть свои изменения, "replica" - сессия реплики, "primary" -
+    сессия основной БД рядом с ней (проверка отставания перед записью в
+    кэш дерева). Без реплики отметок нет: все чтения из основной БД.
+    """
+    if replica_session_factory is None:
+        yield session
+        return
+
+    if reads_own_writes(request):
+        # кэш дерева в этом запросе не используется: его запись могла
+        # опередить уведомление об изменении клиента
+        session.info["reads_own_writes"] = True
+        yield session
+        return
+
+    async with replica_session_factory() as replica_session:
+        replica_session.info["replica"] = True
+        replica_session.info["primary"] = session
+        yield replica_session
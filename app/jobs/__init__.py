@@ -0,0 +1,4 @@
+from app.jobs.runner import job_runner
+from app.jobs import handlers  # noqa: F401  регистрирует обработчики задач
+
+__all__ = ["job_runner"]
@@ -0,0 +1,44 @@
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config.settings import settings
+from app.jobs.runner import job_runner
+from app.models.job import Job
+from app.repositories.department import DepartmentRepository
+from app.repositories.job import JobRepository
+from app.schemas.job import JobKind
+from app.utils.cache import department_tree_cache
+
+
+@job_runner.handler(JobKind.delete_subtree)
+async def delete_subtree(
+    job: Job, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    """
+    Удаляет поддерево пачками по JOB_BATCH_SIZE строк, каждая пачка - своя
+    короткая транзакция. В режиме reassign сотрудники корня сначала
+    переносятся в целевое подразделение. При повторном запуске продолжает
+    с того, что осталось.
+    """
+    department_id = job.params["department_id"]
+    reassign_to_department_id = job.params.get("reassign_to_department_id")
+
+    async with session_factory() as session:
+        departments = DepartmentRepository(session)
+        if reassign_to_department_id is not None:
+            await departments.reassign_employees(
+                department_id, reassign_to_department_id
+            )
+        remaining = await departments.count_subtree_rows(department_id)
+        await JobRepository(session).add_progress(
+            job.id, 0, total=job.processed + remaining
+        )
+    department_tree_cache.invalidate()
+
+    deleted = remaining
+    while deleted:
+        async with session_factory() as session:
+            deleted = await DepartmentRepository(session).delete_subtree_batch(
+                department_id, settings.JOB_BATCH_SIZE
+            )
+            await JobRepository(session).add_progress(job.id, deleted)
+        department_tree_cache.invalidate()
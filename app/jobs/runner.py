@@ -0,0 +1,143 @@
+import asyncio
+from typing import Awaitable, Callable
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config.settings import settings
+from app.database.session import async_session_factory
+from app.models.job import Job
+from app.repositories.job import JobRepository
+from app.schemas.job import JobKind, JobStatus
+
+
+JobHandler = Callable[[Job, async_sessionmaker[AsyncSession]], Awaitable[None]]
+
+
+class JobRunner:
+    """
+    Выполняет фоновые задачи в asyncio-задачах текущего воркера.
+
+    Состояние задач хранится в таблице jobs, поэтому после перезапуска
+    (или падения воркера) незавершённые задачи подхватываются заново -
+    обработчики обязаны быть идемпотентными и продолжать с места остановки.
+    Пока задача выполняется, воркер продлевает её аренду (heartbeat_at);
+    цикл опроса каждого воркера забирает задачи с просроченной арендой.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]):
+        self.session_factory = session_factory
+        self.handlers: dict[str, JobHandler] = {}
+        self.tasks: dict[int, asyncio.Task] = {}
+        self.poller: asyncio.Task | None = None
+
+    def handler(self, kind: JobKind) -> Callable[[JobHandler], JobHandler]:
+        def decorator(func: JobHandler) -> JobHandler:
+            self.handlers[kind.value] = func
+            return func
+
+        return decorator
+
+    async def submit(self, kind: JobKind, params: dict) -> Job:
+        """Ставит задачу; если такая же уже выполняется, возвращает её."""
+        async with self.session_factory() as session:
+            repository = JobRepository(session)
+            job = await repository.get_active_job(kind, params)
+            if job is not None:
+                logger.info(f"Задача уже выполняется: {job!r}")
+                return job
+            job = await repository.create_job(kind, params)
+
+        self._spawn(job)
+        return job
+
+    def start(self) -> None:
+        """Запускает цикл опроса очереди задач."""
+        if self.poller is None:
+            self.poller = asyncio.create_task(self._poll())
+
+    async def resume(self) -> None:
+        """Забирает отложенные задачи и задачи, брошенные умершими воркерами."""
+        async with self.session_factory() as session:
+            jobs = await JobRepository(session).claim_jobs(settings.JOB_STALE_AFTER)
+
+        for job in jobs:
+            if job.id in self.tasks:
+                # аренда истекла, но задача ещё выполняется в этом воркере
+                continue
+            logger.info(f"Возобновление задачи {job!r}")
+            self._spawn(job)
+
+    async def join(self) -> None:
+        """Ожидает завершения всех запущенных задач."""
+        while self.tasks:
+            await asyncio.gather(*self.tasks.values(), return_exceptions=True)
+
+    async def stop(self) -> None:
+        """Прерывает задачи; они возвращаются в очередь и будут возобновлены."""
+        if self.poller is not None:
+            self.poller.cancel()
+            await asyncio.gather(self.poller, return_exceptions=True)
+            self.poller = None
+        for task in self.tasks.values():
+            task.cancel()
+        await self.join()
+
+    def _spawn(self, job: Job) -> None:
+        task = asyncio.create_task(self._run(job))
+        self.tasks[job.id] = task
+        task.add_done_callback(lambda _: self.tasks.pop(job.id, None))
+
+    async def _poll(self) -> None:
+        """
+        Раз в JOB_POLL_INTERVAL секунд забирает задачи из очереди, так что
+        задачи упавшего воркера подхватываются без перезапуска остальных.
+        """
+        while True:
+            try:
+                await self.resume()
+            except Exception:
+                logger.exception("Не удалось забрать фоновые задачи")
+            await asyncio.sleep(settings.JOB_POLL_INTERVAL)
+
+    async def _heartbeat(self, job_id: int) -> None:
+        """Продлевает аренду задачи, пока её выполняет этот воркер."""
+        while True:
+            await asyncio.sleep(settings.JOB_HEARTBEAT_INTERVAL)
+            try:
+                async with self.session_factory() as session:
+                    if not await JobRepository(session).heartbeat(job_id):
+                        logger.warning(f"Задача id={job_id} уже не выполняется")
+            except Exception:
+                logger.exception(f"Не удалось продлить аренду задачи id={job_id}")
+
+    async def _execute(self, job: Job) -> None:
+        heartbeat = asyncio.create_task(self._heartbeat(job.id))
+        try:
+            await self.handlers[job.kind](job, self.session_factory)
+        finally:
+            heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+
+    async def _run(self, job: Job) -> None:
+        logger.info(f"Запуск задачи {job!r}, params={job.params}")
+        try:
+            await self._execute(job)
+        except asyncio.CancelledError:
+            logger.warning(f"Задача прервана и возвращена в очередь: {job!r}")
+            async with self.session_factory() as session:
+                await JobRepository(session).release_job(job.id)
+            raise
+        except Exception as e:
+            logger.exception(f"Ошибка выполнения задачи {job!r}")
+            async with self.session_factory() as session:
+                await JobRepository(session).finish_job(
+                    job.id, JobStatus.failed, str(e) or e.__class__.__name__
+                )
+        else:
+            async with self.session_factory() as session:
+                await JobRepository(session).finish_job(job.id, JobStatus.succeeded)
+            logger.info(f"Задача выполнена: {job!r}")
+
+
+job_runner = JobRunner(async_session_factory)
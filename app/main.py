@@ -1,11 +1,23 @@
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from loguru import logger
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api.exception_handlers import register_exception_handlers
+from app.api.metrics import router as metrics_router
 from app.api.v1.api import router as main_router
 from app.config.settings import settings
+from app.database.notifications import DepartmentChangesListener
+from app.jobs import job_runner
+from app.middleware import (
+    CompressionMiddleware,
+    MetricsMiddleware,
+    ProfilingMiddleware,
+    ReadYourWritesMiddleware,
+    RequestIdMiddleware,
+)
+from app.utils.metrics import multiprocess_snapshots
 
 from app.utils.logger import setup_logger
 
@@ -16,8 +28,17 @@ setup_logger()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Starting up...")
+    listener = DepartmentChangesListener()
+    if settings.TREE_CACHE_ENABLED and settings.CACHE_NOTIFY_ENABLED:
+        listener.start()
+    job_runner.start()
+    metrics_flusher = asyncio.create_task(multiprocess_snapshots.run())
     yield
     logger.info("Shutting down...")
+    await job_runner.stop()
+    await listener.stop()
+    metrics_flusher.cancel()
+    await multiprocess_snapshots.flush(live=False)
 
 
 app = FastAPI(
@@ -29,6 +50,8 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.ALLOWED_ORIGINS,
@@ -36,7 +59,15 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(ReadYourWritesMiddleware)
+if settings.REQUEST_PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+app.add_middleware(RequestIdMiddleware)
 
 register_exception_handlers(app)
 
 app.include_router(main_router, prefix="/api/v1")
+if settings.METRICS_ENABLED:
+    app.include_router(metrics_router)
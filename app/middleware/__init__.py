@@ -0,0 +1,13 @@
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.profiling import ProfilingMiddleware
+from app.middleware.read_your_writes import ReadYourWritesMiddleware
+from app.middleware.request_id import RequestIdMiddleware
+
+__all__ = [
+    "CompressionMiddleware",
+    "MetricsMiddleware",
+    "ProfilingMiddleware",
+    "ReadYourWritesMiddleware",
+    "RequestIdMiddleware",
+]
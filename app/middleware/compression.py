@@ -0,0 +1,94 @@
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.settings import settings
+from app.utils.compression import (
+    StreamCompressor,
+    compress,
+    is_compressible,
+    negotiate_encoding,
+    run_compression,
+    weak_etag,
+)
+
+
+class CompressionMiddleware:
+    """
+    Сжимает ответы текстовых типов кодировкой, выбранной по
+    Accept-Encoding (zstd, br, gzip - из установленных). Ответ одним куском
+    меньше minimum_size отдаётся как есть; потоковые ответы (экспорт)
+    сжимаются по кускам, каждый кусок сразу уходит клиенту. Большие тела и
+    куски сжимаются в пуле потоков (run_compression). Ответы, уже имеющие
+    Content-Encoding (дерево подразделения из кэша), не трогает.
+    """
+
+    def __init__(
+        self, app: ASGIApp, minimum_size: int = settings.COMPRESSION_MINIMUM_SIZE
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        start: Message | None = None
+        compressor: StreamCompressor | None = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, compressor
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if "content-encoding" in headers or not is_compressible(
+                    headers.get("content-type")
+                ):
+                    await send(message)
+                    return
+                if "accept-encoding" not in headers.get("vary", "").lower():
+                    headers.add_vary_header("Accept-Encoding")
+                if encoding is None:
+                    await send(message)
+                    return
+                # заголовки зависят от размера тела: ждём первый кусок
+                start = message
+                return
+
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                headers = MutableHeaders(scope=start)
+                if not more_body:
+                    if len(body) >= self.minimum_size:
+                        body = await run_compression(compress, body, encoding)
+                        self._set_encoding(headers, encoding)
+                        headers["Content-Length"] = str(len(body))
+                        message = {**message, "body": body}
+                    await send(start)
+                    await send(message)
+                    start = None
+                    return
+
+                compressor = StreamCompressor(encoding)
+                self._set_encoding(headers, encoding)
+                if "content-length" in headers:
+                    del headers["Content-Length"]
+                await send(start)
+
+            body = await run_compression(compressor.compress, body)
+            if not more_body:
+                body += compressor.finish()
+            await send({**message, "body": body})
+
+        await self.app(scope, receive, send_compressed)
+
+    @staticmethod
+    def _set_encoding(headers: MutableHeaders, encoding: str) -> None:
+        headers["Content-Encoding"] = encoding
+        if "etag" in headers:
+            headers["ETag"] = weak_etag(headers["etag"])
@@ -0,0 +1,70 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.metrics import (
+    http_request_duration,
+    http_requests,
+    http_requests_in_flight,
+)
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Шаблон маршрута запроса: /api/v1/departments/{department_id}.
+
+    Путь маршрута может быть относительным к подключённому роутеру, поэтому
+    префикс восстанавливается из фактического пути: шаблон с подставленными
+    параметрами совпадает с концом scope["path"].
+    """
+    route = scope.get("route")
+    template = getattr(route, "path_format", None)
+    if template is None:
+        return "<unmatched>"
+
+    rendered = template
+    for name, value in scope.get("path_params", {}).items():
+        rendered = rendered.replace(f"{{{name}}}", str(value))
+    path = scope["path"]
+    if path.endswith(rendered):
+        return path[: len(path) - len(rendered)] + template
+    return template
+
+
+class MetricsMiddleware:
+    """
+    Считает запросы и их длительность по шаблону маршрута и статусу.
+    Шаблон (/api/v1/departments/{department_id}) берётся из scope["route"],
+    поэтому число рядов не растёт с числом id; запросы без маршрута
+    учитываются как <unmatched>.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec()
+            labels = {
+                "method": scope["method"],
+                "route": route_template(scope),
+                "status": status_code,
+            }
+            http_requests.inc(**labels)
+            http_request_duration.observe(time.perf_counter() - started, **labels)
@@ -0,0 +1,88 @@
+import asyncio
+
+from loguru import logger
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.profiling import RequestProfile, current_profile, sampling_profiler
+
+
+def server_timing(profile: RequestProfile) -> str:
+    """
+    Server-Timing: db;dur=12.4;desc="3 queries", build;dur=1.1,
+    serialize;dur=0.4, app;dur=15.2
+    """
+    metrics = [
+        f'db;dur={profile.db_time * 1000:.1f};desc="{profile.db_queries} queries"'
+    ]
+    metrics.extend(
+        f"{name};dur={duration * 1000:.1f}"
+        for name, duration in profile.sections.items()
+    )
+    metrics.append(f"app;dur={profile.duration * 1000:.1f}")
+    return ", ".join(metrics)
+
+
+class ProfilingMiddleware:
+    """
+    Собирает профиль каждого запроса: число запросов к БД и время в ней
+    (хуки track_queries), время участков profile_section и общее время.
+    Отдаёт его в заголовке Server-Timing и пишет строкой лога по завершении
+    ответа; медленные запросы сохраняет sampling_profiler, если он включён.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        token = current_profile.set(profile)
+        sampling_profiler.start(profile)
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", server_timing(profile))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_profile.reset(token)
+            sampling_profiler.stop(profile)
+            await self._report(scope, profile, status_code)
+
+    async def _report(
+        self, scope: Scope, profile: RequestProfile, status_code: int
+    ) -> None:
+        duration = profile.duration
+        sections = {
+            f"{name}_ms": round(seconds * 1000, 2)
+            for name, seconds in profile.sections.items()
+        }
+        logger.bind(
+            method=scope["method"],
+            path=scope["path"],
+            status=status_code,
+            duration_ms=round(duration * 1000, 2),
+            db_queries=profile.db_queries,
+            db_ms=round(profile.db_time * 1000, 2),
+            **sections,
+        ).info(
+            f"{scope['method']} {scope['path']} {status_code} за {duration * 1000:.1f} мс, "
+            f"запросов к БД: {profile.db_queries} ({profile.db_time * 1000:.1f} мс)"
+        )
+
+        if profile.samples:
+            path = await asyncio.to_thread(
+                sampling_profiler.dump, profile, f"{scope['method']} {scope['path']}"
+            )
+            if path is not None:
+                logger.warning(f"Медленный запрос, профиль сохранён: {path}")
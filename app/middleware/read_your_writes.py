@@ -0,0 +1,67 @@
+import math
+import time
+from typing import Callable
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config.settings import settings
+from app.database import session as database_session
+
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def read_only(endpoint: Callable) -> Callable:
+    """
+    Отмечает эндпоинт, который принимает POST только ради тела запроса
+    (пакетное чтение) и ничего не меняет: cookie после него не ставится.
+    """
+    endpoint.read_only = True
+    return endpoint
+
+
+class ReadYourWritesMiddleware:
+    """
+    После успешного изменяющего запроса ставит клиенту cookie со временем,
+    до которого его чтения направляются в основную БД (get_read_session_db).
+    Так клиент видит собственные изменения, даже если реплика отстаёт.
+    Без реплики cookie не ставится: все чтения и так идут в основную БД.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        cookie_name: str = settings.READ_YOUR_WRITES_COOKIE,
+        window: float = settings.READ_YOUR_WRITES_WINDOW,
+    ):
+        self.app = app
+        self.cookie_name = cookie_name
+        self.window = window
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] in SAFE_METHODS
+            or database_session.replica_session_factory is None
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if (
+                message["type"] == "http.response.start"
+                and message["status"] < 400
+                # endpoint появляется в scope после маршрутизации
+                and not getattr(scope.get("endpoint"), "read_only", False)
+            ):
+                until = time.time() + self.window
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Set-Cookie",
+                    f"{self.cookie_name}={until:.3f}; Max-Age={math.ceil(self.window)}; "
+                    "Path=/; HttpOnly; SameSite=lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
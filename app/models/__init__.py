@@ -1,4 +1,5 @@
 from app.models.department import Department
 from app.models.employee import Employee
+from app.models.job import Job
 
-__all__ = ["Department", "Employee"]
+__all__ = ["Department", "Employee", "Job"]
@@ -1,12 +1,14 @@
 from datetime import datetime
 
 from sqlalchemy import (
+    BigInteger,
     String,
     ForeignKey,
     DateTime,
     func,
     UniqueConstraint,
     CheckConstraint,
+    Index,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -21,6 +23,8 @@ class Department(Base):
         CheckConstraint(
             "parent_id IS NULL OR parent_id <> id", name="ck_department_not_self_parent"
         ),
+        Index("ix_departments_created_at_id", "created_at", "id"),
+        Index("ix_departments_path", "path"),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -31,6 +35,20 @@ class Department(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
+    # Материализованный путь от корня: "1.5.12". Collation "C" даёт побайтовое
+    # сравнение, поэтому поддерево - это диапазон [path, path || '/') по индексу.
+    path: Mapped[str] = mapped_column(String(collation="C"), nullable=False)
+    level: Mapped[int] = mapped_column(nullable=False, default=0)
+    # Увеличивается при любом изменении в поддереве (включая сотрудников),
+    # служит дешёвым маркером для ETag.
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="0")
+    # Агрегаты поддерева, поддерживаются приращениями при каждой записи
+    # (apply_aggregate_deltas / shift_subtree_aggregates в репозитории):
+    # сотрудники самого подразделения, сотрудники всего поддерева
+    # и число подразделений под ним.
+    headcount: Mapped[int] = mapped_column(nullable=False, server_default="0")
+    subtree_headcount: Mapped[int] = mapped_column(nullable=False, server_default="0")
+    descendants_count: Mapped[int] = mapped_column(nullable=False, server_default="0")
 
     parent: Mapped["Department | None"] = relationship(
         "Department",
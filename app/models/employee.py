@@ -1,6 +1,7 @@
 from datetime import datetime, date
 
-from sqlalchemy import String, ForeignKey, DateTime, func, Date
+from sqlalchemy import String, ForeignKey, DateTime, func, Date, Index, Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -9,6 +10,12 @@ from app.models.base import Base
 class Employee(Base):
     __tablename__ = "employees"
 
+    __table_args__ = (
+        Index("ix_employees_created_at_id", "created_at", "id"),
+        Index("ix_employees_department_id", "department_id"),
+        Index("ix_employees_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
     id: Mapped[int] = mapped_column(primary_key=True)
     department_id: Mapped[int] = mapped_column(
         ForeignKey("departments.id", ondelete="CASCADE"), nullable=False
@@ -19,6 +26,18 @@ class Employee(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
+    # Полнотекстовый индекс для поиска: совпадения в имени весят больше,
+    # чем в должности. Конфигурация 'simple' - без стемминга, только
+    # нижний регистр, что подходит для имён на любом языке.
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('simple', full_name), 'A') || "
+            "setweight(to_tsvector('simple', position), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
 
     department: Mapped["Department"] = relationship(  # noqa: F821
         "Department", back_populates="employees"
@@ -0,0 +1,41 @@
+from datetime import datetime
+
+from sqlalchemy import String, Text, DateTime, BigInteger, func, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    __table_args__ = (Index("ix_jobs_status_heartbeat_at", "status", "heartbeat_at"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    kind: Mapped[str] = mapped_column(String(50), nullable=False)
+    status: Mapped[str] = mapped_column(String(20), nullable=False)
+    params: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    total: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    processed: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, server_default="0"
+    )
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    # Аренда задачи: воркер продлевает её каждые JOB_HEARTBEAT_INTERVAL
+    # секунд, пока задача выполняется. Задачу с просроченной арендой (воркер
+    # умер) забирает цикл опроса любого другого воркера.
+    heartbeat_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+    def __repr__(self) -> str:
+        return f"<Job id={self.id} kind={self.kind!r} status={self.status!r}>"
@@ -1,10 +1,23 @@
-from typing import TypeVar, Generic, Type, Sequence
+from typing import TypeVar, Generic, Type, Sequence, AsyncIterator
 
 from pydantic import BaseModel
-from sqlalchemy import select, insert, delete, update
+from sqlalchemy import (
+    select,
+    insert,
+    delete,
+    update,
+    tuple_,
+    any_,
+    literal,
+    Integer,
+    Select,
+    RowMapping,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.base import Base
+from app.utils.cursor import encode_cursor, decode_cursor
 
 
 ModelType = TypeVar("ModelType", bound=Base)
@@ -20,11 +33,70 @@ class BaseRepository(Generic[ModelType]):
         result = await self.session.execute(query)
         return result.scalars().all()
 
+    async def get_page(
+        self, limit: int, after: str | None = None, *filter, **filter_by
+    ) -> tuple[Sequence[ModelType], str | None]:
+        """
+        Keyset-пагинация по (created_at, id):
+
+        SELECT * FROM table
+        WHERE (created_at, id) > (:created_at, :id)
+        ORDER BY created_at, id
+        LIMIT :limit + 1
+        """
+        query = (
+            select(self.model)
+            .filter(*filter)
+            .filter_by(**filter_by)
+            .order_by(self.model.created_at, self.model.id)
+            .limit(limit + 1)
+        )
+        if after is not None:
+            created_at, object_id = decode_cursor(after)
+            query = query.where(
+                tuple_(self.model.created_at, self.model.id) > (created_at, object_id)
+            )
+
+        result = await self.session.execute(query)
+        rows = result.scalars().all()
+
+        if len(rows) <= limit:
+            return rows, None
+
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    async def stream_rows(
+        self, query: Select, batch_size: int
+    ) -> AsyncIterator[Sequence[RowMapping]]:
+        """
+        Читает результат серверным курсором пачками по batch_size строк,
+        не загружая всю выборку в память.
+        """
+        result = await self.session.stream(
+            query.execution_options(yield_per=batch_size)
+        )
+        async for batch in result.mappings().partitions():
+            yield batch
+
     async def get_one_or_none(self, **filter_by) -> ModelType | None:
         query = select(self.model).filter_by(**filter_by)
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
 
+    async def get_by_ids(self, ids: list[int]) -> dict[int, ModelType]:
+        """
+        SELECT * FROM table WHERE id = ANY($1::int[])
+
+        Все id передаются одним параметром-массивом, поэтому текст запроса
+        (и подготовленное выражение) не зависит от их числа.
+        """
+        query = select(self.model).where(
+            self.model.id == any_(literal(ids, ARRAY(Integer)))
+        )
+        result = await self.session.execute(query)
+        return {row.id: row for row in result.scalars()}
+
     async def create(self, data: BaseModel) -> ModelType:
         stmt = insert(self.model).values(**data.model_dump()).returning(self.model)
         result = await self.session.execute(stmt)
@@ -44,6 +116,22 @@ class BaseRepository(Generic[ModelType]):
         await self.session.commit()
         return result.scalar_one_or_none()
 
+    async def copy_records(
+        self,
+        columns: list[str],
+        records: list[tuple],
+        model: Type[Base] | None = None,
+    ) -> None:
+        """
+        COPY table (columns) FROM STDIN через asyncpg в текущей транзакции
+        сессии. Ошибки ограничений приходят как исключения asyncpg.
+        """
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            (model or self.model).__tablename__, columns=columns, records=records
+        )
+
     async def delete(self, **filter_by) -> None:
         stmt = delete(self.model).filter_by(**filter_by)
         await self.session.execute(stmt)
@@ -1,11 +1,37 @@
-from typing import Sequence
+from collections import Counter
+from typing import Sequence, AsyncIterator
 
 from loguru import logger
-from sqlalchemy import select, update, delete, literal
+from sqlalchemy import (
+    JSON,
+    RowMapping,
+    true,
+    select,
+    update,
+    delete,
+    insert,
+    func,
+    and_,
+    or_,
+    any_,
+    literal,
+    cast,
+    case,
+    union_all,
+    Integer,
+    Select,
+    CTE,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import aliased
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.sql.elements import ColumnElement
 
+from app.database.notifications import (
+    department_changes_notification,
+    notify_department_changes,
+)
 from app.models.employee import Employee
 from app.models.department import Department
 from app.repositories.base import BaseRepository
@@ -22,71 +48,392 @@ from app.utils.exceptions import (
 )
 
 
+def subtree_condition(root_path: ColumnElement[str] | str) -> ColumnElement[bool]:
+    """
+    path >= :root_path AND path < :root_path || '/'
+
+    В пути встречаются только цифры и точки, а '/' идёт сразу после '.',
+    поэтому диапазон покрывает сам корень и всех его потомков.
+    """
+    return and_(Department.path >= root_path, Department.path < root_path + "/")
+
+
+async def touch_departments(
+    session: AsyncSession, department_ids: list[int | None]
+) -> None:
+    """
+    UPDATE departments SET version = version + 1
+    WHERE id IN (
+        SELECT unnest(string_to_array(path, '.'))::int
+        FROM departments
+        WHERE id = ANY(:department_ids)
+    )
+
+    Увеличивает версию самих подразделений и всех их предков.
+    """
+    department_ids = [
+        department_id for department_id in department_ids if department_id
+    ]
+    if not department_ids:
+        return
+
+    ancestor_ids = select(
+        cast(func.unnest(func.string_to_array(Department.path, ".")), Integer)
+    ).where(Department.id.in_(department_ids))
+
+    await session.execute(
+        update(Department)
+        .where(Department.id.in_(ancestor_ids))
+        .values(version=Department.version + 1)
+    )
+
+
+async def apply_aggregate_deltas(
+    session: AsyncSession,
+    employees: dict[int, int] | None = None,
+    departments: dict[int, int] | None = None,
+) -> None:
+    """
+    WITH deltas AS (
+        SELECT * FROM unnest(:ids, :employees, :departments)
+            AS deltas(id, employees, departments)
+    ), ancestors AS (
+        SELECT a.id::int AS id, sum(deltas.employees) AS employees,
+               sum(deltas.departments) AS departments
+        FROM deltas
+        JOIN departments s ON s.id = deltas.id
+        CROSS JOIN unnest(string_to_array(s.path, '.')) AS a(id)
+        GROUP BY a.id
+    )
+    UPDATE departments d
+    SET headcount = d.headcount
+            + COALESCE((SELECT employees FROM deltas WHERE deltas.id = d.id), 0),
+        subtree_headcount = d.subtree_headcount + ancestors.employees,
+        descendants_count = d.descendants_count + ancestors.departments
+    FROM ancestors
+    WHERE d.id = ancestors.id
+
+    employees - изменение числа сотрудников, непосредственно работающих в
+    подразделении; departments - изменение числа подразделений под ним.
+    Обе дельты применяются к подразделению и всем его предкам одним
+    запросом, сколько бы подразделений ни было затронуто.
+    """
+    employees = {k: v for k, v in (employees or {}).items() if k and v}
+    departments = {k: v for k, v in (departments or {}).items() if k and v}
+    ids = sorted(employees.keys() | departments.keys())
+    if not ids:
+        return
+
+    deltas = (
+        func.unnest(
+            cast(ids, ARRAY(Integer)),
+            cast([employees.get(i, 0) for i in ids], ARRAY(Integer)),
+            cast([departments.get(i, 0) for i in ids], ARRAY(Integer)),
+        )
+        .table_valued("id", "employees", "departments")
+        .render_derived(name="deltas")
+    )
+    source = aliased(Department, name="s")
+    ancestor_id = (
+        func.unnest(func.string_to_array(source.path, "."))
+        .table_valued("id")
+        .render_derived(name="a")
+    )
+    ancestors = (
+        select(
+            cast(ancestor_id.c.id, Integer).label("id"),
+            func.sum(deltas.c.employees).label("employees"),
+            func.sum(deltas.c.departments).label("departments"),
+        )
+        .select_from(deltas)
+        .join(source, source.id == deltas.c.id)
+        .join(ancestor_id, true())
+        .group_by(ancestor_id.c.id)
+        .subquery("ancestors")
+    )
+    direct = (
+        select(deltas.c.employees).where(deltas.c.id == Department.id).scalar_subquery()
+    )
+
+    await session.execute(
+        update(Department)
+        .where(Department.id == ancestors.c.id)
+        .values(
+            headcount=Department.headcount + func.coalesce(direct, 0),
+            subtree_headcount=Department.subtree_headcount + ancestors.c.employees,
+            descendants_count=Department.descendants_count + ancestors.c.departments,
+        )
+    )
+
+
+async def shift_subtree_aggregates(
+    session: AsyncSession, department_id: int, sign: int
+) -> None:
+    """
+    UPDATE departments d
+    SET subtree_headcount = d.subtree_headcount + :sign * r.subtree_headcount,
+        descendants_count = d.descendants_count + :sign * (r.descendants_count + 1)
+    FROM departments r
+    WHERE r.id = :department_id
+      AND d.id IN (SELECT unnest(string_to_array(r.path, '.'))::int)
+      AND d.id <> r.id
+
+    Вычитает (sign=-1) или прибавляет (sign=1) всё поддерево department_id
+    у его предков по текущему пути: до переноса или удаления - у старых
+    предков, после переноса - у новых.
+    """
+    root = aliased(Department, name="r")
+    await session.execute(
+        update(Department)
+        .where(
+            root.id == department_id,
+            Department.id.in_(
+                select(
+                    cast(func.unnest(func.string_to_array(root.path, ".")), Integer)
+                ).correlate(root)
+            ),
+            Department.id != root.id,
+        )
+        .values(
+            subtree_headcount=Department.subtree_headcount
+            + sign * root.subtree_headcount,
+            descendants_count=Department.descendants_count
+            + sign * (root.descendants_count + 1),
+        )
+    )
+
+
+def shift_ancestors(department_id: int, *parts: Select) -> CTE:
+    """
+    WITH deltas AS (
+        SELECT a.id::int AS id, sum(p.headcount) AS headcount,
+               sum(p.subtree_headcount) AS subtree_headcount,
+               sum(p.descendants_count) AS descendants_count
+        FROM (<parts> UNION ALL ...) p
+        CROSS JOIN unnest(string_to_array(p.path, '.')) AS a(id)
+        GROUP BY a.id
+    )
+    UPDATE departments d
+    SET version = d.version + 1, headcount = d.headcount + deltas.headcount, ...
+    FROM deltas
+    WHERE d.id = deltas.id AND d.id <> :department_id
+
+    Изменяющий CTE для вставки в запрос переноса или удаления. Каждая
+    часть parts - SELECT path, headcount, subtree_headcount,
+    descendants_count: дельты применяются ко всем подразделениям пути.
+    Дельты одного подразделения из разных частей (общие предки старого и
+    нового места) складываются, так что строка обновляется один раз, как
+    того требует PostgreSQL для изменяющих CTE. Само department_id
+    исключено - его обновляет основная часть запроса.
+    """
+    union = union_all(*parts).subquery("p")
+    ancestor_id = (
+        func.unnest(func.string_to_array(union.c.path, "."))
+        .table_valued("id")
+        .render_derived(name="a")
+    )
+    deltas = (
+        select(
+            cast(ancestor_id.c.id, Integer).label("id"),
+            func.sum(union.c.headcount).label("headcount"),
+            func.sum(union.c.subtree_headcount).label("subtree_headcount"),
+            func.sum(union.c.descendants_count).label("descendants_count"),
+        )
+        .select_from(union)
+        .join(ancestor_id, true())
+        .group_by(ancestor_id.c.id)
+        .cte("deltas")
+    )
+    return (
+        update(Department)
+        .where(Department.id == deltas.c.id, Department.id != department_id)
+        .values(
+            version=Department.version + 1,
+            headcount=Department.headcount + deltas.c.headcount,
+            subtree_headcount=Department.subtree_headcount + deltas.c.subtree_headcount,
+            descendants_count=Department.descendants_count + deltas.c.descendants_count,
+        )
+        .returning(Department.id)
+        .cte("ancestors")
+    )
+
+
+def path_deltas(
+    path: ColumnElement[str],
+    headcount: ColumnElement[int] | int = 0,
+    subtree_headcount: ColumnElement[int] | int = 0,
+    descendants_count: ColumnElement[int] | int = 0,
+) -> Select:
+    """Часть для shift_ancestors: дельты для всех подразделений пути path."""
+    deltas = {
+        "headcount": headcount,
+        "subtree_headcount": subtree_headcount,
+        "descendants_count": descendants_count,
+    }
+    return select(
+        path.label("path"),
+        *(
+            (literal(value, Integer) if isinstance(value, int) else value).label(name)
+            for name, value in deltas.items()
+        ),
+    )
+
+
 class DepartmentRepository(BaseRepository[Department]):
     def __init__(self, session: AsyncSession):
         super().__init__(Department, session)
 
     async def get_department_tree(
-        self, department_id: int, max_depth: int
+        self, department_id: int, max_depth: int, include_employees: bool = False
     ) -> list[dict]:
         """
-        WITH RECURSIVE subtree AS (
-            SELECT id, name, parent_id, created_at, 0 AS depth
-            FROM departments
-            WHERE id = :department_id
-
-            UNION ALL
-
-            SELECT d.id, d.name, d.parent_id, d.created_at, s.depth + 1
-            FROM departments d
-            JOIN subtree s ON d.parent_id = s.id
-            WHERE s.depth < :max_depth
+        WITH root AS (
+            SELECT path, level FROM departments WHERE id = :department_id
         )
-        SELECT * FROM subtree
+        SELECT d.id, d.name, d.parent_id, d.created_at, d.headcount,
+               d.subtree_headcount, d.descendants_count, d.path, d.version,
+               d.level - root.level AS depth
+               [, COALESCE(e.employees, '[]') AS employees]
+        FROM departments d
+        CROSS JOIN root
+        [LEFT JOIN LATERAL (
+            SELECT json_agg(json_build_object('full_name', full_name, ...)
+                            ORDER BY created_at)
+                AS employees
+            FROM employees WHERE department_id = d.id
+        ) e ON true]
+        WHERE d.path >= root.path AND d.path < root.path || '/'
+          AND d.level <= root.level + :max_depth
+        ORDER BY d.level
+
+        С include_employees сотрудники агрегируются в том же запросе,
+        по одному JSON-массиву на подразделение. Порядок ключей совпадает
+        с полями EmployeeRead, чтобы ответ можно было отдать без валидации.
         """
-        subtree = (
+        root = (
+            select(Department.path, Department.level)
+            .where(Department.id == department_id)
+            .cte(name="root")
+        )
+
+        query = (
             select(
                 Department.id,
                 Department.name,
                 Department.parent_id,
                 Department.created_at,
-                literal(0).label("depth"),
+                Department.headcount,
+                Department.subtree_headcount,
+                Department.descendants_count,
+                Department.path,
+                Department.version,
+                (Department.level - root.c.level).label("depth"),
             )
-            .where(Department.id == department_id)
-            .cte(name="subtree", recursive=True)
+            .where(subtree_condition(root.c.path))
+            .where(Department.level <= root.c.level + max_depth)
+            .order_by(Department.level)
         )
 
-        depart = aliased(Department)
-
-        subtree = subtree.union_all(
-            select(
-                depart.id,
-                depart.name,
-                depart.parent_id,
-                depart.created_at,
-                (subtree.c.depth + 1).label("depth"),
+        if include_employees:
+            employees = (
+                select(
+                    func.json_agg(
+                        aggregate_order_by(
+                            func.json_build_object(
+                                "full_name",
+                                Employee.full_name,
+                                "position",
+                                Employee.position,
+                                "hired_at",
+                                Employee.hired_at,
+                                "id",
+                                Employee.id,
+                                "department_id",
+                                Employee.department_id,
+                                "created_at",
+                                Employee.created_at,
+                            ),
+                            Employee.created_at,
+                        ),
+                        type_=JSON,
+                    ).label("employees")
+                )
+                .where(Employee.department_id == Department.id)
+                .lateral("e")
             )
-            .join(subtree, depart.parent_id == subtree.c.id)
-            .where(subtree.c.depth < max_depth)
-        )
+            query = query.add_columns(
+                func.coalesce(employees.c.employees, literal([], JSON)).label(
+                    "employees"
+                )
+            ).outerjoin(employees, true())
 
-        result = await self.session.execute(select(subtree))
+        result = await self.session.execute(query)
         return result.mappings().all()
 
-    async def get_employees_by_departments(
-        self, department_ids: list[int]
-    ) -> Sequence[Employee]:
+    def stream_departments(
+        self, batch_size: int
+    ) -> AsyncIterator[Sequence[RowMapping]]:
+        """
+        SELECT id, name, parent_id, path, level AS depth, created_at
+        FROM departments
+        ORDER BY path
+
+        Сортировка по пути гарантирует, что родитель идёт раньше потомков.
+        """
+        query = select(
+            Department.id,
+            Department.name,
+            Department.parent_id,
+            Department.path,
+            Department.level.label("depth"),
+            Department.created_at,
+        ).order_by(Department.path)
+        return self.stream_rows(query, batch_size)
+
+    async def get_department_version(self, department_id: int) -> int | None:
+        query = select(Department.version).where(Department.id == department_id)
+        result = await self.session.execute(query)
+        return result.scalar_one_or_none()
+
+    async def create_department(self, data: DepartmentCreate) -> Department:
+        """
+        INSERT INTO departments (id, name, parent_id, path, level)
+        SELECT new.id, :name, :parent_id,
+               COALESCE(p.path || '.', '') || new.id, COALESCE(p.level + 1, 0)
+        FROM (SELECT nextval('departments_id_seq') AS id) new
+        LEFT JOIN departments p ON p.id = :parent_id
+        RETURNING *
+        """
+        new = select(func.nextval("departments_id_seq").label("id")).subquery("new")
+        parent = aliased(Department)
+
+        source = select(
+            new.c.id,
+            literal(data.name),
+            literal(data.parent_id, Department.parent_id.type),
+            func.coalesce(parent.path + ".", "")
+            + func.cast(new.c.id, Department.path.type),
+            func.coalesce(parent.level + 1, 0),
+        ).select_from(new.outerjoin(parent, parent.id == data.parent_id))
+
         stmt = (
-            select(Employee)
-            .where(Employee.department_id.in_(department_ids))
-            .order_by(Employee.created_at)
+            insert(Department)
+            .from_select(["id", "name", "parent_id", "path", "level"], source)
+            .returning(Department)
         )
-        result = await self.session.execute(stmt)
-        return result.scalars().all()
 
-    async def create_department(self, data: DepartmentCreate) -> Department:
         try:
-            return await self.create(data)
+            result = await self.session.execute(stmt)
+            department = result.scalars().one()
+            await touch_departments(self.session, [department.parent_id])
+            await apply_aggregate_deltas(
+                self.session, departments={department.parent_id: 1}
+            )
+            await notify_department_changes(
+                self.session, [department.id, department.parent_id]
+            )
+            await self.session.commit()
+            return department
 
         except IntegrityError as e:
             await self.session.rollback()
@@ -102,51 +449,171 @@ class DepartmentRepository(BaseRepository[Department]):
             else:
                 raise
 
-    async def is_department_descendant(
-        self, department_id: int, new_parent_id: int
-    ) -> bool:
+    async def get_department_paths(
+        self, department_ids: list[int | None]
+    ) -> dict[int, str]:
         """
-        WITH RECURSIVE subtree AS (
-            SELECT id FROM departments WHERE id = :department_id
-            UNION ALL
-            SELECT d.id FROM departments d
-            JOIN subtree s ON d.parent_id = s.id
-        )
-        SELECT EXISTS(SELECT id FROM subtree WHERE id = :new_parent_id)
+        SELECT id, path FROM departments WHERE id IN (:department_ids)
+
+        Одним запросом отвечает на все проверки перед изменением: какие из
+        подразделений существуют и не лежит ли новый родитель в поддереве.
         """
-        subtree = (
-            select(Department.id)
-            .where(Department.id == department_id)
-            .cte(name="subtree", recursive=True)
+        department_ids = [
+            department_id for department_id in department_ids if department_id
+        ]
+        if not department_ids:
+            return {}
+
+        query = select(Department.id, Department.path).where(
+            Department.id.in_(department_ids)
         )
+        result = await self.session.execute(query)
+        return {department_id: path for department_id, path in result}
 
-        depart = aliased(Department)
+    async def get_ancestors(
+        self, department_ids: list[int]
+    ) -> dict[int, list[Department]]:
+        """
+        SELECT d.id, a.*
+        FROM departments d
+        JOIN departments a
+          ON a.id = ANY(string_to_array(d.path, '.')::int[])
+        WHERE d.id = ANY(:department_ids)
+        ORDER BY d.id, a.level
 
-        subtree = subtree.union_all(
-            select(depart.id).join(subtree, depart.parent_id == subtree.c.id)
+        Цепочки от корня до каждого из подразделений одним запросом:
+        материализованный путь уже хранит id предков, поэтому рекурсия
+        вверх по parent_id не нужна - предки читаются по первичному ключу.
+        """
+        descendant = aliased(Department)
+        query = (
+            select(descendant.id, Department)
+            .join(
+                Department,
+                Department.id
+                == func.any(
+                    cast(func.string_to_array(descendant.path, "."), ARRAY(Integer))
+                ),
+            )
+            .where(descendant.id.in_(department_ids))
+            .order_by(descendant.id, Department.level)
         )
+        result = await self.session.execute(query)
 
-        query = select(
-            select(subtree.c.id)
-            .where(subtree.c.id == new_parent_id)  # type: ignore[arg-type]
-            .exists()
+        ancestors = {}
+        for department_id, ancestor in result:
+            ancestors.setdefault(department_id, []).append(ancestor)
+        return ancestors
+
+    async def get_with_children(
+        self, department_ids: list[int]
+    ) -> tuple[dict[int, Department], dict[int, list[Department]]]:
+        """
+        SELECT * FROM departments
+        WHERE id = ANY($1::int[]) OR parent_id = ANY($1::int[])
+        ORDER BY id
+
+        Подразделения и их прямые дочерние одним запросом (индексы по id и
+        parent_id объединяются через BitmapOr). Возвращает найденные
+        подразделения по id и дочерние по id родителя.
+        """
+        ids = literal(department_ids, ARRAY(Integer))
+        query = (
+            select(Department)
+            .where(or_(Department.id == any_(ids), Department.parent_id == any_(ids)))
+            .order_by(Department.id)
         )
         result = await self.session.execute(query)
-        return result.scalar()
+
+        requested = set(department_ids)
+        departments = {}
+        children = {}
+        for department in result.scalars():
+            if department.id in requested:
+                departments[department.id] = department
+            if department.parent_id in requested:
+                children.setdefault(department.parent_id, []).append(department)
+        return departments, children
 
     async def update_department(
         self, department_id: int, data: dict
     ) -> Department | None:
-        try:
-            stmt = (
-                update(self.model)
-                .where(self.model.id == department_id)
-                .values(**data)
-                .returning(self.model)
+        """
+        Одним запросом: изменяющие CTE обновляют предков (shift_ancestors:
+        версия, при переносе - агрегаты старых и новых предков) и само
+        подразделение (при переносе - всё поддерево: path, level, version),
+        а pg_notify выбирается в том же запросе. Проверки (существование,
+        цикл) сервис уже сделал одним запросом get_department_paths.
+        """
+        moved = (
+            select(
+                Department.path,
+                Department.level,
+                Department.subtree_headcount,
+                Department.descendants_count,
             )
+            .where(Department.id == department_id)
+            .cte(name="moved")
+        )
+        parent = aliased(Department, name="parent")
+        new_parent_id = data.get("parent_id")
+
+        if "parent_id" in data:
+            parts = [
+                path_deltas(
+                    moved.c.path,
+                    subtree_headcount=-moved.c.subtree_headcount,
+                    descendants_count=-moved.c.descendants_count - 1,
+                )
+            ]
+            if new_parent_id is not None:
+                parts.append(
+                    path_deltas(
+                        parent.path,
+                        subtree_headcount=moved.c.subtree_headcount,
+                        descendants_count=moved.c.descendants_count + 1,
+                    )
+                    .select_from(moved)
+                    .join(parent, parent.id == new_parent_id)
+                )
+            # версия, имя и parent_id корня переносимого поддерева - в той
+            # же строке UPDATE, что и его путь: строку нельзя обновить дважды
+            values = {
+                key: case(
+                    (
+                        Department.id == department_id,
+                        literal(value, Department.__table__.c[key].type),
+                    ),
+                    else_=Department.__table__.c[key],
+                )
+                for key, value in data.items()
+            }
+            updated = self._move_subtree(department_id, new_parent_id, moved, values)
+        else:
+            parts = [path_deltas(moved.c.path)]
+            updated = (
+                update(Department)
+                .where(Department.id == department_id)
+                .values(version=Department.version + 1, **data)
+                .returning(*Department.__table__.c)
+                .cte("updated")
+            )
+
+        department = aliased(Department, updated)
+        stmt = (
+            select(
+                department,
+                department_changes_notification([department_id, new_parent_id]),
+            )
+            .add_cte(shift_ancestors(department_id, *parts))
+            .where(updated.c.id == department_id)
+            .execution_options(populate_existing=True)
+        )
+        try:
             result = await self.session.execute(stmt)
+            row = result.one_or_none()
             await self.session.commit()
-            return result.scalar_one_or_none()
+            return row[0] if row else None
 
         except IntegrityError as e:
             await self.session.rollback()
@@ -158,19 +625,354 @@ class DepartmentRepository(BaseRepository[Department]):
             else:
                 raise
 
+    def _move_subtree(
+        self,
+        department_id: int,
+        new_parent_id: int | None,
+        moved: CTE,
+        values: dict,
+    ) -> CTE:
+        """
+        UPDATE departments
+        SET path = :new_prefix || substr(path, length(moved.path) + 1),
+            level = level - moved.level + :new_level,
+            version = version + 1
+        FROM moved
+        WHERE path >= moved.path AND path < moved.path || '/'
+        RETURNING departments.*
+
+        new_prefix - путь нового родителя + '.' + department_id (или просто
+        department_id при переносе в корень). values - дополнительные
+        значения столбцов (CASE для корня поддерева).
+        """
+        if new_parent_id is None:
+            new_prefix = literal(str(department_id))
+            new_level = literal(0)
+        else:
+            parent = aliased(Department)
+            new_prefix = (
+                select(parent.path + f".{department_id}")
+                .where(parent.id == new_parent_id)
+                .scalar_subquery()
+            )
+            new_level = (
+                select(parent.level + 1)
+                .where(parent.id == new_parent_id)
+                .scalar_subquery()
+            )
+
+        return (
+            update(Department)
+            .where(subtree_condition(moved.c.path))
+            .values(
+                path=new_prefix
+                + func.substr(Department.path, func.length(moved.c.path) + 1),
+                level=Department.level - moved.c.level + new_level,
+                version=Department.version + 1,
+                **values,
+            )
+            .returning(*Department.__table__.c)
+            .cte("updated")
+        )
+
+    def _subtree_root(self, department_id: int) -> CTE:
+        return (
+            select(
+                Department.path,
+                Department.subtree_headcount,
+                Department.descendants_count,
+            )
+            .where(Department.id == department_id)
+            .cte(name="root")
+        )
+
     async def delete_department_cascade(self, department_id: int) -> None:
-        await self.delete(id=department_id)
+        """
+        Одним запросом: предки теряют поддерево (shift_ancestors), корень
+        удаляется (потомки и сотрудники - каскадом по внешним ключам),
+        pg_notify выбирается из результата удаления.
+        """
+        root = self._subtree_root(department_id)
+        ancestors = shift_ancestors(
+            department_id,
+            path_deltas(
+                root.c.path,
+                subtree_headcount=-root.c.subtree_headcount,
+                descendants_count=-root.c.descendants_count - 1,
+            ),
+        )
+        deleted = (
+            delete(Department)
+            .where(Department.id == department_id)
+            .returning(Department.id)
+            .cte("deleted")
+        )
+        await self.session.execute(
+            select(
+                deleted.c.id, department_changes_notification([department_id])
+            ).add_cte(ancestors)
+        )
+        await self.session.commit()
 
     async def delete_department_reassign(
         self, department_id: int, reassign_to_department_id: int
     ) -> None:
-        stmt = (
+        """
+        Одним запросом: сотрудники переводятся в reassign_to_department_id,
+        предки удаляемого теряют поддерево, новое подразделение и его
+        предки получают переведённых сотрудников (shift_ancestors складывает
+        дельты общих предков), корень удаляется, pg_notify - в результате.
+        Внешние ключи проверяются в конце запроса, поэтому каскад уже не
+        видит переведённых сотрудников.
+        """
+        root = self._subtree_root(department_id)
+        reassigned = (
             update(Employee)
             .where(Employee.department_id == department_id)
             .values(department_id=reassign_to_department_id)
+            .returning(Employee.id)
+            .cte("reassigned")
+        )
+        moved = select(func.count().label("count")).select_from(reassigned).cte("moved")
+        target = aliased(Department, name="target")
+        ancestors = shift_ancestors(
+            department_id,
+            path_deltas(
+                root.c.path,
+                subtree_headcount=-root.c.subtree_headcount,
+                descendants_count=-root.c.descendants_count - 1,
+            ),
+            path_deltas(target.path, subtree_headcount=moved.c.count)
+            .select_from(moved)
+            .join(target, target.id == reassign_to_department_id),
+            path_deltas(
+                literal(str(reassign_to_department_id)), headcount=moved.c.count
+            ).select_from(moved),
+        )
+        deleted = (
+            delete(Department)
+            .where(Department.id == department_id)
+            .returning(Department.id)
+            .cte("deleted")
         )
-        await self.session.execute(stmt)
         await self.session.execute(
-            delete(self.model).where(self.model.id == department_id)
+            select(
+                deleted.c.id,
+                department_changes_notification(
+                    [department_id, reassign_to_department_id]
+                ),
+            ).add_cte(ancestors)
         )
         await self.session.commit()
+
+    async def count_subtree_rows(
+        self, department_id: int, limit: int | None = None
+    ) -> int:
+        """
+        WITH root AS (SELECT path FROM departments WHERE id = :department_id)
+        SELECT
+            (SELECT count(*) FROM (
+                SELECT 1 FROM departments d, root
+                WHERE d.path >= root.path AND d.path < root.path || '/'
+                LIMIT :limit) s)
+          + (SELECT count(*) FROM (
+                SELECT 1 FROM employees e JOIN departments d ON d.id = e.department_id, root
+                WHERE d.path >= root.path AND d.path < root.path || '/'
+                LIMIT :limit) s)
+
+        Число подразделений и сотрудников в поддереве. С limit каждое
+        слагаемое ограничено сверху, чтобы проверка порога не сканировала
+        огромное поддерево целиком.
+        """
+        root = (
+            select(Department.path)
+            .where(Department.id == department_id)
+            .cte(name="root")
+        )
+        departments = (
+            select(literal(1))
+            .select_from(Department)
+            .where(subtree_condition(root.c.path))
+        )
+        employees = (
+            select(literal(1))
+            .select_from(Employee)
+            .join(Department, Department.id == Employee.department_id)
+            .where(subtree_condition(root.c.path))
+        )
+        if limit is not None:
+            departments = departments.limit(limit)
+            employees = employees.limit(limit)
+
+        query = select(
+            select(func.count()).select_from(departments.subquery()).scalar_subquery()
+            + select(func.count()).select_from(employees.subquery()).scalar_subquery()
+        )
+        result = await self.session.execute(query)
+        return result.scalar_one()
+
+    async def reassign_employees(
+        self, department_id: int, reassign_to_department_id: int
+    ) -> None:
+        """
+        UPDATE employees SET department_id = :reassign_to_department_id
+        WHERE department_id = :department_id
+
+        Без коммита: выполняется в транзакции шага фоновой задачи.
+        """
+        await self._reassign_employees(department_id, reassign_to_department_id)
+        await notify_department_changes(
+            self.session, [department_id, reassign_to_department_id]
+        )
+
+    async def _reassign_employees(
+        self, department_id: int, reassign_to_department_id: int
+    ) -> None:
+        await touch_departments(
+            self.session, [department_id, reassign_to_department_id]
+        )
+        result = await self.session.execute(
+            update(Employee)
+            .where(Employee.department_id == department_id)
+            .values(department_id=reassign_to_department_id)
+        )
+        await apply_aggregate_deltas(
+            self.session,
+            employees={
+                department_id: -result.rowcount,
+                reassign_to_department_id: result.rowcount,
+            },
+        )
+
+    async def delete_subtree_batch(self, department_id: int, batch_size: int) -> int:
+        """
+        Удаляет из поддерева не больше batch_size строк и возвращает их число
+        (0 - поддерево удалено целиком). Сначала удаляются сотрудники:
+
+        DELETE FROM employees WHERE id IN (
+            SELECT e.id FROM employees e JOIN departments d ON d.id = e.department_id
+            WHERE <поддерево> LIMIT :batch_size
+        ) RETURNING department_id
+
+        затем подразделения, начиная с самых глубоких:
+
+        SELECT id, parent_id FROM departments WHERE <поддерево>
+        ORDER BY level DESC LIMIT :batch_size
+
+        DELETE FROM departments WHERE id IN (:ids)
+
+        Все более глубокие уровни к этому моменту уже удалены, поэтому каждое
+        удаляемое подразделение - лист, и ON DELETE CASCADE ничего не
+        затрагивает. Версии затронутых подразделений и их предков
+        увеличиваются. Без коммита: его делает JobRepository.add_progress.
+        """
+        root_path = (
+            select(Department.path)
+            .where(Department.id == department_id)
+            .scalar_subquery()
+        )
+
+        employee_ids = (
+            select(Employee.id)
+            .join(Department, Department.id == Employee.department_id)
+            .where(subtree_condition(root_path))
+            .limit(batch_size)
+        )
+        result = await self.session.execute(
+            delete(Employee)
+            .where(Employee.id.in_(employee_ids))
+            .returning(Employee.department_id)
+        )
+        touched_ids = result.scalars().all()
+        headcounts = {
+            employee_department_id: -count
+            for employee_department_id, count in Counter(touched_ids).items()
+        }
+
+        if not touched_ids:
+            result = await self.session.execute(
+                select(Department.id, Department.parent_id)
+                .where(subtree_condition(root_path))
+                .order_by(Department.level.desc())
+                .limit(batch_size)
+            )
+            rows = result.all()
+            touched_ids = [parent_id for _, parent_id in rows]
+            # агрегаты предков уменьшаются до удаления, пока пути
+            # удаляемых подразделений ещё можно прочитать
+            await apply_aggregate_deltas(
+                self.session,
+                departments={
+                    parent_id: -count
+                    for parent_id, count in Counter(touched_ids).items()
+                },
+            )
+            await self.session.execute(
+                delete(Department).where(Department.id.in_([row.id for row in rows]))
+            )
+
+        deleted = len(touched_ids)
+        if deleted:
+            touched_ids = list(set(touched_ids))
+            await apply_aggregate_deltas(self.session, employees=headcounts)
+            await touch_departments(self.session, touched_ids)
+            await notify_department_changes(self.session, touched_ids)
+        return deleted
+
+    async def allocate_department_ids(self, count: int) -> list[int]:
+        """
+        SELECT nextval('departments_id_seq') FROM generate_series(1, :count)
+        """
+        query = select(func.nextval("departments_id_seq")).select_from(
+            func.generate_series(1, count)
+        )
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
+    async def import_department_tree(
+        self,
+        departments: list[tuple],
+        employees: list[tuple],
+        parent_id: int | None,
+    ) -> None:
+        """
+        Загружает уже развёрнутое дерево двумя COPY в одной транзакции.
+        departments идут по уровням, поэтому родитель всегда раньше потомков;
+        агрегаты узлов посчитаны заранее, предкам корня они прибавляются
+        одним запросом.
+        """
+        try:
+            await self.copy_records(
+                [
+                    "id",
+                    "name",
+                    "parent_id",
+                    "path",
+                    "level",
+                    "headcount",
+                    "subtree_headcount",
+                    "descendants_count",
+                ],
+                departments,
+            )
+            if employees:
+                await self.copy_records(
+                    ["department_id", "full_name", "position", "hired_at"],
+                    employees,
+                    model=Employee,
+                )
+            await touch_departments(self.session, [parent_id])
+            await shift_subtree_aggregates(self.session, departments[0][0], 1)
+            await notify_department_changes(
+                self.session, [departments[0][0], parent_id]
+            )
+            await self.session.commit()
+
+        except (ForeignKeyViolationError, UniqueViolationError) as e:
+            await self.session.rollback()
+            logger.warning(
+                f"Ошибка импорта дерева подразделений: {e.__class__.__name__}"
+            )
+            if isinstance(e, ForeignKeyViolationError):
+                raise ParentDepartmentNotFoundException()
+            raise DepartmentNameExistsException()
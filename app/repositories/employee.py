@@ -1,11 +1,23 @@
+from typing import Sequence, AsyncIterator
+
 from asyncpg.exceptions import ForeignKeyViolationError
 from loguru import logger
+from sqlalchemy import insert, select, func, literal, or_, and_, RowMapping
+from sqlalchemy.dialects.postgresql import REGCONFIG
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.database.notifications import notify_department_changes
+from app.models.department import Department
 from app.models.employee import Employee
 from app.repositories.base import BaseRepository
+from app.repositories.department import (
+    touch_departments,
+    apply_aggregate_deltas,
+    subtree_condition,
+)
 from app.schemas.employee import EmployeeBase, EmployeeCreate
+from app.utils.cursor import encode_rank_cursor, decode_rank_cursor
 from app.utils.exceptions import DepartmentNotFoundException
 
 
@@ -17,7 +29,18 @@ class EmployeeRepository(BaseRepository[Employee]):
         employee_data = EmployeeCreate(**data.model_dump(), department_id=department_id)
 
         try:
-            return await self.create(employee_data)
+            stmt = (
+                insert(self.model)
+                .values(**employee_data.model_dump())
+                .returning(self.model)
+            )
+            result = await self.session.execute(stmt)
+            employee = result.scalars().one()
+            await touch_departments(self.session, [department_id])
+            await apply_aggregate_deltas(self.session, employees={department_id: 1})
+            await notify_department_changes(self.session, [department_id])
+            await self.session.commit()
+            return employee
 
         except IntegrityError as e:
             await self.session.rollback()
@@ -28,3 +51,112 @@ class EmployeeRepository(BaseRepository[Employee]):
                 raise DepartmentNotFoundException()
             else:
                 raise
+
+    def stream_employees(self, batch_size: int) -> AsyncIterator[Sequence[RowMapping]]:
+        """
+        SELECT id, department_id, full_name, position, hired_at, created_at
+        FROM employees
+        ORDER BY id
+        """
+        query = select(
+            Employee.id,
+            Employee.department_id,
+            Employee.full_name,
+            Employee.position,
+            Employee.hired_at,
+            Employee.created_at,
+        ).order_by(Employee.id)
+        return self.stream_rows(query, batch_size)
+
+    async def search(
+        self,
+        prefix_query: str,
+        limit: int,
+        after: str | None = None,
+        department_id: int | None = None,
+    ) -> tuple[Sequence[Employee], str | None]:
+        """
+        SELECT e.*, ts_rank(e.search_vector, q) AS rank
+        FROM employees e
+        [JOIN departments d ON d.id = e.department_id AND <поддерево>]
+        WHERE e.search_vector @@ to_tsquery('simple', :prefix_query)
+          [AND (rank < :rank OR rank = :rank AND e.id > :id)]
+        ORDER BY rank DESC, e.id
+        LIMIT :limit + 1
+
+        Совпадения находятся по GIN-индексу search_vector; keyset-пагинация
+        идёт по (rank, id), курсор хранит ранг последней строки.
+        """
+        tsquery = func.to_tsquery(literal("simple", REGCONFIG), prefix_query)
+        rank = func.ts_rank(Employee.search_vector, tsquery)
+
+        query = (
+            select(Employee, rank.label("rank"))
+            .where(Employee.search_vector.op("@@")(tsquery))
+            .order_by(rank.desc(), Employee.id)
+            .limit(limit + 1)
+        )
+        if department_id is not None:
+            root_path = (
+                select(Department.path)
+                .where(Department.id == department_id)
+                .scalar_subquery()
+            )
+            query = query.join(
+                Department, Department.id == Employee.department_id
+            ).where(subtree_condition(root_path))
+        if after is not None:
+            after_rank, after_id = decode_rank_cursor(after)
+            query = query.where(
+                or_(
+                    rank < after_rank,
+                    and_(rank == after_rank, Employee.id > after_id),
+                )
+            )
+
+        result = await self.session.execute(query)
+        rows = result.all()
+
+        if len(rows) <= limit:
+            return [employee for employee, _ in rows], None
+
+        rows = rows[:limit]
+        last_employee, last_rank = rows[-1]
+        return [employee for employee, _ in rows], encode_rank_cursor(
+            last_rank, last_employee.id
+        )
+
+    async def get_existing_department_ids(self, department_ids: set[int]) -> set[int]:
+        query = select(Department.id).where(Department.id.in_(department_ids))
+        result = await self.session.execute(query)
+        return set(result.scalars().all())
+
+    async def copy_employees(self, employees: list[EmployeeCreate]) -> None:
+        """
+        COPY employees (department_id, full_name, position, hired_at) FROM STDIN
+
+        Выполняется в текущей транзакции сессии, фиксация - в commit_import.
+        """
+        try:
+            await self.copy_records(
+                ["department_id", "full_name", "position", "hired_at"],
+                [
+                    (e.department_id, e.full_name, e.position, e.hired_at)
+                    for e in employees
+                ],
+            )
+
+        except ForeignKeyViolationError:
+            await self.session.rollback()
+            logger.warning("Ошибка импорта работников: ForeignKeyViolationError")
+            raise DepartmentNotFoundException()
+
+    async def commit_import(self, headcounts: dict[int, int]) -> None:
+        """headcounts - число загруженных работников по подразделениям."""
+        await touch_departments(self.session, list(headcounts))
+        await apply_aggregate_deltas(self.session, employees=headcounts)
+        await notify_department_changes(self.session, headcounts)
+        await self.session.commit()
+
+    async def rollback(self) -> None:
+        await self.session.rollback()
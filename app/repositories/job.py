@@ -0,0 +1,160 @@
+from typing import Sequence
+
+from sqlalchemy import insert, select, update, or_, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.job import Job
+from app.repositories.base import BaseRepository
+from app.schemas.job import JobKind, JobStatus
+
+
+class JobRepository(BaseRepository[Job]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(Job, session)
+
+    async def create_job(self, kind: JobKind, params: dict) -> Job:
+        """
+        Задача сразу создаётся в статусе running: её выполняет воркер,
+        который её создал.
+        """
+        stmt = (
+            insert(self.model)
+            .values(kind=kind.value, status=JobStatus.running.value, params=params)
+            .returning(self.model)
+        )
+        result = await self.session.execute(stmt)
+        await self.session.commit()
+        return result.scalars().one()
+
+    async def get_active_job(self, kind: JobKind, params: dict) -> Job | None:
+        """
+        SELECT * FROM jobs
+        WHERE kind = :kind AND status IN ('pending', 'running')
+          AND params @> :params
+        LIMIT 1
+        """
+        query = (
+            select(self.model)
+            .where(
+                self.model.kind == kind.value,
+                self.model.status.in_(
+                    [JobStatus.pending.value, JobStatus.running.value]
+                ),
+                self.model.params.contains(params),
+            )
+            .limit(1)
+        )
+        result = await self.session.execute(query)
+        return result.scalar_one_or_none()
+
+    async def claim_jobs(self, stale_after: float) -> Sequence[Job]:
+        """
+        UPDATE jobs SET status = 'running', updated_at = now(), heartbeat_at = now()
+        WHERE id IN (
+            SELECT id FROM jobs
+            WHERE status = 'pending'
+               OR status = 'running'
+              AND heartbeat_at < now() - make_interval(secs => :stale_after)
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING *
+
+        Забирает отложенные задачи и задачи с просроченной арендой (воркер
+        умер и перестал её продлевать). SKIP LOCKED не даёт двум воркерам
+        забрать одну задачу.
+        """
+        claimable = (
+            select(Job.id)
+            .where(
+                or_(
+                    Job.status == JobStatus.pending.value,
+                    (Job.status == JobStatus.running.value)
+                    & (
+                        Job.heartbeat_at
+                        < func.now() - func.make_interval(0, 0, 0, 0, 0, 0, stale_after)
+                    ),
+                )
+            )
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(self.model)
+            .where(self.model.id.in_(claimable))
+            .values(
+                status=JobStatus.running.value,
+                updated_at=func.now(),
+                heartbeat_at=func.now(),
+            )
+            .returning(self.model)
+        )
+        result = await self.session.execute(stmt)
+        await self.session.commit()
+        return result.scalars().all()
+
+    async def add_progress(
+        self, job_id: int, processed: int, total: int | None = None
+    ) -> None:
+        """
+        Фиксирует прогресс и коммитит транзакцию вместе с уже выполненным
+        в ней шагом задачи, так что прогресс всегда совпадает с данными.
+        """
+        values = {
+            "processed": self.model.processed + processed,
+            "updated_at": func.now(),
+            "heartbeat_at": func.now(),
+        }
+        if total is not None:
+            values["total"] = total
+
+        await self.session.execute(
+            update(self.model).where(self.model.id == job_id).values(**values)
+        )
+        await self.session.commit()
+
+    async def heartbeat(self, job_id: int) -> bool:
+        """
+        UPDATE jobs SET heartbeat_at = now()
+        WHERE id = :job_id AND status = 'running'
+        RETURNING id
+
+        Продлевает аренду выполняемой задачи. False - задача уже не
+        выполняется (завершена или возвращена в очередь).
+        """
+        result = await self.session.execute(
+            update(self.model)
+            .where(
+                self.model.id == job_id,
+                self.model.status == JobStatus.running.value,
+            )
+            .values(heartbeat_at=func.now())
+            .returning(self.model.id)
+        )
+        await self.session.commit()
+        return result.scalar_one_or_none() is not None
+
+    async def finish_job(
+        self, job_id: int, status: JobStatus, error: str | None = None
+    ) -> None:
+        await self.session.execute(
+            update(self.model)
+            .where(self.model.id == job_id)
+            .values(
+                status=status.value,
+                error=error,
+                updated_at=func.now(),
+                finished_at=func.now(),
+            )
+        )
+        await self.session.commit()
+
+    async def release_job(self, job_id: int) -> None:
+        """Возвращает незавершённую задачу в очередь при остановке воркера."""
+        await self.session.execute(
+            update(self.model)
+            .where(
+                self.model.id == job_id,
+                self.model.status == JobStatus.running.value,
+            )
+            .values(status=JobStatus.pending.value, updated_at=func.now())
+        )
+        await self.session.commit()
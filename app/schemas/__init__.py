@@ -5,6 +5,8 @@ from app.schemas.department import (
     DepartmentRead,
     DepartmentTree,
 )
+from app.schemas.batch import BatchGetQuery, BatchGetResult
+from app.schemas.pagination import Page
 
 __all__ = [
     "EmployeeCreate",
@@ -13,4 +15,7 @@ __all__ = [
     "DepartmentUpdate",
     "DepartmentRead",
     "DepartmentTree",
+    "Page",
+    "BatchGetQuery",
+    "BatchGetResult",
 ]
@@ -0,0 +1,19 @@
+from typing import Annotated, Generic, TypeVar
+
+from pydantic import BaseModel, Field
+
+
+ItemType = TypeVar("ItemType")
+
+# первичные ключи - INTEGER: id вне его диапазона - 422, а не ошибка БД
+ObjectId = Annotated[int, Field(gt=0, le=2**31 - 1)]
+
+
+class BatchGetQuery(BaseModel):
+    ids: list[ObjectId] = Field(min_length=1, max_length=5000)
+
+
+class BatchGetResult(BaseModel, Generic[ItemType]):
+    # в порядке ids запроса, null - объект не найден
+    items: list[ItemType | None]
+    missing: list[int] = []
@@ -2,6 +2,8 @@ from datetime import datetime
 from enum import Enum
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
+from app.schemas.batch import BatchGetQuery, ObjectId
+
 
 class DepartmentDeleteMode(str, Enum):
     cascade = "cascade"
@@ -45,6 +47,18 @@ class DepartmentUpdate(BaseModel):
 class DepartmentRead(DepartmentBase):
     id: int
     created_at: datetime
+    headcount: int = 0
+    subtree_headcount: int = 0
+    descendants_count: int = 0
+    # id подразделений от корня до самого подразделения
+    path: list[int] | None = None
+
+    @field_validator("path", mode="before")
+    @classmethod
+    def split_path(cls, v: str | list[int] | None) -> list[int] | None:
+        if isinstance(v, str):
+            v = [int(department_id) for department_id in v.split(".")]
+        return v
 
 
 class DepartmentTree(DepartmentRead):
@@ -52,7 +66,62 @@ class DepartmentTree(DepartmentRead):
     children: list["DepartmentTree"] = []
 
 
-from app.schemas.employee import EmployeeRead  # noqa: E402
+class DepartmentStats(BaseModel):
+    id: int
+    headcount: int
+    subtree_headcount: int
+    descendants_count: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class DepartmentChildSummary(BaseModel):
+    id: int
+    name: str
+    headcount: int = 0
+    subtree_headcount: int = 0
+    descendants_count: int = 0
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class DepartmentBatchItem(DepartmentRead):
+    # прямые дочерние подразделения, если запрошены include_children;
+    # заполняются сервисом: alias не даёт читать relationship Department.children
+    children: list[DepartmentChildSummary] | None = Field(
+        default=None, validation_alias="children_summary"
+    )
+
+
+class DepartmentBatchGetQuery(BatchGetQuery):
+    include_children: bool = False
+
+
+class DepartmentAncestorsQuery(BaseModel):
+    ids: list[ObjectId] = Field(min_length=1, max_length=1000)
+
+
+class DepartmentImport(BaseModel):
+    name: str = Field(min_length=1, max_length=200)
+    employees: list["EmployeeBase"] = []
+    children: list["DepartmentImport"] = []
+
+    @field_validator("name", mode="before")
+    @classmethod
+    def strip_name(cls, v: str) -> str:
+        if isinstance(v, str):
+            v = v.strip()
+        return v
+
+
+class DepartmentImportResult(BaseModel):
+    root: DepartmentRead
+    departments_created: int
+    employees_created: int
+
+
+from app.schemas.employee import EmployeeRead, EmployeeBase  # noqa: E402
 
 
 DepartmentTree.model_rebuild()
+DepartmentImport.model_rebuild()
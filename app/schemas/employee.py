@@ -28,3 +28,13 @@ class EmployeeRead(EmployeeBase):
     id: int
     department_id: int
     created_at: datetime
+
+
+class EmployeeImportError(BaseModel):
+    row: int
+    errors: list[str]
+
+
+class EmployeeImportResult(BaseModel):
+    created: int
+    errors: list[EmployeeImportError] = []
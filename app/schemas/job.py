@@ -0,0 +1,31 @@
+from datetime import datetime
+from enum import Enum
+
+from pydantic import BaseModel, ConfigDict
+
+
+class JobKind(str, Enum):
+    delete_subtree = "delete_subtree"
+
+
+class JobStatus(str, Enum):
+    pending = "pending"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+
+
+class JobRead(BaseModel):
+    id: int
+    kind: JobKind
+    status: JobStatus
+    params: dict
+    total: int | None
+    processed: int
+    error: str | None
+    created_at: datetime
+    updated_at: datetime
+    heartbeat_at: datetime
+    finished_at: datetime | None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,47 @@
+from pydantic import BaseModel
+
+
+class CacheStats(BaseModel):
+    enabled: bool
+    version: int
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    evictions: int
+    inflight: int
+    computed: int
+    coalesced: int
+
+
+class AdmissionStats(BaseModel):
+    cost_class: str
+    enabled: bool
+    limit: int
+    queue_size: int
+    active: int
+    queued: int
+    admitted: int
+    rejected: int
+    timed_out: int
+
+
+class HistogramBucket(BaseModel):
+    le: float
+    count: int
+
+
+class Histogram(BaseModel):
+    buckets: list[HistogramBucket]
+    count: int
+    sum: float
+
+
+class PoolStats(BaseModel):
+    pool_size: int
+    max_overflow: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    timeouts: int
+    wait_time: Histogram
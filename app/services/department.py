@@ -1,12 +1,31 @@
-from collections import defaultdict
-from typing import Sequence
+from datetime import datetime, timezone
+from typing import AsyncIterator
 
 from loguru import logger
+from pydantic_core import to_json
 
-from app.models import Department
+from app.config.settings import settings
+from app.jobs import job_runner
+from app.models import Department, Job
 from app.repositories.department import DepartmentRepository
-from app.schemas import DepartmentCreate, DepartmentUpdate
-from app.schemas.department import DepartmentDeleteMode, DepartmentTree
+from app.schemas import BatchGetResult, DepartmentCreate, DepartmentUpdate, Page
+from app.schemas.department import (
+    DepartmentBatchItem,
+    DepartmentChildSummary,
+    DepartmentDeleteMode,
+    DepartmentRead,
+    DepartmentImport,
+    DepartmentImportResult,
+)
+from app.schemas.export import ExportFormat
+from app.schemas.job import JobKind
+from app.utils.admission import admission_limiters, tree_cost_class
+from app.utils.cache import department_tree_cache, department_tree_flights
+from app.utils.export import encode_export
+from app.utils.compression import CompressibleBody
+from app.utils.etag import make_etag, make_hashed_etag, etag_matches
+from app.utils.metrics import department_deletes, departments_created, employees_created
+from app.utils.profiling import profile_section
 from app.utils.exceptions import (
     RequestBodyRequiredException,
     DepartmentNotFoundException,
@@ -16,6 +35,8 @@ from app.utils.exceptions import (
     ReassignModeException,
     TargetDepartmentNotFoundException,
     ReassignToSelfException,
+    ReassignToSubtreeException,
+    DepartmentNameExistsException,
 )
 
 
@@ -23,47 +44,214 @@ class DepartmentService:
     def __init__(self, repository: DepartmentRepository):
         self.repository = repository
 
-    async def get_departments(self) -> Sequence[Department]:
-        return await self.repository.get_all()
+    async def get_departments(
+        self, limit: int, after: str | None = None, if_none_match: str | None = None
+    ) -> tuple[Page[DepartmentRead] | None, str]:
+        departments, next_cursor = await self.repository.get_page(limit, after)
+        etag = make_hashed_etag(
+            [(department.id, department.version) for department in departments],
+            next_cursor,
+        )
+        if etag_matches(if_none_match, etag):
+            return None, etag
+
+        return Page[DepartmentRead](items=departments, next_cursor=next_cursor), etag
+
+    def export_departments(self, export_format: ExportFormat) -> AsyncIterator[bytes]:
+        logger.info("Экспорт подразделений в формате {}", export_format.value)
+        return encode_export(
+            self.repository.stream_departments(settings.EXPORT_BATCH_SIZE),
+            export_format,
+            ["id", "name", "parent_id", "path", "depth", "created_at"],
+        )
 
     async def get_department_by_id(
-        self, department_id: int, depth: int, include_employees: bool
-    ) -> DepartmentTree:
+        self,
+        department_id: int,
+        depth: int,
+        include_employees: bool,
+        if_none_match: str | None = None,
+    ) -> tuple[CompressibleBody | None, str]:
+        """
+        Возвращает готовое JSON-тело дерева и его ETag. Если If-None-Match
+        совпал, вместо тела возвращается None, а само дерево не строится.
+        Тело кэшируется вместе со сжатыми вариантами (CompressibleBody).
+        """
         logger.info(
-            f"Получение подразделения id={department_id}, глубина={depth}, вывод работников={include_employees}"
+            "Получение подразделения id={department_id}, глубина={depth}, вывод работников={include_employees}",
+            department_id=department_id,
+            depth=depth,
+            include_employees=include_employees,
+        )
+        cache_key = (department_id, depth, include_employees)
+        session_info = self.repository.session.info
+        # после своей записи (только при настроенной реплике) клиент читает
+        # мимо кэша и общих построений: они могли начаться до записи
+        fresh_read = session_info.get("reads_own_writes", False)
+
+        cached = None if fresh_read else department_tree_cache.get(cache_key)
+        if cached is not None:
+            tree, etag = cached
+            logger.info("Дерево подразделения получено из кэша")
+            return (None, etag) if etag_matches(if_none_match, etag) else cached
+
+        if if_none_match:
+            version = await self.repository.get_department_version(department_id)
+            if version is not None:
+                etag = make_etag(department_id, version, depth, int(include_employees))
+                if etag_matches(if_none_match, etag):
+                    logger.info("Дерево подразделения не изменилось")
+                    return None, etag
+
+        cache_version = department_tree_cache.version
+
+        limiter = admission_limiters[tree_cost_class(depth, include_employees)]
+
+        async def build() -> tuple[CompressibleBody, str]:
+            # слот занимает только построение: попадания в кэш и запросы,
+            # присоединившиеся к построению, не ограничиваются
+            async with limiter.slot():
+                content, version = await self._get_department_tree(
+                    department_id, depth, include_employees
+                )
+            body = CompressibleBody(content)
+            etag = make_etag(department_id, version, depth, int(include_employees))
+            if not fresh_read and await self._replica_caught_up(department_id, version):
+                department_tree_cache.set(cache_key, (body, etag), cache_version)
+            return body, etag
+
+        if fresh_read:
+            return await build()
+
+        # версия кэша в ключе: запрос после записи не присоединится
+        # к построению, начатому до неё
+        flight_key = (cache_key, cache_version)
+        return await department_tree_flights.do(flight_key, build)
+
+    async def _replica_caught_up(self, department_id: int, version: int) -> bool:
+        """
+        Дерево с реплики попадает в кэш, только если реплика уже догнала
+        основную БД по этому подразделению. Любое изменение в поддереве
+        увеличивает версию его корня, поэтому достаточно сравнить версию
+        дерева с версией в основной БД - один запрос по первичному ключу
+        на заполнение кэша. Изменения после проверки инвалидируют кэш, и
+        запись с устаревшей версией кэша отбрасывается. Дерево из основной
+        БД кэшируется без проверки.
+        """
+        primary = self.repository.session.info.get("primary")
+        if primary is None:
+            return True
+        primary_version = await DepartmentRepository(primary).get_department_version(
+            department_id
+        )
+        if primary_version is None or version < primary_version:
+            logger.info("Реплика отстаёт, дерево подразделения не кэшируется")
+            return False
+        return True
+
+    async def _get_department_tree(
+        self, department_id: int, depth: int, include_employees: bool
+    ) -> tuple[bytes, int]:
+        """
+        Строки приходят из БД и уже соответствуют схеме DepartmentTree,
+        поэтому дерево собирается из словарей и сразу сериализуется в JSON,
+        минуя валидацию моделей.
+        """
+        rows = await self.repository.get_department_tree(
+            department_id, depth, include_employees
         )
-        rows = await self.repository.get_department_tree(department_id, depth)
 
         if not rows:
             logger.warning("Ошибка получения - подразделение не найдено")
             raise DepartmentNotFoundException()
 
-        if include_employees:
-            department_ids = [row["id"] for row in rows]
-            employees = await self.repository.get_employees_by_departments(
-                department_ids
+        logger.info("Дерево подразделения получено")
+        with profile_section("build"):
+            tree = self._build_tree(rows)
+        with profile_section("serialize"):
+            body = to_json(tree)
+        return body, rows[0]["version"]
+
+    async def get_department_stats(self, department_id: int) -> Department:
+        department = await self.repository.get_one_or_none(id=department_id)
+        if not department:
+            logger.warning(
+                "Ошибка получения статистики - подразделение не найдено, id={department_id}",
+                department_id=department_id,
             )
+            raise DepartmentNotFoundException()
+        return department
 
-            employees_tree = defaultdict(list)
-            for emp in employees:
-                employees_tree[emp.department_id].append(emp)
+    async def get_department_ancestors(self, department_id: int) -> list[Department]:
+        ancestors = await self.repository.get_ancestors([department_id])
+        if department_id not in ancestors:
+            logger.warning(
+                "Ошибка получения предков - подразделение не найдено, id={department_id}",
+                department_id=department_id,
+            )
+            raise DepartmentNotFoundException()
+        return ancestors[department_id]
+
+    async def get_departments_ancestors(
+        self, department_ids: list[int]
+    ) -> dict[int, list[Department]]:
+        """Несуществующие подразделения в ответ не попадают."""
+        return await self.repository.get_ancestors(department_ids)
 
-            logger.info("Дерево подразделения с работниками получено")
-            return DepartmentTree(**self._build_tree(rows, employees_tree))
+    async def get_departments_batch(
+        self, department_ids: list[int], include_children: bool = False
+    ) -> BatchGetResult[DepartmentBatchItem]:
+        """
+        Подразделения в порядке department_ids, на месте ненайденных - None
+        (их id также перечислены в missing). С include_children к каждому
+        добавляется сводка по прямым дочерним подразделениям.
+        """
+        logger.info(
+            "Пакетное получение подразделений: {} id, дочерние={}",
+            len(department_ids),
+            include_children,
+        )
+        if include_children:
+            departments, children = await self.repository.get_with_children(
+                department_ids
+            )
         else:
-            logger.info("Дерево подразделения получено")
-            return DepartmentTree(**self._build_tree(rows))
+            departments = await self.repository.get_by_ids(department_ids)
+
+        items = []
+        missing = []
+        for department_id in department_ids:
+            department = departments.get(department_id)
+            if department is None:
+                items.append(None)
+                missing.append(department_id)
+                continue
+
+            item = DepartmentBatchItem.model_validate(department)
+            if include_children:
+                item.children = [
+                    DepartmentChildSummary.model_validate(child)
+                    for child in children.get(department_id, [])
+                ]
+            items.append(item)
+        return BatchGetResult[DepartmentBatchItem](items=items, missing=missing)
 
     async def create_department(self, data: DepartmentCreate) -> Department:
-        logger.info(f"Создание подразделения: {data.model_dump()}")
+        logger.info("Создание подразделения: {!r}", data)
         result = await self.repository.create_department(data)
-        logger.info(f"Подразделение создано: {result!r}")
+        department_tree_cache.invalidate()
+        departments_created.inc(source="api")
+        logger.info("Подразделение создано: {!r}", result, department_id=result.id)
         return result
 
     async def update_department(
         self, department_id: int, data: DepartmentUpdate
     ) -> Department:
-        logger.info(f"Обновление подразделения id={department_id}, {data.model_dump()}")
+        logger.info(
+            "Обновление подразделения id={department_id}, {!r}",
+            data,
+            department_id=department_id,
+        )
         new_department_data = data.model_dump(exclude_unset=True)
 
         if not new_department_data:
@@ -72,52 +260,80 @@ class DepartmentService:
             )
             raise RequestBodyRequiredException()
 
-        if not await self.repository.get_one_or_none(id=department_id):
+        new_parent_id = new_department_data.get("parent_id")
+        paths = await self.repository.get_department_paths(
+            [department_id, new_parent_id]
+        )
+
+        if department_id not in paths:
             logger.warning(
-                f"Ошибка обновления - подразделение не найдено, id={department_id}"
+                "Ошибка обновления - подразделение не найдено, id={department_id}",
+                department_id=department_id,
             )
             raise DepartmentNotFoundException()
 
-        if "parent_id" in new_department_data:
-            new_parent_id = new_department_data.get("parent_id")
-
-            if new_parent_id is not None:
-                if new_parent_id == department_id:
-                    logger.warning(
-                        f"Ошибка обновления - подразделение не может быть родителем самому себе, id=parent_id={new_parent_id}"
-                    )
-                    raise DepartmentNotSelfParentException()
+        if new_parent_id is not None:
+            if new_parent_id == department_id:
+                logger.warning(
+                    "Ошибка обновления - подразделение не может быть родителем самому себе, id=parent_id={department_id}",
+                    department_id=department_id,
+                )
+                raise DepartmentNotSelfParentException()
 
-                if not await self.repository.get_one_or_none(id=new_parent_id):
-                    logger.warning(
-                        f"Ошибка обновления - родительское подразделение не найдено, parent_id={new_parent_id}"
-                    )
-                    raise ParentDepartmentNotFoundException()
+            if new_parent_id not in paths:
+                logger.warning(
+                    "Ошибка обновления - родительское подразделение не найдено, parent_id={parent_id}",
+                    department_id=department_id,
+                    parent_id=new_parent_id,
+                )
+                raise ParentDepartmentNotFoundException()
 
-                if await self.repository.is_department_descendant(
-                    department_id, new_parent_id
-                ):
-                    logger.warning(
-                        f"Ошибка обновления - цикл в дереве подразделений, id={department_id} parent_id={new_parent_id}"
-                    )
-                    raise DepartmentCycleException()
+            if str(department_id) in paths[new_parent_id].split("."):
+                logger.warning(
+                    "Ошибка обновления - цикл в дереве подразделений, id={department_id} parent_id={parent_id}",
+                    department_id=department_id,
+                    parent_id=new_parent_id,
+                )
+                raise DepartmentCycleException()
 
-        logger.info(
-            f"Подразделение успешно обновлено. id={department_id} new_data={new_department_data}"
-        )
-        return await self.repository.update_department(
+        result = await self.repository.update_department(
             department_id, new_department_data
         )
+        department_tree_cache.invalidate()
+        logger.info(
+            "Подразделение успешно обновлено. id={department_id} new_data={}",
+            new_department_data,
+            department_id=department_id,
+        )
+        return result
 
     async def delete_department(
         self, department_id: int, mode: str, reassign_to_department_id: int | None
-    ) -> None:
+    ) -> Job | None:
+        """
+        Небольшое поддерево удаляется сразу. Если в поддереве не меньше
+        JOB_DELETE_THRESHOLD подразделений и сотрудников, удаление ставится
+        фоновой задачей, и возвращается задача.
+        """
         logger.info(
-            f"Удаление подразделения id={department_id}, mode={mode}, new_parent_id={reassign_to_department_id}"
+            "Удаление подразделения id={department_id}, mode={mode}, new_parent_id={reassign_to_department_id}",
+            department_id=department_id,
+            mode=mode,
+            reassign_to_department_id=reassign_to_department_id,
+        )
+        paths = await self.repository.get_department_paths(
+            [
+                department_id,
+                reassign_to_department_id
+                if mode == DepartmentDeleteMode.reassign
+                else None,
+            ]
         )
-        if not await self.repository.get_one_or_none(id=department_id):
+
+        if department_id not in paths:
             logger.warning(
-                f"Ошибка удаления - подразделение не найдено, id={department_id}"
+                "Ошибка удаления - подразделение не найдено, id={department_id}",
+                department_id=department_id,
             )
             raise DepartmentNotFoundException()
 
@@ -132,37 +348,213 @@ class DepartmentService:
                 )
                 raise ReassignToSelfException()
 
-            if not await self.repository.get_one_or_none(id=reassign_to_department_id):
+            if reassign_to_department_id not in paths:
                 logger.warning(
-                    f"Ошибка удаления - новое подразделение не найдено reassign_to_department_id={reassign_to_department_id}"
+                    "Ошибка удаления - новое подразделение не найдено reassign_to_department_id={reassign_to_department_id}",
+                    department_id=department_id,
+                    reassign_to_department_id=reassign_to_department_id,
                 )
                 raise TargetDepartmentNotFoundException()
 
+            # сотрудники, перенесённые в удаляемое поддерево, удалились бы
+            # вместе с ним
+            if str(department_id) in paths[reassign_to_department_id].split("."):
+                logger.warning(
+                    "Ошибка удаления - новое подразделение в удаляемом поддереве reassign_to_department_id={reassign_to_department_id}",
+                    department_id=department_id,
+                    reassign_to_department_id=reassign_to_department_id,
+                )
+                raise ReassignToSubtreeException()
+
+        threshold = settings.JOB_DELETE_THRESHOLD
+        if threshold and (
+            await self.repository.count_subtree_rows(department_id, threshold)
+            >= threshold
+        ):
+            job = await job_runner.submit(
+                JobKind.delete_subtree,
+                {
+                    "department_id": department_id,
+                    "reassign_to_department_id": reassign_to_department_id
+                    if mode == DepartmentDeleteMode.reassign
+                    else None,
+                },
+            )
+            logger.info(
+                "Удаление подразделения id={department_id} поставлено в фоновую задачу {!r}",
+                job,
+                department_id=department_id,
+                job_id=job.id,
+            )
+            department_deletes.inc(
+                mode=DepartmentDeleteMode(mode).value, execution="job"
+            )
+            return job
+
+        if mode == DepartmentDeleteMode.reassign:
             await self.repository.delete_department_reassign(
                 department_id, reassign_to_department_id
             )
         else:
             await self.repository.delete_department_cascade(department_id)
 
+        department_tree_cache.invalidate()
+        department_deletes.inc(
+            mode=DepartmentDeleteMode(mode).value, execution="request"
+        )
+        logger.info(
+            "Успешное удаление подразделения id={department_id} в режиме {mode}",
+            department_id=department_id,
+            mode=mode,
+        )
+        return None
+
+    async def import_department_tree(
+        self, data: DepartmentImport, parent_id: int | None
+    ) -> DepartmentImportResult:
         logger.info(
-            f"Успешное удаление подразделения id={department_id} в режиме {mode}"
+            "Импорт дерева подразделений '{}', parent_id={parent_id}",
+            data.name,
+            parent_id=parent_id,
         )
+        nodes = self._flatten_import(data)
 
-    def _build_tree(
-        self, rows: list, employees_tree: dict | None = None
-    ) -> dict | None:
+        parent_path = None
+        parent_level = -1
+        if parent_id is not None:
+            parent = await self.repository.get_one_or_none(id=parent_id)
+            if not parent:
+                logger.warning(
+                    "Ошибка импорта - родительское подразделение не найдено, parent_id={parent_id}",
+                    parent_id=parent_id,
+                )
+                raise ParentDepartmentNotFoundException()
+            parent_path, parent_level = parent.path, parent.level
+
+        ids = await self.repository.allocate_department_ids(len(nodes))
+        paths: list[str] = []
+        levels: list[int] = []
+        departments = []
+        employees = []
+
+        for index, (node, parent_index) in enumerate(nodes):
+            department_id = ids[index]
+            if parent_index is None:
+                node_parent_id = parent_id
+                node_parent_path, node_parent_level = parent_path, parent_level
+            else:
+                node_parent_id = ids[parent_index]
+                node_parent_path = paths[parent_index]
+                node_parent_level = levels[parent_index]
+
+            path = (
+                f"{node_parent_path}.{department_id}"
+                if node_parent_path
+                else str(department_id)
+            )
+            paths.append(path)
+            levels.append(node_parent_level + 1)
+            departments.append(
+                (department_id, node.name, node_parent_id, path, levels[-1])
+            )
+            employees.extend(
+                (department_id, e.full_name, e.position, e.hired_at)
+                for e in node.employees
+            )
+
+        # агрегаты считаются снизу вверх: в обходе в ширину потомки идут
+        # после родителя, поэтому обратный порядок - от листьев к корню
+        subtree_headcounts = [len(node.employees) for node, _ in nodes]
+        descendants_counts = [0] * len(nodes)
+        for index in range(len(nodes) - 1, 0, -1):
+            parent_index = nodes[index][1]
+            subtree_headcounts[parent_index] += subtree_headcounts[index]
+            descendants_counts[parent_index] += descendants_counts[index] + 1
+
+        departments = [
+            (
+                *department,
+                len(node.employees),
+                subtree_headcounts[index],
+                descendants_counts[index],
+            )
+            for index, (department, (node, _)) in enumerate(zip(departments, nodes))
+        ]
+
+        await self.repository.import_department_tree(departments, employees, parent_id)
+        department_tree_cache.invalidate()
+        departments_created.inc(len(departments), source="import")
+        employees_created.inc(len(employees), source="import")
+
+        root = await self.repository.get_one_or_none(id=ids[0])
+        logger.info(
+            "Дерево подразделений импортировано: root_id={department_id}, подразделений={}, работников={}",
+            len(departments),
+            len(employees),
+            department_id=root.id,
+        )
+        return DepartmentImportResult(
+            root=root,
+            departments_created=len(departments),
+            employees_created=len(employees),
+        )
+
+    @staticmethod
+    def _flatten_import(
+        data: DepartmentImport,
+    ) -> list[tuple[DepartmentImport, int | None]]:
+        """
+        Разворачивает дерево в обход в ширину: (узел, индекс родителя).
+        Уникальность имён среди соседей проверяется здесь, до обращения к БД.
+        """
+        nodes: list[tuple[DepartmentImport, int | None]] = [(data, None)]
+        index = 0
+
+        while index < len(nodes):
+            node, _ = nodes[index]
+            names = set()
+            for child in node.children:
+                if child.name in names:
+                    logger.warning(
+                        "Ошибка импорта - повторяющееся имя подразделения '{}'",
+                        child.name,
+                    )
+                    raise DepartmentNameExistsException()
+                names.add(child.name)
+                nodes.append((child, index))
+            index += 1
+
+        return nodes
+
+    def _build_tree(self, rows: list) -> dict | None:
+        """
+        Ключи узлов и сотрудников идут в порядке полей DepartmentTree и
+        EmployeeRead, чтобы тело ответа совпадало с сериализацией модели.
+        """
         nodes = {}
         root = None
 
         for row in rows:
+            employees = row.get("employees", [])
+            for employee in employees:
+                # json_agg пишет время со смещением TimeZone сессии БД,
+                # asyncpg отдаёт created_at подразделения в UTC
+                employee["created_at"] = datetime.fromisoformat(
+                    employee["created_at"]
+                ).astimezone(timezone.utc)
+
             node = {
-                "id": row["id"],
                 "name": row["name"],
                 "parent_id": row["parent_id"],
+                "id": row["id"],
                 "created_at": row["created_at"],
-                "employees": employees_tree.get(row["id"], [])
-                if employees_tree
-                else [],
+                "headcount": row["headcount"],
+                "subtree_headcount": row["subtree_headcount"],
+                "descendants_count": row["descendants_count"],
+                "path": [
+                    int(department_id) for department_id in row["path"].split(".")
+                ],
+                "employees": employees,
                 "children": [],
             }
             nodes[row["id"]] = node
@@ -1,23 +1,187 @@
-from typing import Sequence
+import re
+from collections import Counter
+from typing import AsyncIterator
 
 from loguru import logger
+from pydantic import ValidationError
 
 from app.models import Employee
 from app.repositories.employee import EmployeeRepository
-from app.schemas.employee import EmployeeBase
+from app.schemas import BatchGetResult, Page
+from app.config.settings import settings
+from app.schemas.employee import (
+    EmployeeBase,
+    EmployeeRead,
+    EmployeeCreate,
+    EmployeeImportError,
+    EmployeeImportResult,
+)
+from app.schemas.export import ExportFormat
+from app.utils.cache import department_tree_cache
+from app.utils.metrics import employees_created
+from app.utils.export import encode_export
+from app.utils.exceptions import DepartmentNotFoundException
 
 
 class EmployeeService:
     def __init__(self, repository: EmployeeRepository):
         self.repository = repository
 
-    async def get_employees(self, *filter, **filter_by) -> Sequence[Employee]:
-        return await self.repository.get_all(*filter, **filter_by)
+    async def get_employees(
+        self, limit: int, after: str | None = None, *filter, **filter_by
+    ) -> Page[EmployeeRead]:
+        employees, next_cursor = await self.repository.get_page(
+            limit, after, *filter, **filter_by
+        )
+        return Page[EmployeeRead](items=employees, next_cursor=next_cursor)
+
+    async def get_employees_batch(
+        self, employee_ids: list[int]
+    ) -> BatchGetResult[EmployeeRead]:
+        logger.info("Пакетное получение работников: {} id", len(employee_ids))
+        employees = await self.repository.get_by_ids(employee_ids)
+        return BatchGetResult[EmployeeRead](
+            items=[employees.get(employee_id) for employee_id in employee_ids],
+            missing=[
+                employee_id
+                for employee_id in employee_ids
+                if employee_id not in employees
+            ],
+        )
+
+    async def search_employees(
+        self,
+        query: str,
+        limit: int,
+        after: str | None = None,
+        department_id: int | None = None,
+    ) -> Page[EmployeeRead]:
+        """
+        Каждое слово запроса ищется как префикс в имени или должности:
+        "ив пет" -> 'ив:* & пет:*'. Остальные символы отбрасываются, поэтому
+        пользовательский ввод не может сломать синтаксис tsquery. Регистр
+        приводит сам to_tsquery - по тем же правилам локали БД, что и
+        search_vector.
+        """
+        logger.info(
+            "Поиск работников: query={!r}, department_id={department_id}",
+            query,
+            department_id=department_id,
+        )
+        words = re.findall(r"\w+", query)
+        if not words:
+            return Page[EmployeeRead](items=[], next_cursor=None)
+
+        employees, next_cursor = await self.repository.search(
+            " & ".join(f"{word}:*" for word in words), limit, after, department_id
+        )
+        return Page[EmployeeRead](items=employees, next_cursor=next_cursor)
+
+    def export_employees(self, export_format: ExportFormat) -> AsyncIterator[bytes]:
+        logger.info("Экспорт работников в формате {}", export_format.value)
+        return encode_export(
+            self.repository.stream_employees(settings.EXPORT_BATCH_SIZE),
+            export_format,
+            ["id", "department_id", "full_name", "position", "hired_at", "created_at"],
+        )
 
     async def create_employee(self, department_id: int, data: EmployeeBase) -> Employee:
         logger.info(
-            f"Создание работника в подразделении(id={department_id}), data={data.model_dump()}"
+            "Создание работника в подразделении(id={department_id}), data={!r}",
+            data,
+            department_id=department_id,
         )
         result = await self.repository.create_employee(department_id, data)
-        logger.info(f"Работник успешно создан: {result!r}")
+        department_tree_cache.invalidate()
+        employees_created.inc(source="api")
+        logger.info(
+            "Работник успешно создан: {!r}",
+            result,
+            department_id=department_id,
+            employee_id=result.id,
+        )
         return result
+
+    async def import_employees(
+        self, rows: AsyncIterator[dict | Exception], atomic: bool = False
+    ) -> EmployeeImportResult:
+        """
+        Загружает работников пачками через COPY в одной транзакции.
+        Невалидные строки и строки с несуществующим подразделением попадают
+        в errors; при atomic=True любая ошибка отменяет весь импорт.
+        """
+        logger.info("Импорт работников, atomic={}", atomic)
+        created = 0
+        errors: list[EmployeeImportError] = []
+        headcounts: Counter[int] = Counter()
+        batch: list[tuple[int, EmployeeCreate]] = []
+
+        row_number = 0
+        async for row in rows:
+            row_number += 1
+            if isinstance(row, Exception):
+                errors.append(EmployeeImportError(row=row_number, errors=[str(row)]))
+                continue
+
+            try:
+                batch.append((row_number, EmployeeCreate.model_validate(row)))
+            except ValidationError as e:
+                errors.append(
+                    EmployeeImportError(
+                        row=row_number,
+                        errors=[
+                            f"{'.'.join(map(str, error['loc']))}: {error['msg']}"
+                            for error in e.errors()
+                        ],
+                    )
+                )
+                continue
+
+            if len(batch) >= settings.BULK_IMPORT_BATCH_SIZE:
+                created += await self._import_batch(batch, errors, headcounts)
+                batch = []
+
+        if batch:
+            created += await self._import_batch(batch, errors, headcounts)
+
+        errors.sort(key=lambda error: error.row)
+
+        if not created or (atomic and errors):
+            await self.repository.rollback()
+            logger.warning("Импорт работников отменён, ошибок: {}", len(errors))
+            return EmployeeImportResult(created=0, errors=errors)
+
+        await self.repository.commit_import(headcounts)
+        department_tree_cache.invalidate()
+        employees_created.inc(created, source="bulk")
+        logger.info(
+            "Импорт работников завершён: создано={}, ошибок={}", created, len(errors)
+        )
+        return EmployeeImportResult(created=created, errors=errors)
+
+    async def _import_batch(
+        self,
+        batch: list[tuple[int, EmployeeCreate]],
+        errors: list[EmployeeImportError],
+        headcounts: Counter[int],
+    ) -> int:
+        existing_ids = await self.repository.get_existing_department_ids(
+            {employee.department_id for _, employee in batch}
+        )
+
+        employees = []
+        for row_number, employee in batch:
+            if employee.department_id in existing_ids:
+                employees.append(employee)
+            else:
+                errors.append(
+                    EmployeeImportError(
+                        row=row_number, errors=[DepartmentNotFoundException.detail]
+                    )
+                )
+
+        if employees:
+            await self.repository.copy_employees(employees)
+            headcounts.update(employee.department_id for employee in employees)
+
+        return len(employees)
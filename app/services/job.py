@@ -0,0 +1,17 @@
+from loguru import logger
+
+from app.models import Job
+from app.repositories.job import JobRepository
+from app.utils.exceptions import JobNotFoundException
+
+
+class JobService:
+    def __init__(self, repository: JobRepository):
+        self.repository = repository
+
+    async def get_job(self, job_id: int) -> Job:
+        job = await self.repository.get_one_or_none(id=job_id)
+        if not job:
+            logger.warning(f"Задача не найдена, id={job_id}")
+            raise JobNotFoundException()
+        return job
@@ -0,0 +1,148 @@
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from loguru import logger
+
+from app.config.settings import settings
+from app.utils.exceptions import ServiceOverloadedException
+
+
+class AdmissionLimiter:
+    """
+    Ограничение числа одновременно выполняемых запросов одного класса
+    стоимости с ограниченной очередью.
+
+    Запрос сверх limit ждёт в очереди не дольше timeout; если очередь уже
+    заполнена или время ожидания вышло, сразу выбрасывается
+    ServiceOverloadedException (503 с Retry-After), а не копится
+    очередь к пулу соединений БД. Освободившийся слот передаётся первому
+    в очереди, поэтому порядок FIFO.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        limit: int,
+        queue_size: int,
+        timeout: float,
+        retry_after: int,
+        enabled: bool = True,
+    ):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self.enabled = enabled
+        self.active = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        if not self.enabled:
+            yield
+            return
+
+        await self._acquire()
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self) -> None:
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            self.admitted += 1
+            return
+
+        if len(self._waiters) >= self.queue_size:
+            self.rejected += 1
+            logger.warning(
+                "Очередь класса {} заполнена, запрос отклонён",
+                self.name,
+                cost_class=self.name,
+            )
+            raise ServiceOverloadedException(self.retry_after)
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await asyncio.wait_for(future, self.timeout)
+        except BaseException as e:
+            if future.done() and not future.cancelled():
+                # слот уже передан этому запросу: возвращаем его следующему
+                self._release()
+            elif future in self._waiters:
+                self._waiters.remove(future)
+            if not isinstance(e, TimeoutError):
+                raise
+            self.timed_out += 1
+            logger.warning(
+                "Запрос класса {} не дождался слота за {} с",
+                self.name,
+                self.timeout,
+                cost_class=self.name,
+            )
+            raise ServiceOverloadedException(self.retry_after) from None
+        self.admitted += 1
+
+    def _release(self) -> None:
+        while self._waiters:
+            future = self._waiters.popleft()
+            if not future.done():
+                # слот переходит ожидающему, active не меняется
+                future.set_result(None)
+                return
+        self.active -= 1
+
+    def stats(self) -> dict:
+        return {
+            "cost_class": self.name,
+            "enabled": self.enabled,
+            "limit": self.limit,
+            "queue_size": self.queue_size,
+            "active": self.active,
+            "queued": len(self._waiters),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+        }
+
+
+HEAVY = "heavy"
+STANDARD = "standard"
+
+
+admission_limiters = {
+    HEAVY: AdmissionLimiter(
+        HEAVY,
+        limit=settings.ADMISSION_HEAVY_LIMIT,
+        queue_size=settings.ADMISSION_HEAVY_QUEUE_SIZE,
+        timeout=settings.ADMISSION_QUEUE_TIMEOUT,
+        retry_after=settings.ADMISSION_RETRY_AFTER,
+        enabled=settings.ADMISSION_ENABLED,
+    ),
+    STANDARD: AdmissionLimiter(
+        STANDARD,
+        limit=settings.ADMISSION_STANDARD_LIMIT,
+        queue_size=settings.ADMISSION_STANDARD_QUEUE_SIZE,
+        timeout=settings.ADMISSION_QUEUE_TIMEOUT,
+        retry_after=settings.ADMISSION_RETRY_AFTER,
+        enabled=settings.ADMISSION_ENABLED,
+    ),
+}
+
+
+def tree_cost_class(depth: int, include_employees: bool) -> str:
+    """
+    Построение дерева глубже ADMISSION_HEAVY_TREE_DEPTH - тяжёлое; вывод
+    работников считается ещё одним уровнем.
+    """
+    if depth + int(include_employees) > settings.ADMISSION_HEAVY_TREE_DEPTH:
+        return HEAVY
+    return STANDARD
@@ -0,0 +1,142 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable
+
+from app.config.settings import settings
+
+
+@dataclass
+class CacheEntry:
+    version: int
+    expires_at: float
+    value: Any
+
+
+class VersionedLRUCache:
+    """
+    LRU-кэш с TTL и глобальным счётчиком версий.
+
+    Любая запись в оргструктуру вызывает invalidate(), которое увеличивает
+    версию: записи прошлых версий больше не отдаются, а результат чтения,
+    начатого до инвалидации, не попадёт в кэш (set сверяет версию).
+    """
+
+    def __init__(self, max_size: int, ttl: float, enabled: bool = True):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.enabled = enabled
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, CacheEntry] = OrderedDict()
+
+    def get(self, key: Hashable) -> Any | None:
+        if not self.enabled:
+            return None
+
+        entry = self._entries.get(key)
+        if (
+            entry is None
+            or entry.version != self.version
+            or entry.expires_at < time.monotonic()
+        ):
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def set(self, key: Hashable, value: Any, version: int) -> None:
+        if not self.enabled or version != self.version:
+            return
+
+        self._entries[key] = CacheEntry(
+            version=version, expires_at=time.monotonic() + self.ttl, value=value
+        )
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self) -> None:
+        self.version += 1
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "version": self.version,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class SingleFlight:
+    """
+    Объединяет одновременные вычисления с одинаковым ключом.
+
+    Первый вызов (лидер) выполняет func, остальные ждут его результат или
+    исключение. Ожидание экранировано: отмена ожидающего не трогает общее
+    вычисление. Если же отменён сам лидер (например, клиент отключился),
+    ожидающие не получают его отмену, а повторяют вызов и один из них
+    становится новым лидером.
+    """
+
+    def __init__(self):
+        self.computed = 0
+        self.coalesced = 0
+        self._flights: dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        while (future := self._flights.get(key)) is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled() or asyncio.current_task().cancelling():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._flights[key] = future
+        self.computed += 1
+        try:
+            result = await func()
+        except Exception as e:
+            future.set_exception(e)
+            # исключение уже получено лидером; без этого asyncio предупредит
+            # о непрочитанном исключении, если ожидающих не было
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            # лидер отменён или прерван: ожидающие повторят вызов сами
+            if not future.done():
+                future.cancel()
+            del self._flights[key]
+
+    def stats(self) -> dict:
+        return {
+            "inflight": len(self._flights),
+            "computed": self.computed,
+            "coalesced": self.coalesced,
+        }
+
+
+department_tree_cache = VersionedLRUCache(
+    max_size=settings.TREE_CACHE_MAX_SIZE,
+    ttl=settings.TREE_CACHE_TTL,
+    enabled=settings.TREE_CACHE_ENABLED,
+)
+department_tree_flights = SingleFlight()
@@ -0,0 +1,168 @@
+import zlib
+from dataclasses import dataclass, field
+from typing import Callable
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config.settings import settings
+
+try:
+    import brotli
+except ImportError:  # пакет brotli не обязателен
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # пакет zstandard не обязателен
+    zstandard = None
+
+
+GZIP_WBITS = 31
+
+COMPRESSIBLE_MEDIA_TYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "application/xml",
+    "application/javascript",
+}
+
+
+class StreamCompressor:
+    """
+    Потоковое сжатие: compress() возвращает всё, что уже можно отправить
+    клиенту (блок сбрасывается на каждом куске), finish() - хвост потока.
+    """
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(
+                quality=settings.COMPRESSION_BROTLI_QUALITY
+            )
+        elif encoding == "zstd":
+            self._compressor = zstandard.ZstdCompressor(
+                level=settings.COMPRESSION_ZSTD_LEVEL
+            ).compressobj()
+        else:
+            self._compressor = zlib.compressobj(
+                settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, GZIP_WBITS
+            )
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.process(data) + self._compressor.flush()
+        if self.encoding == "zstd":
+            return self._compressor.compress(data) + self._compressor.flush(
+                zstandard.COMPRESSOBJ_FLUSH_BLOCK
+            )
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+def available_encodings() -> list[str]:
+    """Поддерживаемые кодировки в порядке предпочтения сервера."""
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings.append("gzip")
+    return encodings
+
+
+SUPPORTED_ENCODINGS = available_encodings()
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """
+    Выбирает кодировку по Accept-Encoding: наибольший q, при равенстве -
+    порядок SUPPORTED_ENCODINGS; q=0 запрещает кодировку, "*" задаёт q
+    для неперечисленных. None - отдавать без сжатия.
+    """
+    if not settings.COMPRESSION_ENABLED or not accept_encoding:
+        return None
+
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name.strip().lower()] = weight
+
+    default = weights.get("*", 0.0)
+    candidates = [
+        (weights.get(encoding, default), -index, encoding)
+        for index, encoding in enumerate(SUPPORTED_ENCODINGS)
+    ]
+    weight, _, encoding = max(candidates)
+    return encoding if weight > 0 else None
+
+
+def is_compressible(content_type: str | None) -> bool:
+    if not content_type:
+        return False
+    media_type = content_type.partition(";")[0].strip().lower()
+    return (
+        media_type.startswith("text/")
+        or media_type in COMPRESSIBLE_MEDIA_TYPES
+        or media_type.endswith("+json")
+    )
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=settings.COMPRESSION_ZSTD_LEVEL).compress(
+            data
+        )
+    return zlib.compress(data, settings.COMPRESSION_GZIP_LEVEL, wbits=GZIP_WBITS)
+
+
+async def run_compression(func: Callable[..., bytes], data: bytes, *args) -> bytes:
+    """
+    Сжатие данных от COMPRESSION_THREAD_THRESHOLD байт выполняется в пуле
+    потоков (zlib, brotli и zstandard отпускают GIL), чтобы большое тело
+    не блокировало event loop; маленькие дешевле сжать на месте.
+    """
+    if len(data) < settings.COMPRESSION_THREAD_THRESHOLD:
+        return func(data, *args)
+    return await run_in_threadpool(func, data, *args)
+
+
+def weak_etag(etag: str) -> str:
+    """Сжатое представление отличается побайтно, поэтому его ETag слабый."""
+    return etag if etag.startswith("W/") else f"W/{etag}"
+
+
+@dataclass
+class CompressibleBody:
+    """
+    Готовое тело ответа вместе с его сжатыми вариантами. Варианты
+    создаются при первом запросе кодировки и хранятся в объекте, так что
+    тело из кэша дерева сжимается один раз, а не на каждое попадание.
+    """
+
+    content: bytes
+    encoded: dict[str, bytes] = field(default_factory=dict)
+
+    async def encode(self, encoding: str | None) -> tuple[bytes, str | None]:
+        if encoding is None or len(self.content) < settings.COMPRESSION_MINIMUM_SIZE:
+            return self.content, None
+        if encoding not in self.encoded:
+            self.encoded[encoding] = await run_compression(
+                compress, self.content, encoding
+            )
+        return self.encoded[encoding], encoding
@@ -0,0 +1,35 @@
+import base64
+import binascii
+from datetime import datetime
+
+from app.utils.exceptions import InvalidCursorException
+
+
+def encode_cursor(created_at: datetime, object_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{object_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        created_at, object_id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(object_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursorException()
+
+
+def encode_rank_cursor(rank: float, object_id: int) -> str:
+    raw = f"{rank!r}|{object_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_rank_cursor(cursor: str) -> tuple[float, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        rank, object_id = raw.split("|")
+        return float(rank), int(object_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursorException()
@@ -21,6 +21,10 @@ class DepartmentNotFoundException(ObjectNotFoundException):
     detail = "Подразделение не найдено"
 
 
+class JobNotFoundException(ObjectNotFoundException):
+    detail = "Задача не найдена"
+
+
 class TargetDepartmentNotFoundException(ObjectNotFoundException):
     detail = "Целевое подразделение не найдено"
 
@@ -47,3 +51,27 @@ class ReassignModeException(AppException):
 
 class ReassignToSelfException(AppException):
     detail = "Удаляемое подразделение не может являться целевым"
+
+
+class ReassignToSubtreeException(AppException):
+    detail = "Целевое подразделение находится в удаляемом поддереве"
+
+
+class InvalidCursorException(AppException):
+    detail = "Некорректный курсор пагинации"
+
+
+class InvalidImportFormatException(AppException):
+    detail = "Некорректный формат данных для импорта"
+
+
+class UnsupportedMediaTypeException(AppException):
+    detail = "Неподдерживаемый формат данных"
+
+
+class ServiceOverloadedException(AppException):
+    detail = "Сервис перегружен, повторите запрос позже"
+
+    def __init__(self, retry_after: int):
+        super().__init__()
+        self.retry_after = retry_after
@@ -0,0 +1,58 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import AsyncIterator, Sequence
+
+from sqlalchemy import RowMapping
+
+from app.schemas.export import ExportFormat
+
+
+def _default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Тип {type(value).__name__} не сериализуется в JSON")
+
+
+async def encode_ndjson(
+    batches: AsyncIterator[Sequence[RowMapping]],
+) -> AsyncIterator[bytes]:
+    async for batch in batches:
+        yield "".join(
+            json.dumps(dict(row), ensure_ascii=False, default=_default) + "\n"
+            for row in batch
+        ).encode()
+
+
+async def encode_csv(
+    batches: AsyncIterator[Sequence[RowMapping]], columns: list[str]
+) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+
+    async for batch in batches:
+        writer.writerows(
+            [
+                value.isoformat() if isinstance(value, (date, datetime)) else value
+                for value in (row[column] for column in columns)
+            ]
+            for row in batch
+        )
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def encode_export(
+    batches: AsyncIterator[Sequence[RowMapping]],
+    export_format: ExportFormat,
+    columns: list[str],
+) -> AsyncIterator[bytes]:
+    if export_format == ExportFormat.csv:
+        return encode_csv(batches, columns)
+    return encode_ndjson(batches)
@@ -1,4 +1,11 @@
+import json
+import queue
+import random
 import sys
+import threading
+import traceback
+import zlib
+from typing import TextIO
 
 from loguru import logger
 
@@ -6,17 +13,117 @@ from app.config.paths import LOGS_FILE
 from app.config.settings import settings
 
 
+WARNING_LEVEL_NO = 30
+
+
+class BatchedSink:
+    """
+    Sink loguru, который пишет в поток из отдельного потока-писателя.
+
+    write() только кладёт готовую строку в очередь, поэтому event loop не
+    ждёт вывода. Писатель забирает всё, что накопилось, и пишет пачкой
+    с одним flush; под нагрузкой пачки растут сами, без искусственной
+    задержки. loguru вызывает stop() при удалении обработчика (в том числе
+    при выходе), и оставшиеся записи дописываются.
+    """
+
+    def __init__(self, stream: TextIO, max_batch: int = 1000):
+        self.stream = stream
+        self.max_batch = max_batch
+        self._queue: queue.SimpleQueue[str | None] = queue.SimpleQueue()
+        self._thread = threading.Thread(
+            target=self._run, name="log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def write(self, message: str) -> None:
+        self._queue.put(message)
+
+    def stop(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        stopped = False
+        while not stopped:
+            batch = []
+            message = self._queue.get()
+            while message is not None:
+                batch.append(message)
+                if len(batch) >= self.max_batch:
+                    break
+                try:
+                    message = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            else:
+                stopped = True
+
+            if batch:
+                self.stream.write("".join(batch))
+                self.stream.flush()
+
+
+def json_format(record) -> str:
+    """
+    Одна JSON-строка на запись: время, уровень, место вызова, сообщение и
+    поля extra (request_id, department_id, duration_ms и т.д.). Строка
+    сохраняется в extra и подставляется шаблоном - так loguru не пытается
+    разбирать фигурные скобки JSON как поля формата.
+    """
+    data = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "logger": record["name"],
+        "function": record["function"],
+        "line": record["line"],
+        "message": record["message"],
+        **{key: value for key, value in record["extra"].items() if key != "json"},
+    }
+    if record["exception"] is not None:
+        data["exception"] = "".join(traceback.format_exception(*record["exception"]))
+    record["extra"]["json"] = json.dumps(data, ensure_ascii=False, default=str)
+    return "{extra[json]}\n"
+
+
+def sampling_filter(rate: float):
+    """
+    Пропускает долю rate записей уровня INFO и ниже; предупреждения и
+    ошибки проходят всегда. Решение принимается по request_id, поэтому
+    запрос попадает в лог целиком или не попадает совсем.
+    """
+    threshold = int(rate * 10_000)
+
+    def sample(record) -> bool:
+        if rate >= 1 or record["level"].no >= WARNING_LEVEL_NO:
+            return True
+        request_id = record["extra"].get("request_id")
+        if request_id is None:
+            return random.random() < rate
+        return zlib.crc32(request_id.encode()) % 10_000 < threshold
+
+    return sample
+
+
 def setup_logger(
     is_file_log: bool = settings.IS_FILE_LOG,
     is_console_log: bool = settings.IS_CONSOLE_LOG,
+    log_format: str = settings.LOG_FORMAT,
+    sample_rate: float = settings.LOG_SAMPLE_RATE,
 ):
     logger.remove()
 
+    is_json = log_format == "json"
+    format_options = {"format": json_format} if is_json else {}
+    log_filter = sampling_filter(sample_rate)
+
     if is_console_log:
         logger.add(
-            sys.stdout,
+            BatchedSink(sys.stdout),
             level=settings.LOG_LEVEL,
-            colorize=True,
+            colorize=not is_json,
+            filter=log_filter,
+            **format_options,
         )
 
     if is_file_log:
@@ -26,5 +133,7 @@ def setup_logger(
             rotation=settings.LOG_ROTATION,
             compression=settings.LOG_COMPRESSION,
             enqueue=True,
+            filter=log_filter,
+            **format_options,
             # colorize=True,
         )
@@ -0,0 +1,375 @@
+import asyncio
+import bisect
+from abc import ABC, abstractmethod
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable, Sequence
+
+from loguru import logger
+
+from app.config.settings import settings
+
+
+DEFAULT_TIME_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class Histogram:
+    """
+    Гистограмма с фиксированными границами корзин (в стиле Prometheus).
+
+    Счётчики корзин кумулятивные: bucket le=0.1 содержит все наблюдения
+    не больше 0.1. Корзина +Inf не хранится - она равна count.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_TIME_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> dict:
+        buckets = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            buckets.append({"le": bound, "count": cumulative})
+
+        return {"buckets": buckets, "count": self.count, "sum": self.sum}
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in labels.items()
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+class Metric(ABC):
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: dict) -> tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    @abstractmethod
+    def samples(self) -> list: ...
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def set(self, value: float, **labels) -> None:
+        """Для счётчиков, которые ведутся вне реестра и снимаются коллектором."""
+        self.values[self._key(labels)] = value
+
+    def samples(self) -> list:
+        return [[list(key), value] for key, value in self.values.items()]
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+class LabeledHistogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_TIME_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self.histograms: dict[tuple[str, ...], Histogram] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram(self.buckets)
+        histogram.observe(value)
+
+    def set(self, histogram: Histogram, **labels) -> None:
+        """Подключает гистограмму, которая ведётся вне реестра."""
+        self.histograms[self._key(labels)] = histogram
+
+    def samples(self) -> list:
+        return [
+            [
+                list(key),
+                {
+                    "buckets": list(histogram.buckets),
+                    "counts": list(histogram.counts),
+                    "count": histogram.count,
+                    "sum": histogram.sum,
+                },
+            ]
+            for key, histogram in self.histograms.items()
+        ]
+
+
+class MetricsRegistry:
+    """
+    Метрики одного процесса и их вывод в текстовом формате Prometheus.
+
+    Метрики меняются только из event loop, поэтому обходятся без блокировок.
+    snapshot() сериализует их в JSON-совместимый словарь, render() выводит
+    сумму снимков нескольких процессов (см. MultiprocessSnapshots).
+    Коллекторы вызываются перед снимком и обновляют метрики, которые
+    ведутся вне реестра (пул соединений, кэш).
+    """
+
+    def __init__(self):
+        self.metrics: dict[str, Metric] = {}
+        self.collectors: list[Callable[[], None]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames=()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames=(),
+        buckets: Sequence[float] = DEFAULT_TIME_BUCKETS,
+    ) -> LabeledHistogram:
+        return self.register(LabeledHistogram(name, documentation, labelnames, buckets))
+
+    def collector(self, func: Callable[[], None]) -> Callable[[], None]:
+        self.collectors.append(func)
+        return func
+
+    def snapshot(self, live: bool = True) -> dict:
+        """
+        live=False - снимок завершившегося процесса: его счётчики и
+        гистограммы продолжают суммироваться, а gauge - нет.
+        """
+        for collect in self.collectors:
+            collect()
+        return {
+            "pid": os.getpid(),
+            "written_at": time.time(),
+            "live": live,
+            "metrics": {
+                metric.name: {
+                    "type": metric.type,
+                    "help": metric.documentation,
+                    "labelnames": list(metric.labelnames),
+                    "samples": metric.samples(),
+                }
+                for metric in self.metrics.values()
+            },
+        }
+
+    @staticmethod
+    def render(snapshots: list[dict]) -> str:
+        merged: dict[str, dict] = {}
+        for snapshot in snapshots:
+            for name, metric in snapshot["metrics"].items():
+                if metric["type"] == "gauge" and not snapshot["live"]:
+                    continue
+                target = merged.setdefault(
+                    name,
+                    {
+                        "type": metric["type"],
+                        "help": metric["help"],
+                        "labelnames": metric["labelnames"],
+                        "samples": {},
+                    },
+                )
+                for labels, value in metric["samples"]:
+                    key = tuple(labels)
+                    if metric["type"] != "histogram":
+                        target["samples"][key] = target["samples"].get(key, 0) + value
+                        continue
+                    current = target["samples"].get(key)
+                    if current is None:
+                        target["samples"][key] = {
+                            **value,
+                            "counts": list(value["counts"]),
+                        }
+                    else:
+                        current["counts"] = [
+                            a + b for a, b in zip(current["counts"], value["counts"])
+                        ]
+                        current["count"] += value["count"]
+                        current["sum"] += value["sum"]
+
+        lines = []
+        for name, metric in merged.items():
+            lines.append(f"# HELP {name} {metric['help']}")
+            lines.append(f"# TYPE {name} {metric['type']}")
+            for key, value in metric["samples"].items():
+                labels = dict(zip(metric["labelnames"], key))
+                if metric["type"] != "histogram":
+                    lines.append(
+                        f"{name}{_format_labels(labels)} {_format_value(value)}"
+                    )
+                    continue
+                cumulative = 0
+                for bound, count in zip(value["buckets"], value["counts"]):
+                    cumulative += count
+                    bucket_labels = _format_labels(
+                        {**labels, "le": _format_value(bound)}
+                    )
+                    lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+                inf_labels = _format_labels({**labels, "le": "+Inf"})
+                lines.append(f"{name}_bucket{inf_labels} {value['count']}")
+                lines.append(
+                    f"{name}_sum{_format_labels(labels)} {_format_value(value['sum'])}"
+                )
+                lines.append(f"{name}_count{_format_labels(labels)} {value['count']}")
+        return "\n".join(lines) + "\n"
+
+
+class MultiprocessSnapshots:
+    """
+    Делает /metrics согласованным при нескольких воркерах uvicorn.
+
+    Каждый воркер раз в interval секунд (и при остановке) атомарно пишет
+    снимок своего реестра в directory/<pid>.json: снимок строится в event
+    loop, как и все изменения реестра, а в поток уходит только запись
+    файла. /metrics суммирует свежий снимок текущего воркера и файлы
+    остальных. Счётчики завершившихся воркеров продолжают учитываться,
+    а их gauge отбрасываются - по флагу live или если файл не обновлялся
+    дольше трёх интервалов.
+    """
+
+    def __init__(
+        self, registry: MetricsRegistry, directory: str | None, interval: float
+    ):
+        self.registry = registry
+        self.directory = Path(directory) if directory else None
+        self.interval = interval
+
+    def write(self, live: bool = True) -> None:
+        if self.directory is None:
+            return
+        self._write_snapshot(self.registry.snapshot(live))
+
+    async def flush(self, live: bool = True) -> None:
+        if self.directory is None:
+            return
+        snapshot = self.registry.snapshot(live)
+        await asyncio.to_thread(self._write_snapshot, snapshot)
+
+    def _write_snapshot(self, snapshot: dict) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{snapshot['pid']}.json"
+        temporary = path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(snapshot))
+        os.replace(temporary, path)
+
+    def collect(self) -> list[dict]:
+        own = self.registry.snapshot()
+        if self.directory is None or not self.directory.exists():
+            return [own]
+
+        snapshots = [own]
+        stale_before = time.time() - 3 * self.interval
+        for path in self.directory.glob("*.json"):
+            if path.stem == str(own["pid"]):
+                continue
+            try:
+                snapshot = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            if snapshot["written_at"] < stale_before:
+                snapshot["live"] = False
+            snapshots.append(snapshot)
+        return snapshots
+
+    async def run(self) -> None:
+        if self.directory is None:
+            return
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Не удалось сохранить снимок метрик")
+
+
+registry = MetricsRegistry()
+
+http_requests = registry.counter(
+    "http_requests_total",
+    "Число HTTP-запросов",
+    ["method", "route", "status"],
+)
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "Время обработки HTTP-запроса",
+    ["method", "route", "status"],
+)
+http_requests_in_flight = registry.gauge(
+    "http_requests_in_flight", "Число HTTP-запросов в обработке"
+)
+departments_created = registry.counter(
+    "departments_created_total", "Созданные подразделения", ["source"]
+)
+employees_created = registry.counter(
+    "employees_created_total", "Созданные работники", ["source"]
+)
+department_deletes = registry.counter(
+    "department_deletes_total", "Удаления подразделений", ["mode", "execution"]
+)
+
+multiprocess_snapshots = MultiprocessSnapshots(
+    registry, settings.METRICS_MULTIPROCESS_DIR, settings.METRICS_FLUSH_INTERVAL
+)
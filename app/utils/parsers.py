@@ -0,0 +1,91 @@
+import codecs
+import csv
+import json
+from typing import AsyncIterator
+
+from app.utils.exceptions import (
+    InvalidImportFormatException,
+    UnsupportedMediaTypeException,
+)
+
+
+JSON_MEDIA_TYPE = "application/json"
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/ndjson")
+CSV_MEDIA_TYPE = "text/csv"
+
+
+async def iter_lines(stream: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+
+    async for chunk in stream:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+async def iter_json_array(
+    stream: AsyncIterator[bytes],
+) -> AsyncIterator[dict | Exception]:
+    body = b"".join([chunk async for chunk in stream])
+    try:
+        rows = json.loads(body)
+    except ValueError:
+        raise InvalidImportFormatException()
+
+    if not isinstance(rows, list):
+        raise InvalidImportFormatException()
+
+    for row in rows:
+        yield row
+
+
+async def iter_ndjson(stream: AsyncIterator[bytes]) -> AsyncIterator[dict | Exception]:
+    async for line in iter_lines(stream):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield e
+
+
+async def iter_csv(stream: AsyncIterator[bytes]) -> AsyncIterator[dict | Exception]:
+    """
+    Первая строка - заголовок. Пустые значения считаются отсутствующими.
+    Поля с переводом строки внутри кавычек не поддерживаются.
+    """
+    header = None
+
+    async for line in iter_lines(stream):
+        if not line.strip():
+            continue
+
+        values = next(csv.reader([line]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+
+        if len(values) != len(header):
+            yield ValueError("Количество значений не совпадает с заголовком")
+            continue
+
+        yield {name: value for name, value in zip(header, values) if value != ""}
+
+
+def get_rows_parser(content_type: str | None):
+    media_type = (content_type or JSON_MEDIA_TYPE).split(";")[0].strip().lower()
+
+    if media_type == JSON_MEDIA_TYPE:
+        return iter_json_array
+    if media_type in NDJSON_MEDIA_TYPES:
+        return iter_ndjson
+    if media_type == CSV_MEDIA_TYPE:
+        return iter_csv
+
+    raise UnsupportedMediaTypeException()
@@ -0,0 +1,183 @@
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config.paths import PROFILES_DIR
+from app.config.settings import settings
+
+
+@dataclass
+class RequestProfile:
+    """Счётчики одного запроса, которые собирает ProfilingMiddleware."""
+
+    started: float = field(default_factory=time.perf_counter)
+    db_queries: int = 0
+    db_time: float = 0.0
+    # время именованных участков (profile_section), в секундах
+    sections: dict[str, float] = field(default_factory=dict)
+    samples: Counter | None = None
+
+    @property
+    def duration(self) -> float:
+        return time.perf_counter() - self.started
+
+
+current_profile: ContextVar[RequestProfile | None] = ContextVar(
+    "current_profile", default=None
+)
+
+
+@contextmanager
+def profile_section(name: str) -> Iterator[None]:
+    """Добавляет время блока к участку name профиля текущего запроса."""
+    profile = current_profile.get()
+    if profile is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.sections[name] = (
+            profile.sections.get(name, 0.0) + time.perf_counter() - started
+        )
+
+
+# Время начала хранится в контексте выполнения, а не в conn.info: при
+# ошибке запроса after_cursor_execute не вызывается, и отметка осталась бы
+# на соединении пула до следующего запроса.
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_profile.get() is not None and context is not None:
+        context.query_started = time.perf_counter()
+
+
+def _record_query(context) -> None:
+    profile = current_profile.get()
+    started = getattr(context, "query_started", None)
+    if profile is None or started is None:
+        return
+    del context.query_started
+    profile.db_queries += 1
+    profile.db_time += time.perf_counter() - started
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _record_query(context)
+
+
+def _handle_error(exception_context) -> None:
+    # упавший запрос (409 из-за нарушения ограничения) тоже учитывается
+    _record_query(exception_context.execution_context)
+
+
+def track_queries(target=Engine) -> None:
+    """
+    Считает запросы и время в БД для профиля текущего запроса. По умолчанию
+    слушает класс Engine, то есть все движки, включая движок тестов. Хуки
+    синхронные, но выполняются в контексте asyncio-задачи запроса, поэтому
+    видят её current_profile.
+    """
+    event.listen(target, "before_cursor_execute", _before_cursor_execute)
+    event.listen(target, "after_cursor_execute", _after_cursor_execute)
+    event.listen(target, "handle_error", _handle_error)
+
+
+class SamplingProfiler:
+    """
+    Сэмплирующий профилировщик запросов (включается настройкой).
+
+    Фоновый поток раз в interval секунд снимает стек потока event loop и
+    добавляет его ко всем запросам, выполняющимся в этот момент. Запросы
+    дольше threshold сохраняются в directory в формате folded stacks
+    (flamegraph.pl, speedscope). Параллельные запросы делят один поток,
+    поэтому их сэмплы смешиваются; ожидание БД видно как ожидание в
+    селекторе event loop.
+    """
+
+    def __init__(
+        self, enabled: bool, interval: float, threshold: float, directory: Path
+    ):
+        self.enabled = enabled
+        self.interval = interval
+        self.threshold = threshold
+        self.directory = directory
+        self._active: dict[int, tuple[int, Counter]] = {}
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def start(self, profile: RequestProfile) -> None:
+        if not self.enabled:
+            return
+
+        profile.samples = Counter()
+        with self._lock:
+            self._active[id(profile)] = (threading.get_ident(), profile.samples)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="sampling-profiler", daemon=True
+                )
+                self._thread.start()
+
+    def stop(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._active.pop(id(profile), None)
+
+    def dump(self, profile: RequestProfile, name: str) -> Path | None:
+        """Сохраняет сэмплы запроса, если он выполнялся дольше threshold."""
+        duration = profile.duration
+        if not profile.samples or duration < self.threshold:
+            return None
+
+        slug = re.sub(r"\W+", "_", name).strip("_")
+        path = self.directory / (
+            f"{datetime.now():%Y%m%d-%H%M%S-%f}-{slug}-{duration * 1000:.0f}ms.folded"
+        )
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            "".join(f"{stack} {count}\n" for stack, count in profile.samples.items())
+        )
+        return path
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            frames = sys._current_frames()
+            # под блокировкой, чтобы после stop() сэмплы запроса не менялись
+            with self._lock:
+                if not self._active:
+                    self._thread = None
+                    return
+                for thread_id, samples in self._active.values():
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        samples[self._stack(frame)] += 1
+
+    @staticmethod
+    def _stack(frame) -> str:
+        stack = []
+        while frame is not None:
+            stack.append(
+                f"{frame.f_globals.get('__name__')}:{frame.f_code.co_qualname}"
+            )
+            frame = frame.f_back
+        return ";".join(reversed(stack))
+
+
+sampling_profiler = SamplingProfiler(
+    enabled=settings.SAMPLING_PROFILER_ENABLED,
+    interval=settings.SAMPLING_PROFILER_INTERVAL,
+    threshold=settings.SAMPLING_PROFILER_THRESHOLD,
+    directory=PROFILES_DIR,
+)
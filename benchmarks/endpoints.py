@@ -0,0 +1,326 @@
+"""
+Задержки и пропускная способность эндпоинтов через ASGI-приложение.
+
+Запросы идут в app.main:app в том же процессе (httpx.ASGITransport) на
+БД из настроек - её заранее наполняет benchmarks.org_generator. Для каждого
+сценария считаются перцентили задержки и число запросов в секунду при
+--concurrency параллельных клиентах. Кэш дерева по умолчанию выключен,
+чтобы замерять путь до БД, логирование выключено.
+
+Результат сохраняется в JSON; с --compare прогон сравнивается с прошлым
+и завершается с кодом 1, если p95 какого-то сценария вырос больше, чем
+на --threshold.
+
+Запуск:
+    python -m benchmarks.endpoints --requests 500 --concurrency 4 \\
+        --output benchmarks/results/after.json \\
+        --compare benchmarks/results/before.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import statistics
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import func, select
+
+from app.database.session import async_session_factory
+from app.main import app
+from app.models import Department, Employee
+from app.utils.cache import department_tree_cache
+from app.utils.logger import setup_logger
+
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+@dataclass
+class Dataset:
+    departments: int
+    employees: int
+    ids: list[int]
+    root_id: int
+    middle_id: int
+    leaf_id: int
+
+
+@dataclass
+class Scenario:
+    name: str
+    # (rng) -> (method, url, json)
+    request: Callable[[random.Random], tuple[str, str, dict | None]]
+    expected_status: int = 200
+
+
+async def load_dataset() -> Dataset:
+    """Берёт из БД id подразделений: корень, узел середины и самый глубокий лист."""
+    async with async_session_factory() as session:
+        result = await session.execute(
+            select(Department.id, Department.level).order_by(Department.id)
+        )
+        rows = result.all()
+        employees = await session.scalar(select(func.count()).select_from(Employee))
+
+    if not rows:
+        raise SystemExit("БД пуста: сначала запустите benchmarks.org_generator")
+
+    max_level = max(level for _, level in rows)
+    roots = [department_id for department_id, level in rows if level == 0]
+    middle = [department_id for department_id, level in rows if level == max_level // 2]
+    leaves = [department_id for department_id, level in rows if level == max_level]
+    return Dataset(
+        departments=len(rows),
+        employees=employees,
+        ids=[department_id for department_id, _ in rows],
+        root_id=roots[0],
+        middle_id=middle[0],
+        leaf_id=leaves[-1],
+    )
+
+
+def make_scenarios(dataset: Dataset) -> list[Scenario]:
+    prefix = "/api/v1"
+    return [
+        Scenario(
+            "departments_list",
+            lambda rng: ("GET", f"{prefix}/departments/?limit=100", None),
+        ),
+        Scenario(
+            "department_tree_root",
+            lambda rng: (
+                "GET",
+                f"{prefix}/departments/{dataset.root_id}?depth=1",
+                None,
+            ),
+        ),
+        Scenario(
+            "department_tree_middle_depth3",
+            lambda rng: (
+                "GET",
+                f"{prefix}/departments/{dataset.middle_id}?depth=3",
+                None,
+            ),
+        ),
+        Scenario(
+            "department_tree_random",
+            lambda rng: (
+                "GET",
+                f"{prefix}/departments/{rng.choice(dataset.ids)}?depth=2",
+                None,
+            ),
+        ),
+        Scenario(
+            "department_stats",
+            lambda rng: (
+                "GET",
+                f"{prefix}/departments/{rng.choice(dataset.ids)}/stats",
+                None,
+            ),
+        ),
+        Scenario(
+            "department_ancestors",
+            lambda rng: (
+                "GET",
+                f"{prefix}/departments/{dataset.leaf_id}/ancestors",
+                None,
+            ),
+        ),
+        Scenario(
+            "department_ancestors_batch",
+            lambda rng: (
+                "POST",
+                f"{prefix}/departments/ancestors",
+                {"ids": rng.sample(dataset.ids, min(100, len(dataset.ids)))},
+            ),
+        ),
+        Scenario(
+            "departments_batch_get",
+            lambda rng: (
+                "POST",
+                f"{prefix}/departments/batch-get",
+                {
+                    "ids": rng.sample(dataset.ids, min(500, len(dataset.ids))),
+                    "include_children": True,
+                },
+            ),
+        ),
+        # Проверка переноса корня под лист: валидация одним запросом
+        # и отказ 409 без изменения данных.
+        Scenario(
+            "department_move_cycle_check",
+            lambda rng: (
+                "PATCH",
+                f"{prefix}/departments/{dataset.root_id}",
+                {"parent_id": dataset.leaf_id},
+            ),
+            expected_status=409,
+        ),
+        Scenario(
+            "employees_list",
+            lambda rng: ("GET", f"{prefix}/employees/?limit=100", None),
+        ),
+        Scenario(
+            "employees_search",
+            lambda rng: ("GET", f"{prefix}/employees/search?q=Иван&limit=20", None),
+        ),
+    ]
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    """Перцентиль по ближайшему рангу."""
+    index = max(math.ceil(p / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[index]
+
+
+async def run_scenario(
+    client: AsyncClient,
+    scenario: Scenario,
+    requests: int,
+    concurrency: int,
+    warmup: int,
+    seed: int,
+) -> dict:
+    rng = random.Random(seed)
+    for _ in range(warmup):
+        method, url, body = scenario.request(rng)
+        await client.request(method, url, json=body)
+
+    latencies = []
+    errors = 0
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            method, url, body = scenario.request(rng)
+            started = time.perf_counter()
+            response = await client.request(method, url, json=body)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != scenario.expected_status:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p90_ms": percentile(latencies, 90) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": latencies[-1] * 1000,
+        "throughput_rps": len(latencies) / elapsed,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Печатает изменения p50/p95 и возвращает сценарии с регрессией p95."""
+    regressions = []
+    print(f"\nсравнение с прогоном {baseline['started_at']}:")
+    for name, result in current["scenarios"].items():
+        previous = baseline["scenarios"].get(name)
+        if previous is None:
+            continue
+        p50_change = result["p50_ms"] / previous["p50_ms"] - 1
+        p95_change = result["p95_ms"] / previous["p95_ms"] - 1
+        marker = ""
+        if p95_change > threshold:
+            regressions.append(name)
+            marker = "  <-- регрессия"
+        print(f"{name:>32}: p50 {p50_change:+7.1%}, p95 {p95_change:+7.1%}{marker}")
+    return regressions
+
+
+async def run(args: argparse.Namespace) -> dict:
+    dataset = await load_dataset()
+    scenarios = make_scenarios(dataset)
+    if args.only:
+        scenarios = [scenario for scenario in scenarios if scenario.name in args.only]
+
+    department_tree_cache.enabled = args.cache
+    results = {
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "dataset": {
+            "departments": dataset.departments,
+            "employees": dataset.employees,
+        },
+        "settings": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "warmup": args.warmup,
+            "cache": args.cache,
+            "seed": args.seed,
+        },
+        "scenarios": {},
+    }
+
+    print(
+        f"подразделений: {dataset.departments}, сотрудников: {dataset.employees}, "
+        f"запросов: {args.requests}, параллельно: {args.concurrency}"
+    )
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://benchmark"
+    ) as client:
+        for scenario in scenarios:
+            result = await run_scenario(
+                client,
+                scenario,
+                args.requests,
+                args.concurrency,
+                args.warmup,
+                args.seed,
+            )
+            results["scenarios"][scenario.name] = result
+            print(
+                f"{scenario.name:>32}: p50 {result['p50_ms']:7.2f} мс, "
+                f"p95 {result['p95_ms']:7.2f} мс, p99 {result['p99_ms']:7.2f} мс, "
+                f"{result['throughput_rps']:8.1f} rps"
+                + (f", ошибок: {result['errors']}" if result["errors"] else "")
+            )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache", action="store_true", help="не выключать кэш дерева")
+    parser.add_argument("--only", nargs="*", help="запустить только эти сценарии")
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--compare", type=Path, default=None)
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    setup_logger(is_file_log=False, is_console_log=False)
+    results = asyncio.run(run(args))
+
+    output = args.output or RESULTS_DIR / (
+        f"endpoints-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, ensure_ascii=False, indent=2))
+    print(f"\nрезультаты сохранены в {output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        if compare(results, baseline, args.threshold):
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
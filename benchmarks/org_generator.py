@@ -0,0 +1,192 @@
+"""
+Детерминированный генератор оргструктуры для бенчмарков.
+
+Строит полное дерево: один корень, у каждого подразделения breadth
+дочерних, depth уровней (обход в ширину можно ограничить --departments),
+по employees сотрудников в каждом подразделении. Одинаковые параметры и
+seed дают одинаковые данные и одинаковые id.
+
+Загрузка идёт через COPY в БД из настроек (.env) и удаляет из неё все
+подразделения и сотрудников, поэтому требует --force для непустой БД.
+
+Запуск:
+    python -m benchmarks.org_generator --breadth 10 --depth 6 --employees 10 \\
+        --departments 100000 --force
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import date, timedelta
+from typing import Iterator
+
+from sqlalchemy import func, select, text
+
+from app.database.session import async_session_factory
+from app.models import Department, Employee
+from app.repositories.department import DepartmentRepository
+
+
+FIRST_NAMES = [
+    "Александр", "Мария", "Иван", "Анна", "Дмитрий", "Елена", "Сергей",
+    "Ольга", "Андрей", "Татьяна", "Алексей", "Наталья", "Михаил", "Ирина",
+]  # fmt: skip
+LAST_NAMES = [
+    "Иванов", "Смирнов", "Кузнецов", "Попов", "Васильев", "Петров",
+    "Соколов", "Михайлов", "Новиков", "Фёдоров", "Морозов", "Волков",
+]  # fmt: skip
+POSITIONS = [
+    "Developer", "Senior Developer", "Team Lead", "QA Engineer", "Analyst",
+    "Designer", "Product Manager", "DevOps Engineer", "Support Engineer",
+]  # fmt: skip
+
+DEPARTMENT_COLUMNS = [
+    "id",
+    "name",
+    "parent_id",
+    "path",
+    "level",
+    "headcount",
+    "subtree_headcount",
+    "descendants_count",
+]
+EMPLOYEE_COLUMNS = ["department_id", "full_name", "position", "hired_at"]
+
+
+def generate_departments(
+    breadth: int, depth: int, employees: int, limit: int | None = None
+) -> list[tuple]:
+    """
+    Строки departments в порядке DEPARTMENT_COLUMNS, по уровням (родитель
+    всегда раньше потомков), с посчитанными агрегатами поддерева.
+    """
+    rows = [[1, "Подразделение 1", None, "1", 0, employees, employees, 0]]
+    level_start = 0
+    for level in range(1, depth):
+        level_end = len(rows)
+        for parent in rows[level_start:level_end]:
+            for _ in range(breadth):
+                if limit is not None and len(rows) >= limit:
+                    break
+                department_id = len(rows) + 1
+                rows.append(
+                    [
+                        department_id,
+                        f"Подразделение {department_id}",
+                        parent[0],
+                        f"{parent[3]}.{department_id}",
+                        level,
+                        employees,
+                        employees,
+                        0,
+                    ]
+                )
+        level_start = level_end
+
+    for row in reversed(rows[1:]):
+        parent = rows[row[2] - 1]
+        parent[6] += row[6]
+        parent[7] += row[7] + 1
+
+    return [tuple(row) for row in rows]
+
+
+def generate_employees(
+    departments: int, employees: int, seed: int, chunk_size: int = 100_000
+) -> Iterator[list[tuple]]:
+    """Строки employees в порядке EMPLOYEE_COLUMNS пачками по chunk_size."""
+    rng = random.Random(seed)
+    first_hired_at = date(2015, 1, 1)
+    chunk = []
+    for department_id in range(1, departments + 1):
+        for _ in range(employees):
+            chunk.append(
+                (
+                    department_id,
+                    f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                    rng.choice(POSITIONS),
+                    first_hired_at + timedelta(days=rng.randrange(4000)),
+                )
+            )
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+async def seed_database(
+    breadth: int,
+    depth: int,
+    employees: int,
+    limit: int | None = None,
+    seed: int = 0,
+    force: bool = False,
+) -> dict:
+    """Заменяет содержимое БД сгенерированной оргструктурой одной транзакцией."""
+    departments = generate_departments(breadth, depth, employees, limit)
+
+    async with async_session_factory() as session:
+        existing = await session.scalar(select(func.count()).select_from(Department))
+        if existing and not force:
+            raise SystemExit(
+                f"В БД уже есть подразделения ({existing}); для перезаписи нужен --force"
+            )
+
+        repository = DepartmentRepository(session)
+        await session.execute(
+            text("TRUNCATE employees, departments RESTART IDENTITY CASCADE")
+        )
+        await repository.copy_records(DEPARTMENT_COLUMNS, departments)
+        for chunk in generate_employees(len(departments), employees, seed):
+            await repository.copy_records(EMPLOYEE_COLUMNS, chunk, model=Employee)
+        await session.execute(
+            select(func.setval("departments_id_seq", len(departments)))
+        )
+        await session.commit()
+
+        await session.execute(text("ANALYZE departments, employees"))
+        await session.commit()
+
+    return {
+        "breadth": breadth,
+        "depth": depth,
+        "employees_per_department": employees,
+        "departments": len(departments),
+        "employees": len(departments) * employees,
+        "seed": seed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--breadth", type=int, default=10)
+    parser.add_argument("--depth", type=int, default=5)
+    parser.add_argument("--employees", type=int, default=10)
+    parser.add_argument(
+        "--departments", type=int, default=None, help="ограничение числа подразделений"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--force", action="store_true")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    summary = asyncio.run(
+        seed_database(
+            args.breadth,
+            args.depth,
+            args.employees,
+            args.departments,
+            args.seed,
+            args.force,
+        )
+    )
+    print(
+        f"подразделений: {summary['departments']}, сотрудников: {summary['employees']}, "
+        f"загружено за {time.perf_counter() - started:.2f} с"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Сравнение стоимости сериализации дерева подразделений на узел.
+
+before - прежний путь: словари -> DepartmentTree(**tree) -> повторная
+валидация и сериализация по response-модели (как это делает FastAPI).
+after - текущий путь: словари -> pydantic_core.to_json.
+
+Запуск:
+    python -m benchmarks.tree_serialization --nodes 10000 --employees 2
+"""
+
+import argparse
+import copy
+import time
+from datetime import datetime, timedelta, timezone
+
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+
+from app.schemas import DepartmentTree
+from app.services.department import DepartmentService
+
+
+def make_rows(nodes: int, employees_per_node: int, children: int = 10) -> list[dict]:
+    """
+    Строки в том виде, в каком их возвращает get_department_tree:
+    отсортированы по уровню, сотрудники уже разобраны из json_agg.
+    """
+    created_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    rows = []
+    employee_id = 0
+
+    for index in range(nodes):
+        department_id = index + 1
+        parent_id = (index - 1) // children + 1 if index else None
+        depth = 0 if index == 0 else rows[parent_id - 1]["depth"] + 1
+        path = (
+            str(department_id)
+            if index == 0
+            else f"{rows[parent_id - 1]['path']}.{department_id}"
+        )
+        employees = []
+        for _ in range(employees_per_node):
+            employee_id += 1
+            employees.append(
+                {
+                    "full_name": f"Сотрудник {employee_id}",
+                    "position": "Developer",
+                    "hired_at": "2024-01-15",
+                    "id": employee_id,
+                    "department_id": department_id,
+                    "created_at": (
+                        created_at + timedelta(seconds=employee_id)
+                    ).isoformat(),
+                }
+            )
+        rows.append(
+            {
+                "id": department_id,
+                "name": f"Подразделение {department_id}",
+                "parent_id": parent_id,
+                "created_at": created_at + timedelta(seconds=department_id),
+                "headcount": employees_per_node,
+                "subtree_headcount": employees_per_node,
+                "descendants_count": 0,
+                "path": path,
+                "version": 0,
+                "depth": depth,
+                "employees": employees,
+            }
+        )
+
+    return rows
+
+
+tree_adapter = TypeAdapter(DepartmentTree)
+service = DepartmentService(repository=None)
+
+
+def before(rows: list[dict]) -> bytes:
+    tree = DepartmentTree(**service._build_tree(rows))
+    validated = tree_adapter.validate_python(tree.model_dump())
+    return tree_adapter.dump_json(validated)
+
+
+def after(rows: list[dict]) -> bytes:
+    return to_json(service._build_tree(rows))
+
+
+def measure(func, rows: list[dict], repeat: int) -> float:
+    """Лучшее время из repeat прогонов; строки копируются вне замера."""
+    best = float("inf")
+    for _ in range(repeat):
+        data = copy.deepcopy(rows)
+        started = time.perf_counter()
+        func(data)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, default=10_000)
+    parser.add_argument("--employees", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = make_rows(args.nodes, args.employees)
+    assert before(copy.deepcopy(rows)) == after(copy.deepcopy(rows))
+
+    print(f"узлов: {args.nodes}, сотрудников на узел: {args.employees}")
+    results = {}
+    for name, func in (("before", before), ("after", after)):
+        results[name] = measure(func, rows, args.repeat)
+        print(
+            f"{name:>6}: {results[name] * 1000:8.1f} мс всего, "
+            f"{results[name] / args.nodes * 1e6:6.2f} мкс/узел"
+        )
+    print(f"ускорение: x{results['before'] / results['after']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+from httpx import AsyncClient
+from sqlalchemy import text
+
+from app.config.settings import settings
+from app.jobs import job_runner
+from tests.conftest import async_session_factory_test
+
+
+RECOUNT = text(
+    """
+    WITH direct AS (
+        SELECT department_id AS id, count(*) AS headcount
+        FROM employees GROUP BY department_id
+    ), totals AS (
+        SELECT a.id::int AS id,
+               sum(COALESCE(direct.headcount, 0)) AS subtree_headcount,
+               count(*) - 1 AS descendants_count
+        FROM departments d
+        LEFT JOIN direct ON direct.id = d.id
+        CROSS JOIN unnest(string_to_array(d.path, '.')) AS a(id)
+        GROUP BY a.id
+    )
+    SELECT d.id
+    FROM departments d
+    JOIN totals ON totals.id = d.id
+    LEFT JOIN direct ON direct.id = d.id
+    WHERE d.headcount <> COALESCE(direct.headcount, 0)
+       OR d.subtree_headcount <> totals.subtree_headcount
+       OR d.descendants_count <> totals.descendants_count
+    """
+)
+
+
+async def assert_aggregates_consistent() -> None:
+    async with async_session_factory_test() as session:
+        result = await session.execute(RECOUNT)
+        assert result.scalars().all() == []
+
+
+async def create_department(client: AsyncClient, name: str, parent_id=None) -> int:
+    response = await client.post(
+        "/api/v1/departments/", json={"name": name, "parent_id": parent_id}
+    )
+    return response.json()["id"]
+
+
+async def create_employee(client: AsyncClient, department_id: int) -> None:
+    await client.post(
+        f"/api/v1/departments/{department_id}/employees/",
+        json={"full_name": "Иван Иванов", "position": "Developer"},
+    )
+
+
+async def test_department_aggregates(client: AsyncClient):
+    root = await create_department(client, "Root")
+    a = await create_department(client, "A", root)
+    b = await create_department(client, "B", a)
+    await create_employee(client, root)
+    await create_employee(client, b)
+    await create_employee(client, b)
+
+    response = await client.get(f"/api/v1/departments/{root}", params={"depth": 2})
+    data = response.json()
+    assert data["headcount"] == 1
+    assert data["subtree_headcount"] == 3
+    assert data["descendants_count"] == 2
+    assert data["children"][0]["subtree_headcount"] == 2
+
+    response = await client.get(f"/api/v1/departments/{a}/stats")
+    assert response.status_code == 200
+    assert response.json() == {
+        "id": a,
+        "headcount": 0,
+        "subtree_headcount": 2,
+        "descendants_count": 1,
+    }
+
+
+async def test_department_aggregates_after_writes(client: AsyncClient):
+    root = await create_department(client, "Root")
+    a = await create_department(client, "A", root)
+    b = await create_department(client, "B", a)
+    other = await create_department(client, "Other")
+    await create_employee(client, a)
+    await create_employee(client, b)
+    await create_employee(client, b)
+
+    await client.patch(f"/api/v1/departments/{a}", json={"parent_id": other})
+    await assert_aggregates_consistent()
+
+    response = await client.get(f"/api/v1/departments/{root}/stats")
+    assert response.json()["subtree_headcount"] == 0
+    response = await client.get(f"/api/v1/departments/{other}/stats")
+    assert response.json()["subtree_headcount"] == 3
+    assert response.json()["descendants_count"] == 2
+
+    response = await client.post(
+        "/api/v1/employees/bulk",
+        content=f'[{{"department_id": {b}, "full_name": "Пётр", "position": "QA"}}]',
+        headers={"Content-Type": "application/json"},
+    )
+    assert response.json()["created"] == 1
+    response = await client.post(
+        "/api/v1/departments/import",
+        params={"parent_id": b},
+        json={
+            "name": "Imported",
+            "employees": [{"full_name": "Анна", "position": "Analyst"}],
+            "children": [{"name": "Leaf"}],
+        },
+    )
+    assert response.status_code == 200
+    assert response.json()["root"]["subtree_headcount"] == 1
+    await assert_aggregates_consistent()
+
+    await client.delete(
+        f"/api/v1/departments/{b}",
+        params={"mode": "reassign", "reassign_to_department_id": root},
+    )
+    await assert_aggregates_consistent()
+
+    response = await client.get(f"/api/v1/departments/{root}/stats")
+    assert response.json()["headcount"] == 3
+
+    await client.delete(f"/api/v1/departments/{other}", params={"mode": "cascade"})
+    await assert_aggregates_consistent()
+
+
+async def test_department_aggregates_common_ancestor(client: AsyncClient):
+    root = await create_department(client, "Root")
+    a = await create_department(client, "A", root)
+    b = await create_department(client, "B", root)
+    c = await create_department(client, "C", a)
+    await create_employee(client, c)
+    await create_employee(client, c)
+
+    response = await client.patch(
+        f"/api/v1/departments/{c}", json={"name": "C2", "parent_id": b}
+    )
+    assert response.json()["name"] == "C2"
+    await assert_aggregates_consistent()
+
+    response = await client.get(f"/api/v1/departments/{b}/stats")
+    assert response.json()["subtree_headcount"] == 2
+    response = await client.get(f"/api/v1/departments/{root}/stats")
+    assert response.json()["subtree_headcount"] == 2
+    assert response.json()["descendants_count"] == 3
+
+    await client.delete(
+        f"/api/v1/departments/{c}",
+        params={"mode": "reassign", "reassign_to_department_id": a},
+    )
+    await assert_aggregates_consistent()
+
+    response = await client.get(f"/api/v1/departments/{a}/stats")
+    assert response.json()["headcount"] == 2
+    response = await client.get(f"/api/v1/departments/{root}/stats")
+    assert response.json()["subtree_headcount"] == 2
+    assert response.json()["descendants_count"] == 2
+
+
+async def test_reassign_into_deleted_subtree_rejected(client: AsyncClient):
+    root = await create_department(client, "Root")
+    a = await create_department(client, "A", root)
+    b = await create_department(client, "B", a)
+    await create_employee(client, a)
+    await create_employee(client, a)
+
+    response = await client.delete(
+        f"/api/v1/departments/{a}",
+        params={"mode": "reassign", "reassign_to_department_id": b},
+    )
+    assert response.status_code == 409
+    await assert_aggregates_consistent()
+
+    response = await client.get(f"/api/v1/departments/{root}/stats")
+    assert response.json()["subtree_headcount"] == 2
+    assert response.json()["descendants_count"] == 2
+
+
+async def test_department_aggregates_after_background_delete(
+    client: AsyncClient, monkeypatch
+):
+    monkeypatch.setattr(job_runner, "session_factory", async_session_factory_test)
+    monkeypatch.setattr(settings, "JOB_DELETE_THRESHOLD", 2)
+    monkeypatch.setattr(settings, "JOB_BATCH_SIZE", 1)
+
+    root = await create_department(client, "Root")
+    a = await create_department(client, "A", root)
+    b = await create_department(client, "B", a)
+    await create_department(client, "C", b)
+    await create_employee(client, b)
+    await create_employee(client, a)
+
+    response = await client.delete(
+        f"/api/v1/departments/{a}", params={"mode": "cascade"}
+    )
+    assert response.status_code == 202
+    await job_runner.join()
+    await assert_aggregates_consistent()
+
+    response = await client.get(f"/api/v1/departments/{root}/stats")
+    assert response.json() == {
+        "id": root,
+        "headcount": 0,
+        "subtree_headcount": 0,
+        "descendants_count": 0,
+    }
+
+
+async def test_department_stats_not_found(client: AsyncClient):
+    response = await client.get("/api/v1/departments/99999/stats")
+    assert response.status_code == 404
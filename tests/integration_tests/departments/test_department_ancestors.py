@@ -0,0 +1,69 @@
+from httpx import AsyncClient
+
+
+async def create_chain(client: AsyncClient, length: int) -> list[int]:
+    ids = []
+    parent_id = None
+    for i in range(length):
+        response = await client.post(
+            "/api/v1/departments/",
+            json={"name": f"Уровень {i}", "parent_id": parent_id},
+        )
+        parent_id = response.json()["id"]
+        ids.append(parent_id)
+    return ids
+
+
+async def test_get_department_ancestors(client: AsyncClient):
+    ids = await create_chain(client, 3)
+
+    response = await client.get(f"/api/v1/departments/{ids[-1]}/ancestors")
+    assert response.status_code == 200
+    data = response.json()
+    assert [department["id"] for department in data] == ids
+    assert [department["name"] for department in data] == [
+        "Уровень 0",
+        "Уровень 1",
+        "Уровень 2",
+    ]
+    assert data[-1]["path"] == ids
+
+
+async def test_get_department_ancestors_not_found(client: AsyncClient):
+    response = await client.get("/api/v1/departments/999999/ancestors")
+    assert response.status_code == 404
+
+
+async def test_get_departments_ancestors_batch(client: AsyncClient):
+    ids = await create_chain(client, 3)
+    other = await create_chain(client, 1)
+
+    response = await client.post(
+        "/api/v1/departments/ancestors",
+        json={"ids": [ids[2], ids[1], other[0], 999999]},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data) == {str(ids[2]), str(ids[1]), str(other[0])}
+    assert [department["id"] for department in data[str(ids[2])]] == ids
+    assert [department["id"] for department in data[str(ids[1])]] == ids[:2]
+    assert [department["id"] for department in data[str(other[0])]] == other
+
+
+async def test_departments_ancestors_batch_id_out_of_range(client: AsyncClient):
+    response = await client.post("/api/v1/departments/ancestors", json={"ids": [2**40]})
+    assert response.status_code == 422
+
+
+async def test_department_path_in_responses(client: AsyncClient):
+    ids = await create_chain(client, 2)
+
+    response = await client.get(f"/api/v1/departments/{ids[0]}")
+    tree = response.json()
+    assert tree["path"] == ids[:1]
+    assert tree["children"][0]["path"] == ids
+
+    response = await client.patch(
+        f"/api/v1/departments/{ids[1]}", json={"parent_id": None}
+    )
+    assert response.json()["path"] == [ids[1]]
@@ -0,0 +1,63 @@
+from httpx import AsyncClient
+
+from tests.integration_tests.departments.test_update_departments import (
+    count_statements,
+)
+
+
+async def test_departments_batch_get(client: AsyncClient):
+    parent = await client.post("/api/v1/departments/", json={"name": "Batch"})
+    parent_id = parent.json()["id"]
+    child_ids = []
+    for name in ("First", "Second"):
+        child = await client.post(
+            "/api/v1/departments/", json={"name": name, "parent_id": parent_id}
+        )
+        child_ids.append(child.json()["id"])
+
+    ids = [child_ids[0], 999999, parent_id, child_ids[0]]
+    with count_statements() as statements:
+        response = await client.post(
+            "/api/v1/departments/batch-get",
+            json={"ids": ids, "include_children": True},
+        )
+    assert response.status_code == 200
+    assert len(statements) == 1
+    assert "ANY" in statements[0]
+    # пакетное чтение не переключает клиента на основную БД
+    assert "set-cookie" not in response.headers
+
+    data = response.json()
+    assert data["missing"] == [999999]
+    items = data["items"]
+    assert [item and item["id"] for item in items] == [
+        child_ids[0],
+        None,
+        parent_id,
+        child_ids[0],
+    ]
+    assert items[2]["path"] == [parent_id]
+    assert [child["id"] for child in items[2]["children"]] == child_ids
+    assert items[2]["children"][0]["name"] == "First"
+    assert items[0]["children"] == []
+
+    response = await client.post(
+        "/api/v1/departments/batch-get", json={"ids": [parent_id]}
+    )
+    assert response.json()["items"][0]["children"] is None
+
+
+async def test_departments_batch_get_validation(client: AsyncClient):
+    response = await client.post("/api/v1/departments/batch-get", json={"ids": []})
+    assert response.status_code == 422
+
+    response = await client.post(
+        "/api/v1/departments/batch-get", json={"ids": list(range(1, 5002))}
+    )
+    assert response.status_code == 422
+
+    for bad_id in (2**40, 0, -1):
+        response = await client.post(
+            "/api/v1/departments/batch-get", json={"ids": [1, bad_id]}
+        )
+        assert response.status_code == 422
@@ -0,0 +1,29 @@
+import asyncio
+
+from httpx import AsyncClient
+
+from app.database.notifications import DepartmentChangesListener
+from app.utils.cache import department_tree_cache
+from tests.conftest import engine_test
+
+
+async def test_department_changes_notify_invalidates_cache(client: AsyncClient):
+    listener = DepartmentChangesListener(
+        dsn=engine_test.url.set(drivername="postgresql").render_as_string(
+            hide_password=False
+        )
+    )
+    listener.start()
+    try:
+        await asyncio.wait_for(listener.connected.wait(), timeout=5)
+        version = department_tree_cache.version
+
+        await client.post("/api/v1/departments/", json={"name": "Notified"})
+
+        async def wait_for_notification():
+            while department_tree_cache.version < version + 2:
+                await asyncio.sleep(0.01)
+
+        await asyncio.wait_for(wait_for_notification(), timeout=5)
+    finally:
+        await listener.stop()
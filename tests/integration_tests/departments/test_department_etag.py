@@ -0,0 +1,81 @@
+from httpx import AsyncClient
+
+
+async def test_get_department_etag_not_modified(client: AsyncClient):
+    department = await client.post("/api/v1/departments/", json={"name": "Tagged"})
+    department_id = department.json()["id"]
+
+    response = await client.get(f"/api/v1/departments/{department_id}")
+    etag = response.headers["ETag"]
+
+    response = await client.get(
+        f"/api/v1/departments/{department_id}", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+
+async def test_get_department_etag_changes_with_subtree(client: AsyncClient):
+    parent = await client.post("/api/v1/departments/", json={"name": "Tagged"})
+    parent_id = parent.json()["id"]
+    child = await client.post(
+        "/api/v1/departments/", json={"name": "Child", "parent_id": parent_id}
+    )
+    child_id = child.json()["id"]
+
+    response = await client.get(f"/api/v1/departments/{parent_id}")
+    etag = response.headers["ETag"]
+
+    await client.post(
+        f"/api/v1/departments/{child_id}/employees/",
+        json={"full_name": "Иван Иванов", "position": "Developer"},
+    )
+
+    response = await client.get(
+        f"/api/v1/departments/{parent_id}", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert len(response.json()["children"][0]["employees"]) == 1
+
+
+async def test_get_department_etag_depends_on_params(client: AsyncClient):
+    department = await client.post("/api/v1/departments/", json={"name": "Tagged"})
+    department_id = department.json()["id"]
+
+    response = await client.get(f"/api/v1/departments/{department_id}")
+    etag = response.headers["ETag"]
+
+    response = await client.get(
+        f"/api/v1/departments/{department_id}",
+        params={"depth": 2},
+        headers={"If-None-Match": etag},
+    )
+    assert response.status_code == 200
+
+
+async def test_get_departments_etag(client: AsyncClient):
+    department = await client.post("/api/v1/departments/", json={"name": "Tagged"})
+    department_id = department.json()["id"]
+
+    params = {"limit": 1000}
+    response = await client.get("/api/v1/departments/", params=params)
+    while department_id not in [item["id"] for item in response.json()["items"]]:
+        params["after"] = response.json()["next_cursor"]
+        response = await client.get("/api/v1/departments/", params=params)
+    etag = response.headers["ETag"]
+
+    response = await client.get(
+        "/api/v1/departments/", params=params, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+    await client.patch(
+        f"/api/v1/departments/{department_id}", json={"name": "Tagged renamed"}
+    )
+
+    response = await client.get(
+        "/api/v1/departments/", params=params, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
@@ -0,0 +1,57 @@
+from httpx import AsyncClient
+
+
+async def get_cache_stats(client: AsyncClient) -> dict:
+    response = await client.get("/api/v1/system/cache")
+    assert response.status_code == 200
+    return response.json()
+
+
+async def get_tree(client: AsyncClient, department_id: int):
+    # без cookie после записи: клиент, не писавший сам, читает через кэш
+    client.cookies.clear()
+    return await client.get(f"/api/v1/departments/{department_id}")
+
+
+async def test_department_tree_cache_hit(client: AsyncClient):
+    department = await client.post("/api/v1/departments/", json={"name": "Cached"})
+    department_id = department.json()["id"]
+
+    await get_tree(client, department_id)
+    before = await get_cache_stats(client)
+
+    response = await get_tree(client, department_id)
+    assert response.status_code == 200
+    after = await get_cache_stats(client)
+    assert after["hits"] == before["hits"] + 1
+
+
+async def test_department_tree_cache_invalidated_by_employee(client: AsyncClient):
+    department = await client.post("/api/v1/departments/", json={"name": "Cached"})
+    department_id = department.json()["id"]
+
+    response = await get_tree(client, department_id)
+    assert response.json()["employees"] == []
+
+    await client.post(
+        f"/api/v1/departments/{department_id}/employees/",
+        json={"full_name": "Иван Иванов", "position": "Developer"},
+    )
+
+    response = await get_tree(client, department_id)
+    assert len(response.json()["employees"]) == 1
+
+
+async def test_department_tree_cache_invalidated_by_update(client: AsyncClient):
+    parent = await client.post("/api/v1/departments/", json={"name": "Cached"})
+    parent_id = parent.json()["id"]
+    child = await client.post("/api/v1/departments/", json={"name": "Child"})
+    child_id = child.json()["id"]
+
+    response = await get_tree(client, parent_id)
+    assert response.json()["children"] == []
+
+    await client.patch(f"/api/v1/departments/{child_id}", json={"parent_id": parent_id})
+
+    response = await get_tree(client, parent_id)
+    assert [c["id"] for c in response.json()["children"]] == [child_id]
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+
+from app.utils.cache import SingleFlight, department_tree_flights
+
+
+async def test_concurrent_tree_reads_are_coalesced(client: AsyncClient):
+    department = await client.post("/api/v1/departments/", json={"name": "Flight"})
+    department_id = department.json()["id"]
+    await client.post(
+        f"/api/v1/departments/{department_id}/employees/",
+        json={"full_name": "Иван Иванов", "position": "Developer"},
+    )
+    # без cookie после записи: чтения идут через кэш и общие построения
+    client.cookies.clear()
+    computed = department_tree_flights.computed
+    coalesced = department_tree_flights.coalesced
+
+    responses = await asyncio.gather(
+        *(
+            client.get(f"/api/v1/departments/{department_id}", params={"depth": 5})
+            for _ in range(10)
+        )
+    )
+
+    assert {response.status_code for response in responses} == {200}
+    assert len({response.content for response in responses}) == 1
+    assert len({response.headers["ETag"] for response in responses}) == 1
+    assert department_tree_flights.computed - computed == 1
+    assert department_tree_flights.coalesced - coalesced == 9
+
+    stats = (await client.get("/api/v1/system/cache")).json()
+    assert stats["coalesced"] == department_tree_flights.coalesced
+    assert stats["inflight"] == 0
+
+
+async def test_coalesced_reads_share_errors(client: AsyncClient):
+    computed = department_tree_flights.computed
+
+    responses = await asyncio.gather(
+        *(client.get("/api/v1/departments/999999") for _ in range(5))
+    )
+
+    assert {response.status_code for response in responses} == {404}
+    assert department_tree_flights.computed - computed == 1
+
+
+async def test_single_flight_retries_after_leader_cancelled():
+    flights = SingleFlight()
+    started = asyncio.Event()
+    calls = 0
+
+    async def compute() -> int:
+        nonlocal calls
+        calls += 1
+        started.set()
+        await asyncio.sleep(0.05)
+        return calls
+
+    leader = asyncio.create_task(flights.do("key", compute))
+    await started.wait()
+    follower = asyncio.create_task(flights.do("key", compute))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    assert await follower == 2
+    assert flights.stats() == {"inflight": 0, "computed": 2, "coalesced": 1}
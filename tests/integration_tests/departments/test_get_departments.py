@@ -0,0 +1,44 @@
+from httpx import AsyncClient
+
+
+async def test_get_departments_page(client: AsyncClient):
+    for name in ("Page A", "Page B", "Page C"):
+        await client.post("/api/v1/departments/", json={"name": name})
+
+    response = await client.get("/api/v1/departments/", params={"limit": 2})
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["items"]) == 2
+    assert data["next_cursor"] is not None
+
+
+async def test_get_departments_all_pages(client: AsyncClient):
+    created_ids = set()
+    for name in ("Walk A", "Walk B", "Walk C"):
+        response = await client.post("/api/v1/departments/", json={"name": name})
+        created_ids.add(response.json()["id"])
+
+    seen_ids = []
+    after = None
+    while True:
+        params = {"limit": 2}
+        if after:
+            params["after"] = after
+        data = (await client.get("/api/v1/departments/", params=params)).json()
+        seen_ids.extend(item["id"] for item in data["items"])
+        after = data["next_cursor"]
+        if after is None:
+            break
+
+    assert len(seen_ids) == len(set(seen_ids))
+    assert created_ids <= set(seen_ids)
+
+
+async def test_get_departments_invalid_cursor(client: AsyncClient):
+    response = await client.get("/api/v1/departments/", params={"after": "broken"})
+    assert response.status_code == 422
+
+
+async def test_get_departments_limit_max(client: AsyncClient):
+    response = await client.get("/api/v1/departments/", params={"limit": 1001})
+    assert response.status_code == 422
@@ -1,4 +1,8 @@
 from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas import DepartmentTree
 
 
 async def test_get_department_success(client: AsyncClient):
@@ -116,3 +120,45 @@ async def test_get_department_employees_in_children(client: AsyncClient):
     data = response.json()
     assert data["employees"] == []
     assert len(data["children"][0]["employees"]) == 1
+
+
+async def test_get_department_matches_schema(client: AsyncClient):
+    parent = await client.post("/api/v1/departments/", json={"name": "IT"})
+    parent_id = parent.json()["id"]
+    child = await client.post(
+        "/api/v1/departments/", json={"name": "Backend", "parent_id": parent_id}
+    )
+
+    await client.post(
+        f"/api/v1/departments/{child.json()['id']}/employees/",
+        json={
+            "full_name": "Иван Иванов",
+            "position": "Developer",
+            "hired_at": "2024-01-15",
+        },
+    )
+
+    response = await client.get(f"/api/v1/departments/{parent_id}")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    tree = DepartmentTree.model_validate_json(response.content)
+    assert tree.model_dump_json().encode() == response.content
+
+
+async def test_get_department_timestamps_in_utc(
+    client: AsyncClient, session: AsyncSession
+):
+    department = await client.post("/api/v1/departments/", json={"name": "IT"})
+    department_id = department.json()["id"]
+    employee = await client.post(
+        f"/api/v1/departments/{department_id}/employees/",
+        json={"full_name": "Иван Иванов", "position": "Developer"},
+    )
+
+    # json_agg выводит время в TimeZone сессии, а не в UTC
+    await session.execute(text("SET TimeZone = 'Asia/Vladivostok'"))
+    response = await client.get(f"/api/v1/departments/{department_id}")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created_at"] == department.json()["created_at"]
+    assert data["employees"][0]["created_at"] == employee.json()["created_at"]
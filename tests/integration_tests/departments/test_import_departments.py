@@ -0,0 +1,85 @@
+from httpx import AsyncClient
+
+
+async def test_import_department_tree(client: AsyncClient):
+    response = await client.post(
+        "/api/v1/departments/import",
+        json={
+            "name": "Imported",
+            "employees": [{"full_name": "Иван Иванов", "position": "CEO"}],
+            "children": [
+                {
+                    "name": "Backend",
+                    "children": [{"name": "Platform"}],
+                    "employees": [{"full_name": "Пётр Петров", "position": "Dev"}],
+                },
+                {"name": "Frontend"},
+            ],
+        },
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["departments_created"] == 4
+    assert data["employees_created"] == 2
+    root_id = data["root"]["id"]
+
+    tree = (
+        await client.get(f"/api/v1/departments/{root_id}", params={"depth": 2})
+    ).json()
+    assert tree["name"] == "Imported"
+    assert len(tree["employees"]) == 1
+    children = {child["name"]: child for child in tree["children"]}
+    assert set(children) == {"Backend", "Frontend"}
+    assert children["Backend"]["children"][0]["name"] == "Platform"
+    assert len(children["Backend"]["employees"]) == 1
+
+
+async def test_import_department_tree_under_parent(client: AsyncClient):
+    parent = await client.post("/api/v1/departments/", json={"name": "Holding"})
+    parent_id = parent.json()["id"]
+
+    response = await client.post(
+        "/api/v1/departments/import",
+        params={"parent_id": parent_id},
+        json={"name": "Acquired", "children": [{"name": "Sales"}]},
+    )
+    assert response.status_code == 200
+    assert response.json()["root"]["parent_id"] == parent_id
+
+    tree = (
+        await client.get(f"/api/v1/departments/{parent_id}", params={"depth": 2})
+    ).json()
+    assert tree["children"][0]["name"] == "Acquired"
+    assert tree["children"][0]["children"][0]["name"] == "Sales"
+
+
+async def test_import_department_tree_duplicate_sibling_names(client: AsyncClient):
+    response = await client.post(
+        "/api/v1/departments/import",
+        json={"name": "Imported", "children": [{"name": "Sales"}, {"name": "Sales"}]},
+    )
+    assert response.status_code == 409
+
+
+async def test_import_department_tree_nonexistent_parent(client: AsyncClient):
+    response = await client.post(
+        "/api/v1/departments/import",
+        params={"parent_id": 99999},
+        json={"name": "Imported"},
+    )
+    assert response.status_code == 404
+
+
+async def test_import_department_tree_existing_name_under_parent(client: AsyncClient):
+    parent = await client.post("/api/v1/departments/", json={"name": "Holding"})
+    parent_id = parent.json()["id"]
+    await client.post(
+        "/api/v1/departments/", json={"name": "Sales", "parent_id": parent_id}
+    )
+
+    response = await client.post(
+        "/api/v1/departments/import",
+        params={"parent_id": parent_id},
+        json={"name": "Sales"},
+    )
+    assert response.status_code == 409
@@ -1,4 +1,27 @@
+from contextlib import contextmanager
+
 from httpx import AsyncClient
+from sqlalchemy import event
+
+from tests.conftest import engine_test
+
+
+@contextmanager
+def count_statements():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(
+        engine_test.sync_engine, "before_cursor_execute", before_cursor_execute
+    )
+    try:
+        yield statements
+    finally:
+        event.remove(
+            engine_test.sync_engine, "before_cursor_execute", before_cursor_execute
+        )
 
 
 async def test_update_department_name(client: AsyncClient):
@@ -94,3 +117,52 @@ async def test_update_department_duplicate_name_same_parent(client: AsyncClient)
         f"/api/v1/departments/{frontend.json()['id']}", json={"name": "Backend"}
     )
     assert response.status_code == 409
+
+
+async def test_update_department_move_subtree(client: AsyncClient):
+    a = await client.post("/api/v1/departments/", json={"name": "A"})
+    a_id = a.json()["id"]
+    b = await client.post("/api/v1/departments/", json={"name": "B", "parent_id": a_id})
+    b_id = b.json()["id"]
+    c = await client.post("/api/v1/departments/", json={"name": "C", "parent_id": b_id})
+    c_id = c.json()["id"]
+    x = await client.post("/api/v1/departments/", json={"name": "X"})
+    x_id = x.json()["id"]
+
+    response = await client.patch(
+        f"/api/v1/departments/{b_id}", json={"parent_id": x_id}
+    )
+    assert response.status_code == 200
+
+    tree = (await client.get(f"/api/v1/departments/{x_id}", params={"depth": 2})).json()
+    assert tree["children"][0]["id"] == b_id
+    assert tree["children"][0]["children"][0]["id"] == c_id
+
+    old_tree = (await client.get(f"/api/v1/departments/{a_id}")).json()
+    assert old_tree["children"] == []
+
+    response = await client.patch(
+        f"/api/v1/departments/{x_id}", json={"parent_id": c_id}
+    )
+    assert response.status_code == 409
+
+
+async def test_update_department_single_validation_query(client: AsyncClient):
+    parent = await client.post("/api/v1/departments/", json={"name": "IT"})
+    child = await client.post("/api/v1/departments/", json={"name": "Backend"})
+
+    with count_statements() as statements:
+        response = await client.patch(
+            f"/api/v1/departments/{child.json()['id']}",
+            json={"name": "Frontend", "parent_id": parent.json()["id"]},
+        )
+    assert response.status_code == 200
+
+    first_write = next(
+        index
+        for index, statement in enumerate(statements)
+        if not statement.lstrip().upper().startswith("SELECT")
+    )
+    assert first_write == 1
+    # перенос, агрегаты предков и уведомление - один запрос
+    assert len(statements) == 2
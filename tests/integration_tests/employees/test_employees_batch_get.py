@@ -0,0 +1,32 @@
+from httpx import AsyncClient
+
+
+async def test_employees_batch_get(client: AsyncClient):
+    department = await client.post("/api/v1/departments/", json={"name": "Batch"})
+    department_id = department.json()["id"]
+    employee_ids = []
+    for name in ("Иван Иванов", "Пётр Петров"):
+        employee = await client.post(
+            f"/api/v1/departments/{department_id}/employees/",
+            json={"full_name": name, "position": "Developer"},
+        )
+        employee_ids.append(employee.json()["id"])
+
+    response = await client.post(
+        "/api/v1/employees/batch-get",
+        json={"ids": [employee_ids[1], 999999, employee_ids[0]]},
+    )
+    assert response.status_code == 200
+    assert "set-cookie" not in response.headers
+
+    data = response.json()
+    assert data["missing"] == [999999]
+    assert data["items"][1] is None
+    assert data["items"][0]["full_name"] == "Пётр Петров"
+    assert data["items"][2]["id"] == employee_ids[0]
+    assert data["items"][2]["department_id"] == department_id
+
+
+async def test_employees_batch_get_id_out_of_range(client: AsyncClient):
+    response = await client.post("/api/v1/employees/batch-get", json={"ids": [2**40]})
+    assert response.status_code == 422
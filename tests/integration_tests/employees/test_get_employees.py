@@ -0,0 +1,32 @@
+from httpx import AsyncClient
+
+
+async def test_get_employees_pages(client: AsyncClient):
+    department = await client.post("/api/v1/departments/", json={"name": "Paging"})
+    department_id = department.json()["id"]
+
+    created_ids = []
+    for i in range(3):
+        response = await client.post(
+            f"/api/v1/departments/{department_id}/employees/",
+            json={"full_name": f"Сотрудник {i}", "position": "Developer"},
+        )
+        created_ids.append(response.json()["id"])
+
+    seen_ids = []
+    after = None
+    while True:
+        params = {"limit": 2}
+        if after:
+            params["after"] = after
+        response = await client.get("/api/v1/employees/", params=params)
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["items"]) <= 2
+        seen_ids.extend(item["id"] for item in data["items"])
+        after = data["next_cursor"]
+        if after is None:
+            break
+
+    assert len(seen_ids) == len(set(seen_ids))
+    assert set(created_ids) <= set(seen_ids)
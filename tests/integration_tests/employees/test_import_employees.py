@@ -0,0 +1,101 @@
+from httpx import AsyncClient
+
+
+async def create_department(client: AsyncClient, name: str = "Import") -> int:
+    response = await client.post("/api/v1/departments/", json={"name": name})
+    return response.json()["id"]
+
+
+async def test_import_employees_json(client: AsyncClient):
+    department_id = await create_department(client)
+
+    response = await client.post(
+        "/api/v1/employees/bulk",
+        json=[
+            {
+                "full_name": "Иван Иванов",
+                "position": "Developer",
+                "department_id": department_id,
+            },
+            {
+                "full_name": "Пётр Петров",
+                "position": "QA",
+                "department_id": department_id,
+            },
+        ],
+    )
+    assert response.status_code == 200
+    assert response.json() == {"created": 2, "errors": []}
+
+    tree = (await client.get(f"/api/v1/departments/{department_id}")).json()
+    assert len(tree["employees"]) == 2
+
+
+async def test_import_employees_ndjson_with_errors(client: AsyncClient):
+    department_id = await create_department(client)
+    body = "\n".join(
+        [
+            f'{{"full_name": "Иван Иванов", "position": "Developer", "department_id": {department_id}}}',
+            '{"full_name": "", "position": "Developer", "department_id": 1}',
+            "not json",
+            '{"full_name": "Пётр Петров", "position": "QA", "department_id": 99999}',
+        ]
+    )
+
+    response = await client.post(
+        "/api/v1/employees/bulk",
+        content=body.encode(),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 1
+    assert [error["row"] for error in data["errors"]] == [2, 3, 4]
+
+
+async def test_import_employees_csv(client: AsyncClient):
+    department_id = await create_department(client)
+    body = (
+        "full_name,position,hired_at,department_id\n"
+        f"Иван Иванов,Developer,2024-01-15,{department_id}\n"
+        f"Пётр Петров,QA,,{department_id}\n"
+    )
+
+    response = await client.post(
+        "/api/v1/employees/bulk",
+        content=body.encode(),
+        headers={"Content-Type": "text/csv"},
+    )
+    assert response.status_code == 200
+    assert response.json() == {"created": 2, "errors": []}
+
+
+async def test_import_employees_atomic(client: AsyncClient):
+    department_id = await create_department(client)
+
+    response = await client.post(
+        "/api/v1/employees/bulk",
+        params={"atomic": True},
+        json=[
+            {
+                "full_name": "Иван Иванов",
+                "position": "Developer",
+                "department_id": department_id,
+            },
+            {"full_name": "Пётр Петров", "position": "QA", "department_id": 99999},
+        ],
+    )
+    assert response.status_code == 200
+    assert response.json()["created"] == 0
+
+    tree = (await client.get(f"/api/v1/departments/{department_id}")).json()
+    assert tree["employees"] == []
+
+
+async def test_import_employees_unsupported_media_type(client: AsyncClient):
+    response = await client.post(
+        "/api/v1/employees/bulk",
+        content=b"<employees/>",
+        headers={"Content-Type": "application/xml"},
+    )
+    assert response.status_code == 415
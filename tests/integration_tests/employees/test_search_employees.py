@@ -0,0 +1,101 @@
+from httpx import AsyncClient
+
+
+async def create_employee(
+    client: AsyncClient, department_id: int, full_name: str, position: str
+) -> int:
+    response = await client.post(
+        f"/api/v1/departments/{department_id}/employees/",
+        json={"full_name": full_name, "position": position},
+    )
+    return response.json()["id"]
+
+
+async def test_search_employees_by_prefix(client: AsyncClient):
+    department = await client.post("/api/v1/departments/", json={"name": "Search"})
+    department_id = department.json()["id"]
+    by_name = await create_employee(
+        client, department_id, "Kvazimodo Soborov", "Bell-ringer"
+    )
+    by_position = await create_employee(
+        client, department_id, "Ivan Ivanov", "Kvazianalyst"
+    )
+    await create_employee(client, department_id, "Пётр Петров", "Developer")
+
+    response = await client.get("/api/v1/employees/search", params={"q": "KVAZI"})
+    assert response.status_code == 200
+    ids = [employee["id"] for employee in response.json()["items"]]
+    assert ids == [by_name, by_position]
+
+
+async def test_search_employees_all_words(client: AsyncClient):
+    department = await client.post("/api/v1/departments/", json={"name": "Search"})
+    department_id = department.json()["id"]
+    expected = await create_employee(
+        client, department_id, "Ксенофонт Архипов", "Лоцман"
+    )
+    await create_employee(client, department_id, "Ксенофонт Борисов", "Штурман")
+
+    response = await client.get("/api/v1/employees/search", params={"q": "Ксеноф Лоц!"})
+    assert [employee["id"] for employee in response.json()["items"]] == [expected]
+
+
+async def test_search_employees_in_subtree(client: AsyncClient):
+    parent = await client.post("/api/v1/departments/", json={"name": "Search"})
+    parent_id = parent.json()["id"]
+    child = await client.post(
+        "/api/v1/departments/", json={"name": "Child", "parent_id": parent_id}
+    )
+    other = await client.post("/api/v1/departments/", json={"name": "Other"})
+
+    expected = await create_employee(
+        client, child.json()["id"], "Феофилакт Иванов", "Developer"
+    )
+    await create_employee(client, other.json()["id"], "Феофилакт Петров", "Developer")
+
+    response = await client.get(
+        "/api/v1/employees/search",
+        params={"q": "Феофилакт", "department_id": parent_id},
+    )
+    assert [employee["id"] for employee in response.json()["items"]] == [expected]
+
+
+async def test_search_employees_pages(client: AsyncClient):
+    department = await client.post("/api/v1/departments/", json={"name": "Search"})
+    department_id = department.json()["id"]
+    created = [
+        await create_employee(client, department_id, f"Евлампий {i}", "Tester")
+        for i in range(5)
+    ]
+
+    ids = []
+    after = None
+    while True:
+        params = {"q": "Евлампий", "limit": 2}
+        if after:
+            params["after"] = after
+        response = await client.get("/api/v1/employees/search", params=params)
+        assert response.status_code == 200
+        data = response.json()
+        ids.extend(employee["id"] for employee in data["items"])
+        after = data["next_cursor"]
+        if after is None:
+            break
+
+    assert ids == created
+
+
+async def test_search_employees_empty_query(client: AsyncClient):
+    response = await client.get("/api/v1/employees/search", params={"q": "!!"})
+    assert response.status_code == 200
+    assert response.json() == {"items": [], "next_cursor": None}
+
+    response = await client.get("/api/v1/employees/search", params={"q": ""})
+    assert response.status_code == 422
+
+
+async def test_search_employees_invalid_cursor(client: AsyncClient):
+    response = await client.get(
+        "/api/v1/employees/search", params={"q": "иван", "after": "broken"}
+    )
+    assert response.status_code == 422
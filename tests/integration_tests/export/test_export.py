@@ -0,0 +1,41 @@
+import csv
+import io
+import json
+
+from httpx import AsyncClient
+
+
+async def test_export_departments_ndjson(client: AsyncClient):
+    parent = await client.post("/api/v1/departments/", json={"name": "Exported"})
+    parent_id = parent.json()["id"]
+    child = await client.post(
+        "/api/v1/departments/", json={"name": "Child", "parent_id": parent_id}
+    )
+    child_id = child.json()["id"]
+
+    response = await client.get("/api/v1/export/departments")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    rows = {row["id"]: row for row in map(json.loads, response.text.splitlines())}
+    assert rows[child_id]["parent_id"] == parent_id
+    assert rows[child_id]["path"] == f"{rows[parent_id]['path']}.{child_id}"
+    assert rows[child_id]["depth"] == rows[parent_id]["depth"] + 1
+
+
+async def test_export_employees_csv(client: AsyncClient):
+    department = await client.post("/api/v1/departments/", json={"name": "Exported"})
+    department_id = department.json()["id"]
+    employee = await client.post(
+        f"/api/v1/departments/{department_id}/employees/",
+        json={"full_name": "Иван, Иванов", "position": "Developer"},
+    )
+    employee_id = employee.json()["id"]
+
+    response = await client.get("/api/v1/export/employees", params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+
+    rows = {int(row["id"]): row for row in csv.DictReader(io.StringIO(response.text))}
+    assert rows[employee_id]["full_name"] == "Иван, Иванов"
+    assert int(rows[employee_id]["department_id"]) == department_id
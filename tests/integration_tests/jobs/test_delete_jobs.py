@@ -0,0 +1,184 @@
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, update
+
+from app.config.settings import settings
+from app.jobs import job_runner
+from app.models.job import Job
+from app.repositories.job import JobRepository
+from app.schemas.job import JobKind, JobStatus
+from tests.conftest import async_session_factory_test
+
+
+@pytest.fixture
+def background_delete(monkeypatch):
+    monkeypatch.setattr(job_runner, "session_factory", async_session_factory_test)
+    monkeypatch.setattr(settings, "JOB_DELETE_THRESHOLD", 5)
+    monkeypatch.setattr(settings, "JOB_BATCH_SIZE", 2)
+    yield
+    job_runner.tasks.clear()
+
+
+async def create_tree(client: AsyncClient) -> tuple[int, int]:
+    response = await client.post(
+        "/api/v1/departments/import",
+        json={
+            "name": "Big",
+            "employees": [{"full_name": "Иван Иванов", "position": "CTO"}],
+            "children": [
+                {
+                    "name": "A",
+                    "employees": [
+                        {"full_name": "Пётр Петров", "position": "Developer"}
+                    ],
+                    "children": [{"name": "A1"}, {"name": "A2"}],
+                },
+                {"name": "B", "children": [{"name": "B1"}]},
+            ],
+        },
+    )
+    assert response.status_code == 200
+    return response.json()["root"]["id"], 8
+
+
+async def test_delete_department_in_background(client: AsyncClient, background_delete):
+    department_id, rows = await create_tree(client)
+
+    response = await client.delete(
+        f"/api/v1/departments/{department_id}", params={"mode": "cascade"}
+    )
+    assert response.status_code == 202
+    job = response.json()
+    assert response.headers["location"] == f"/api/v1/jobs/{job['id']}"
+    assert job["kind"] == "delete_subtree"
+
+    await job_runner.join()
+
+    response = await client.get(f"/api/v1/jobs/{job['id']}")
+    assert response.status_code == 200
+    job = response.json()
+    assert job["status"] == "succeeded"
+    assert job["total"] == rows
+    assert job["processed"] == rows
+    assert job["finished_at"] is not None
+
+    response = await client.get(f"/api/v1/departments/{department_id}")
+    assert response.status_code == 404
+
+
+async def test_delete_department_reassign_in_background(
+    client: AsyncClient, background_delete
+):
+    target = await client.post("/api/v1/departments/", json={"name": "Target"})
+    target_id = target.json()["id"]
+    department_id, rows = await create_tree(client)
+
+    response = await client.delete(
+        f"/api/v1/departments/{department_id}",
+        params={"mode": "reassign", "reassign_to_department_id": target_id},
+    )
+    assert response.status_code == 202
+
+    await job_runner.join()
+
+    response = await client.get(f"/api/v1/jobs/{response.json()['id']}")
+    assert response.json()["status"] == "succeeded"
+    assert response.json()["processed"] == rows - 1
+
+    response = await client.get(f"/api/v1/departments/{target_id}")
+    assert [e["full_name"] for e in response.json()["employees"]] == ["Иван Иванов"]
+
+
+async def test_delete_small_department_synchronously(
+    client: AsyncClient, background_delete
+):
+    department = await client.post("/api/v1/departments/", json={"name": "Small"})
+
+    response = await client.delete(
+        f"/api/v1/departments/{department.json()['id']}", params={"mode": "cascade"}
+    )
+    assert response.status_code == 204
+
+
+async def test_resume_released_job(client: AsyncClient, background_delete):
+    department_id, rows = await create_tree(client)
+
+    async with async_session_factory_test() as session:
+        repository = JobRepository(session)
+        job = await repository.create_job(
+            JobKind.delete_subtree, {"department_id": department_id}
+        )
+        await repository.release_job(job.id)
+
+    await job_runner.resume()
+    await job_runner.join()
+
+    response = await client.get(f"/api/v1/jobs/{job.id}")
+    assert response.json()["status"] == "succeeded"
+    assert response.json()["processed"] == rows
+
+
+async def test_poll_claims_job_with_expired_lease(
+    client: AsyncClient, background_delete, monkeypatch
+):
+    monkeypatch.setattr(settings, "JOB_POLL_INTERVAL", 0.05)
+    department_id, rows = await create_tree(client)
+
+    # задача упавшего воркера: running, аренда давно не продлевалась
+    async with async_session_factory_test() as session:
+        repository = JobRepository(session)
+        job = await repository.create_job(
+            JobKind.delete_subtree, {"department_id": department_id}
+        )
+        await session.execute(
+            update(Job)
+            .where(Job.id == job.id)
+            .values(heartbeat_at=func.now() - func.make_interval(0, 0, 0, 0, 0, 10))
+        )
+        await session.commit()
+
+    job_runner.start()
+    try:
+        for _ in range(100):
+            response = await client.get(f"/api/v1/jobs/{job.id}")
+            if response.json()["status"] == JobStatus.succeeded.value:
+                break
+            await asyncio.sleep(0.05)
+    finally:
+        await job_runner.stop()
+
+    assert response.json()["status"] == JobStatus.succeeded.value
+    assert response.json()["processed"] == rows
+
+
+async def test_heartbeat_keeps_lease(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(job_runner, "session_factory", async_session_factory_test)
+    monkeypatch.setattr(settings, "JOB_HEARTBEAT_INTERVAL", 0.05)
+    release = asyncio.Event()
+
+    async def slow_handler(job, session_factory):
+        await release.wait()
+
+    monkeypatch.setitem(job_runner.handlers, JobKind.delete_subtree.value, slow_handler)
+    job = await job_runner.submit(JobKind.delete_subtree, {"department_id": -1})
+    try:
+        await asyncio.sleep(0.5)
+        async with async_session_factory_test() as session:
+            claimed = await JobRepository(session).claim_jobs(0.3)
+        assert job.id not in [claimed_job.id for claimed_job in claimed]
+
+        response = await client.get(f"/api/v1/jobs/{job.id}")
+        assert response.json()["heartbeat_at"] > response.json()["created_at"]
+    finally:
+        release.set()
+        await job_runner.join()
+
+    response = await client.get(f"/api/v1/jobs/{job.id}")
+    assert response.json()["status"] == JobStatus.succeeded.value
+
+
+async def test_get_job_not_found(client: AsyncClient):
+    response = await client.get("/api/v1/jobs/99999")
+    assert response.status_code == 404
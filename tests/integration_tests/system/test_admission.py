@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+
+from app.utils.admission import HEAVY, AdmissionLimiter, admission_limiters
+from app.utils.exceptions import ServiceOverloadedException
+
+
+def make_limiter(limit: int, queue_size: int, timeout: float = 1.0) -> AdmissionLimiter:
+    return AdmissionLimiter(
+        HEAVY, limit=limit, queue_size=queue_size, timeout=timeout, retry_after=2
+    )
+
+
+async def test_limiter_queues_and_rejects():
+    limiter = make_limiter(limit=1, queue_size=1, timeout=0.05)
+
+    async with limiter.slot():
+        waiter = asyncio.create_task(limiter.slot().__aenter__())
+        await asyncio.sleep(0)
+        assert limiter.stats()["queued"] == 1
+
+        # очередь заполнена: отказ сразу, без ожидания
+        with pytest.raises(ServiceOverloadedException) as error:
+            async with limiter.slot():
+                pass
+        assert error.value.retry_after == 2
+
+        with pytest.raises(ServiceOverloadedException):
+            await waiter
+
+    stats = limiter.stats()
+    assert (stats["active"], stats["queued"]) == (0, 0)
+    assert (stats["admitted"], stats["rejected"], stats["timed_out"]) == (1, 1, 1)
+
+
+async def test_limiter_hands_slot_to_waiters_in_order():
+    limiter = make_limiter(limit=1, queue_size=10)
+    order = []
+
+    async def request(name: str) -> None:
+        async with limiter.slot():
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    holder = asyncio.create_task(request("first"))
+    await asyncio.sleep(0)
+    waiters = [asyncio.create_task(request(name)) for name in ("second", "third")]
+    cancelled = asyncio.create_task(request("cancelled"))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    await asyncio.gather(holder, *waiters, cancelled, return_exceptions=True)
+
+    assert order == ["first", "second", "third"]
+    assert limiter.stats()["active"] == 0
+
+
+async def test_heavy_requests_shed_cheap_requests_served(
+    client: AsyncClient, monkeypatch
+):
+    department = await client.post("/api/v1/departments/", json={"name": "Shed"})
+    department_id = department.json()["id"]
+    monkeypatch.setitem(admission_limiters, HEAVY, make_limiter(limit=0, queue_size=0))
+
+    for url in (
+        "/api/v1/employees/search?q=Иван",
+        f"/api/v1/departments/{department_id}?depth=5&include_employees=true",
+    ):
+        response = await client.get(url)
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "2"
+
+    response = await client.post(
+        f"/api/v1/departments/{department_id}/employees/",
+        json={"full_name": "Иван Иванов", "position": "Developer"},
+    )
+    assert response.status_code == 200
+    response = await client.get(f"/api/v1/departments/{department_id}?depth=1")
+    assert response.status_code == 200
+
+    stats = {
+        item["cost_class"]: item
+        for item in (await client.get("/api/v1/system/admission")).json()
+    }
+    assert stats["heavy"]["rejected"] == 2
+    assert stats["standard"]["active"] == 0
+
+    metrics = (await client.get("/metrics")).text
+    assert (
+        'admission_rejected_total{cost_class="heavy",reason="queue_full"} 2' in metrics
+    )
@@ -0,0 +1,154 @@
+import threading
+
+from httpx import AsyncClient
+
+from app.config.settings import settings
+from app.utils import compression
+from app.utils.compression import negotiate_encoding
+
+
+async def create_department_with_employees(client: AsyncClient, count: int) -> int:
+    department = await client.post("/api/v1/departments/", json={"name": "Compressed"})
+    department_id = department.json()["id"]
+    for index in range(count):
+        await client.post(
+            f"/api/v1/departments/{department_id}/employees/",
+            json={"full_name": f"Иван Иванов {index}", "position": "Developer"},
+        )
+    # без cookie после записи: дерево читается через кэш
+    client.cookies.clear()
+    return department_id
+
+
+async def test_department_tree_compressed_once(client: AsyncClient, monkeypatch):
+    department_id = await create_department_with_employees(client, 20)
+    calls = []
+    original = compression.compress
+    monkeypatch.setattr(
+        compression,
+        "compress",
+        lambda data, encoding: calls.append(encoding) or original(data, encoding),
+    )
+
+    plain = await client.get(
+        f"/api/v1/departments/{department_id}",
+        headers={"Accept-Encoding": "identity"},
+    )
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["vary"].count("Accept-Encoding") == 1
+
+    for _ in range(3):
+        response = await client.get(
+            f"/api/v1/departments/{department_id}",
+            headers={"Accept-Encoding": "gzip"},
+        )
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["etag"] == f"W/{plain.headers['etag']}"
+        assert int(response.headers["content-length"]) < len(plain.content)
+        assert response.json() == plain.json()
+
+    # тело из кэша сжимается один раз
+    assert calls == ["gzip"]
+
+    not_modified = await client.get(
+        f"/api/v1/departments/{department_id}",
+        headers={
+            "Accept-Encoding": "gzip",
+            "If-None-Match": response.headers["etag"],
+        },
+    )
+    assert not_modified.status_code == 304
+
+
+async def test_small_responses_not_compressed(client: AsyncClient):
+    department = await client.post("/api/v1/departments/", json={"name": "Small"})
+    department_id = department.json()["id"]
+
+    response = await client.get(
+        f"/api/v1/departments/{department_id}", headers={"Accept-Encoding": "gzip"}
+    )
+    assert "content-encoding" not in response.headers
+
+    response = await client.get(
+        "/api/v1/system/cache", headers={"Accept-Encoding": "gzip"}
+    )
+    assert "content-encoding" not in response.headers
+    assert "Accept-Encoding" in response.headers["vary"]
+
+
+async def test_streaming_export_compressed(client: AsyncClient):
+    await create_department_with_employees(client, 5)
+
+    plain = await client.get(
+        "/api/v1/export/employees", headers={"Accept-Encoding": "identity"}
+    )
+    response = await client.get(
+        "/api/v1/export/employees", headers={"Accept-Encoding": "gzip"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.content == plain.content
+
+
+async def test_large_bodies_compressed_off_event_loop(client: AsyncClient, monkeypatch):
+    department_id = await create_department_with_employees(client, 20)
+    threads = []
+    original = compression.compress
+    monkeypatch.setattr(
+        compression,
+        "compress",
+        lambda data, encoding: (
+            threads.append(threading.current_thread()) or original(data, encoding)
+        ),
+    )
+
+    monkeypatch.setattr(settings, "COMPRESSION_THREAD_THRESHOLD", 1 << 30)
+    response = await client.get(
+        f"/api/v1/departments/{department_id}",
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert response.headers["content-encoding"] == "gzip"
+    assert threads == [threading.current_thread()]
+
+    monkeypatch.setattr(settings, "COMPRESSION_THREAD_THRESHOLD", 1024)
+    response = await client.get(
+        f"/api/v1/departments/{department_id}",
+        headers={"Accept-Encoding": "gzip"},
+        params={"depth": 2},
+    )
+    assert response.headers["content-encoding"] == "gzip"
+    assert threads[-1] is not threading.current_thread()
+
+    # куски потокового ответа в middleware - тоже в пуле потоков
+    offloaded = []
+    run_in_threadpool = compression.run_in_threadpool
+
+    async def record(func, *args):
+        offloaded.append(func)
+        return await run_in_threadpool(func, *args)
+
+    monkeypatch.setattr(compression, "run_in_threadpool", record)
+    monkeypatch.setattr(settings, "COMPRESSION_THREAD_THRESHOLD", 1)
+    plain = await client.get(
+        "/api/v1/export/employees", headers={"Accept-Encoding": "identity"}
+    )
+    response = await client.get(
+        "/api/v1/export/employees", headers={"Accept-Encoding": "gzip"}
+    )
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == plain.content
+    assert any(
+        isinstance(getattr(func, "__self__", None), compression.StreamCompressor)
+        for func in offloaded
+    )
+
+
+def test_negotiate_encoding():
+    assert negotiate_encoding(None) is None
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("gzip;q=0, identity") is None
+    assert negotiate_encoding("deflate, gzip;q=0.5") == "gzip"
+    assert negotiate_encoding("*") == compression.SUPPORTED_ENCODINGS[0]
+    assert negotiate_encoding("*, gzip;q=0") in {"zstd", "br", None}
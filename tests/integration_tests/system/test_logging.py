@@ -0,0 +1,65 @@
+import io
+import json
+
+from httpx import AsyncClient
+from loguru import logger
+
+from app.utils.logger import BatchedSink, json_format, sampling_filter
+
+
+def test_batched_sink_writes_everything_on_stop():
+    stream = io.StringIO()
+    sink = BatchedSink(stream, max_batch=3)
+    for i in range(10):
+        sink.write(f"{i}\n")
+    sink.stop()
+    assert stream.getvalue() == "".join(f"{i}\n" for i in range(10))
+
+
+async def test_json_records_carry_request_context(client: AsyncClient):
+    lines = []
+    handler_id = logger.add(lines.append, format=json_format, level="INFO")
+    try:
+        department = await client.post("/api/v1/departments/", json={"name": "Logging"})
+        department_id = department.json()["id"]
+        response = await client.post(
+            f"/api/v1/departments/{department_id}/employees/",
+            json={"full_name": "Иван Иванов", "position": "Developer"},
+            headers={"X-Request-ID": "test-request-1"},
+        )
+    finally:
+        logger.remove(handler_id)
+
+    assert response.headers["X-Request-ID"] == "test-request-1"
+    records = [json.loads(line) for line in lines]
+    request_records = [
+        record for record in records if record.get("request_id") == "test-request-1"
+    ]
+    assert any(
+        record["department_id"] == department_id
+        and record["message"].startswith("Работник успешно создан")
+        for record in request_records
+    )
+    assert any("duration_ms" in record for record in request_records)
+    assert len({record["request_id"] for record in records}) == 2
+
+
+def test_sampling_filter():
+    class Level:
+        def __init__(self, no: int):
+            self.no = no
+
+    def record(level: int, request_id: str | None = None) -> dict:
+        extra = {"request_id": request_id} if request_id else {}
+        return {"level": Level(level), "extra": extra}
+
+    drop_all = sampling_filter(0)
+    assert not drop_all(record(20, "abc"))
+    assert drop_all(record(30, "abc"))
+    assert drop_all(record(40))
+
+    half = sampling_filter(0.5)
+    decisions = [half(record(20, f"request-{i}")) for i in range(200)]
+    assert decisions == [half(record(20, f"request-{i}")) for i in range(200)]
+    assert 50 < sum(decisions) < 150
+    assert sampling_filter(1)(record(20, "abc"))
@@ -0,0 +1,126 @@
+import asyncio
+import json
+import threading
+import time
+
+from httpx import AsyncClient
+
+from app.utils.metrics import MetricsRegistry, MultiprocessSnapshots
+
+
+def parse_metrics(text: str) -> dict[str, float]:
+    return {
+        line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1])
+        for line in text.splitlines()
+        if line and not line.startswith("#")
+    }
+
+
+async def test_metrics_endpoint(client: AsyncClient):
+    before = parse_metrics((await client.get("/metrics")).text)
+
+    department = await client.post("/api/v1/departments/", json={"name": "Metrics"})
+    department_id = department.json()["id"]
+    await client.post(
+        f"/api/v1/departments/{department_id}/employees/",
+        json={"full_name": "Иван Иванов", "position": "Developer"},
+    )
+    await client.get(f"/api/v1/departments/{department_id}")
+    await client.get("/api/v1/departments/999999")
+
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    after = parse_metrics(response.text)
+
+    def delta(sample: str) -> float:
+        return after.get(sample, 0) - before.get(sample, 0)
+
+    assert delta('departments_created_total{source="api"}') == 1
+    assert delta('employees_created_total{source="api"}') == 1
+    route = "/api/v1/departments/{department_id}"
+    assert (
+        delta(f'http_requests_total{{method="GET",route="{route}",status="200"}}') == 1
+    )
+    assert (
+        delta(f'http_requests_total{{method="GET",route="{route}",status="404"}}') == 1
+    )
+    assert (
+        delta(
+            f'http_request_duration_seconds_count{{method="GET",route="{route}",status="200"}}'
+        )
+        == 1
+    )
+    assert 'db_pool_connections{state="checked_out"}' in after
+    assert after["http_requests_in_flight"] == 1
+
+
+def test_render_histogram():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Задержка", buckets=[0.1, 1])
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5)
+
+    samples = parse_metrics(registry.render([registry.snapshot()]))
+    assert samples['latency_seconds_bucket{le="0.1"}'] == 1
+    assert samples['latency_seconds_bucket{le="1"}'] == 2
+    assert samples['latency_seconds_bucket{le="+Inf"}'] == 3
+    assert samples["latency_seconds_count"] == 3
+    assert samples["latency_seconds_sum"] == 5.55
+
+
+def test_multiprocess_snapshots(tmp_path):
+    def make_worker(pid: int, requests: int, in_flight: int, live: bool) -> None:
+        registry = MetricsRegistry()
+        registry.counter("requests_total", "Запросы", ["status"]).inc(
+            requests, status="200"
+        )
+        registry.gauge("in_flight", "В обработке").set(in_flight)
+        snapshot = registry.snapshot(live)
+        snapshot["pid"] = pid
+        (tmp_path / f"{pid}.json").write_text(json.dumps(snapshot))
+
+    make_worker(1, requests=3, in_flight=2, live=True)
+    make_worker(2, requests=5, in_flight=7, live=False)
+    make_worker(3, requests=1, in_flight=4, live=True)
+    stale = json.loads((tmp_path / "3.json").read_text())
+    stale["written_at"] = time.time() - 60
+    (tmp_path / "3.json").write_text(json.dumps(stale))
+
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Запросы", ["status"]).inc(status="200")
+    registry.gauge("in_flight", "В обработке").set(1)
+    snapshots = MultiprocessSnapshots(registry, str(tmp_path), interval=5)
+    snapshots.write()
+
+    samples = parse_metrics(registry.render(snapshots.collect()))
+    assert samples['requests_total{status="200"}'] == 10
+    assert samples["in_flight"] == 3
+
+
+async def test_snapshots_flusher_survives_errors(tmp_path):
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Запросы").inc()
+    threads = []
+
+    @registry.collector
+    def collect() -> None:
+        threads.append(threading.current_thread())
+        if len(threads) == 1:
+            raise RuntimeError("dictionary changed size during iteration")
+
+    snapshots = MultiprocessSnapshots(registry, str(tmp_path), interval=0.01)
+    flusher = asyncio.create_task(snapshots.run())
+    try:
+        for _ in range(100):
+            if list(tmp_path.glob("*.json")):
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        flusher.cancel()
+
+    # после ошибки первого снимка цикл продолжил работу
+    assert len(list(tmp_path.glob("*.json"))) == 1
+    # коллекторы и обход метрик - только в event loop
+    assert set(threads) == {threading.current_thread()}
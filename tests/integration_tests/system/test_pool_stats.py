@@ -0,0 +1,45 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config.settings import settings
+from app.database.pool import InstrumentedAsyncPool
+
+
+async def test_get_pool_stats(client: AsyncClient):
+    response = await client.get("/api/v1/system/pool")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["pool_size"] == settings.DB_POOL_SIZE
+    assert data["max_overflow"] == settings.DB_MAX_OVERFLOW
+    assert data["checked_out"] >= 0
+    assert len(data["wait_time"]["buckets"]) > 0
+
+
+async def test_pool_stats_checkout_and_timeout():
+    engine = create_async_engine(
+        settings.TEST_DB_URL,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1,
+    )
+    try:
+        async with engine.connect():
+            stats = engine.pool.stats()
+            assert stats["checked_out"] == 1
+            assert stats["checked_in"] == 0
+
+            with pytest.raises(PoolTimeoutError):
+                async with engine.connect():
+                    pass
+
+        stats = engine.pool.stats()
+        assert stats["checked_out"] == 0
+        assert stats["timeouts"] == 1
+        assert stats["wait_time"]["count"] == 2
+        assert stats["wait_time"]["sum"] >= 0.1
+        assert stats["wait_time"]["buckets"][-1]["count"] == 2
+    finally:
+        await engine.dispose()
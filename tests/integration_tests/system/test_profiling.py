@@ -0,0 +1,72 @@
+import time
+
+from httpx import AsyncClient
+
+from app.utils.profiling import RequestProfile, SamplingProfiler
+
+
+def parse_server_timing(header: str) -> dict[str, dict[str, str]]:
+    metrics = {}
+    for metric in header.split(", "):
+        name, *params = metric.split(";")
+        metrics[name] = dict(param.split("=", 1) for param in params)
+    return metrics
+
+
+async def test_server_timing_counts_queries(client: AsyncClient):
+    department = await client.post("/api/v1/departments/", json={"name": "Timing"})
+    metrics = parse_server_timing(department.headers["Server-Timing"])
+    assert int(metrics["db"]["desc"].strip('"').split()[0]) >= 1
+    assert float(metrics["app"]["dur"]) >= float(metrics["db"]["dur"])
+
+    response = await client.get(
+        f"/api/v1/departments/{department.json()['id']}",
+        params={"include_employees": False},
+    )
+    metrics = parse_server_timing(response.headers["Server-Timing"])
+    assert metrics["db"]["desc"] == '"1 queries"'
+    assert {"build", "serialize", "app"} <= set(metrics)
+
+
+async def test_server_timing_on_errors(client: AsyncClient):
+    response = await client.get("/api/v1/departments/999999/stats")
+    assert response.status_code == 404
+    assert "db;dur=" in response.headers["Server-Timing"]
+
+
+async def test_server_timing_counts_failed_queries(client: AsyncClient):
+    parent = await client.post("/api/v1/departments/", json={"name": "Parent"})
+    child = {"name": "Duplicate", "parent_id": parent.json()["id"]}
+    await client.post("/api/v1/departments/", json=child)
+    response = await client.post("/api/v1/departments/", json=child)
+    assert response.status_code == 409
+    metrics = parse_server_timing(response.headers["Server-Timing"])
+    failed_queries = int(metrics["db"]["desc"].strip('"').split()[0])
+    assert failed_queries >= 1
+
+    # отметка начала упавшего запроса не переходит в следующий запрос
+    client.cookies.clear()
+    response = await client.get("/api/v1/departments/999999/stats")
+    metrics = parse_server_timing(response.headers["Server-Timing"])
+    assert metrics["db"]["desc"] == '"1 queries"'
+
+
+def test_sampling_profiler_dumps_slow_requests(tmp_path):
+    profiler = SamplingProfiler(
+        enabled=True, interval=0.001, threshold=0.01, directory=tmp_path
+    )
+    profile = RequestProfile()
+    profiler.start(profile)
+    time.sleep(0.05)
+    profiler.stop(profile)
+
+    path = profiler.dump(profile, "GET /api/v1/departments/1")
+    assert path is not None
+    assert "GET_api_v1_departments_1" in path.name
+    assert "test_sampling_profiler_dumps_slow_requests" in path.read_text()
+
+    fast = RequestProfile()
+    profiler.threshold = 10
+    profiler.start(fast)
+    profiler.stop(fast)
+    assert profiler.dump(fast, "GET /") is None
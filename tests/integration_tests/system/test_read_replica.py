@@ -0,0 +1,118 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from app.config.settings import settings
+from app.database import session as database_session
+from tests.conftest import async_session_factory_test
+
+
+@pytest.fixture
+def replica_sessions(monkeypatch):
+    """Тестовая БД выступает в роли реплики; считаем открытые на ней сессии."""
+    opened = []
+
+    def replica_session_factory():
+        session = async_session_factory_test()
+        opened.append(session)
+        return session
+
+    monkeypatch.setattr(
+        database_session, "replica_session_factory", replica_session_factory
+    )
+    return opened
+
+
+async def test_read_goes_to_replica(client: AsyncClient, replica_sessions: list):
+    response = await client.get("/api/v1/departments/")
+    assert response.status_code == 200
+    assert len(replica_sessions) == 1
+
+
+async def test_write_goes_to_primary(client: AsyncClient, replica_sessions: list):
+    response = await client.post("/api/v1/departments/", json={"name": "Primary"})
+    assert response.status_code == 200
+    assert replica_sessions == []
+    assert settings.READ_YOUR_WRITES_COOKIE in response.cookies
+
+
+async def test_read_your_writes(client: AsyncClient, replica_sessions: list):
+    department = await client.post("/api/v1/departments/", json={"name": "Fresh"})
+    department_id = department.json()["id"]
+
+    response = await client.get(f"/api/v1/departments/{department_id}")
+    assert response.status_code == 200
+    assert replica_sessions == []
+
+    client.cookies.clear()
+    response = await client.get(f"/api/v1/departments/{department_id}")
+    assert response.status_code == 200
+    assert len(replica_sessions) == 1
+
+
+async def test_failed_write_does_not_pin_primary(
+    client: AsyncClient, replica_sessions: list
+):
+    response = await client.post("/api/v1/departments/", json={"name": ""})
+    assert response.status_code == 422
+    assert settings.READ_YOUR_WRITES_COOKIE not in response.cookies
+
+
+async def test_lagging_replica_not_cached(client: AsyncClient, monkeypatch):
+    department = await client.post("/api/v1/departments/", json={"name": "Old"})
+    department_id = department.json()["id"]
+    url = f"/api/v1/departments/{department_id}"
+
+    # "реплика" - снимок REPEATABLE READ, снятый до изменения
+    lagging = async_session_factory_test()
+    await lagging.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    await lagging.execute(select(1))
+    monkeypatch.setattr(database_session, "replica_session_factory", lambda: lagging)
+
+    response = await client.patch(url, json={"name": "New"})
+    cookie = response.cookies[settings.READ_YOUR_WRITES_COOKIE]
+
+    # другой клиент читает с отстающей реплики
+    client.cookies.clear()
+    response = await client.get(url)
+    assert response.json()["name"] == "Old"
+
+    # писавший клиент видит своё изменение, а не дерево реплики из кэша
+    response = await client.get(
+        url, headers={"Cookie": f"{settings.READ_YOUR_WRITES_COOKIE}={cookie}"}
+    )
+    assert response.json()["name"] == "New"
+
+    # реплика догнала основную БД: её старое дерево не осталось в кэше
+    client.cookies.clear()
+    response = await client.get(url)
+    assert response.json()["name"] == "New"
+
+
+async def get_cache_hits(client: AsyncClient) -> int:
+    response = await client.get("/api/v1/system/cache")
+    return response.json()["hits"]
+
+
+async def test_no_cookie_without_replica(client: AsyncClient):
+    department = await client.post("/api/v1/departments/", json={"name": "Solo"})
+    assert settings.READ_YOUR_WRITES_COOKIE not in department.cookies
+    url = f"/api/v1/departments/{department.json()['id']}"
+
+    # писавший клиент читает через кэш: все чтения и так из основной БД
+    await client.get(url)
+    hits = await get_cache_hits(client)
+    await client.get(url)
+    assert await get_cache_hits(client) == hits + 1
+
+
+async def test_caught_up_replica_cached(client: AsyncClient, replica_sessions: list):
+    department = await client.post("/api/v1/departments/", json={"name": "Synced"})
+    url = f"/api/v1/departments/{department.json()['id']}"
+    client.cookies.clear()
+
+    await client.get(url)
+    assert len(replica_sessions) == 1
+    hits = await get_cache_hits(client)
+    await client.get(url)
+    assert await get_cache_hits(client) == hits + 1